@@ -8,8 +8,10 @@ Spotify: fallback mode available (metadata + yt-dlp search pipeline)
 Author: Thegamerprogrammer
 License: MIT
 """
+from __future__ import annotations
+
 # ──────────────────────────────────────────────
-# Built-in modules only — no external imports yet
+# Built-in modules only — rich/pyfiglet/yt-dlp load lazily in startup()
 # ──────────────────────────────────────────────
 import sys
 import os
@@ -20,7 +22,6 @@ import platform
 import re
 import shutil
 from pathlib import Path
-import urllib.request
 import urllib.parse
 import html
 import json
@@ -29,9 +30,14 @@ import webbrowser
 import traceback
 import threading
 import sysconfig
+import tempfile
+from itertools import chain, islice
 from datetime import datetime
 
 
+# Set by startup(headless=True) for batch runs: no prompts, countdowns or Live screens.
+HEADLESS = False
+
 DEFAULT_OUTPUT_ROOT = Path("CrystalMedia_output")
 CONFIG_PATH = Path("crystalmedia_config.json")
 APP_ROOT = DEFAULT_OUTPUT_ROOT
@@ -63,7 +69,7 @@ def configure_output_root_once():
                 selected = Path(configured)
         except Exception:
             selected = DEFAULT_OUTPUT_ROOT
-    else:
+    elif not HEADLESS:
         print(f"Default output directory: {DEFAULT_OUTPUT_ROOT.resolve()}")
         try:
             answer = input("Use a custom output directory for downloads/logs? [y/N]: ").strip().lower()
@@ -81,8 +87,32 @@ def configure_output_root_once():
     _apply_output_root(Path(selected).expanduser())
 
 
-def auto_add_python_scripts_to_path():
-    """Add detected Python Scripts/bin path to PATH for this process."""
+def load_app_config() -> dict:
+    """Read optional tuning keys from the local config file (missing/invalid → empty)."""
+    if not CONFIG_PATH.exists():
+        return {}
+    try:
+        payload = json.loads(CONFIG_PATH.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    return payload if isinstance(payload, dict) else {}
+
+
+def config_int(key: str, default: int, minimum: int = 1, maximum: int = 64) -> int:
+    try:
+        value = int(load_app_config().get(key, default))
+    except (TypeError, ValueError):
+        value = default
+    return max(minimum, min(maximum, value))
+
+
+def config_choice(key: str, default: str, choices) -> str:
+    value = str(load_app_config().get(key, default)).strip().lower()
+    return value if value in choices else default
+
+
+def auto_add_python_scripts_to_path(quiet: bool = False):
+    """Add detected Python Scripts/bin path to PATH for this process (pip-installed deno, yt-dlp CLI)."""
     candidates = []
     scripts_path = sysconfig.get_path("scripts")
     if scripts_path:
@@ -97,7 +127,8 @@ def auto_add_python_scripts_to_path():
         prefix = os.pathsep.join(existing)
         if prefix not in current:
             os.environ["PATH"] = prefix + os.pathsep + current
-        print(f"Auto PATH update (Python {sys.version_info.major}.{sys.version_info.minor}): {existing[0]}")
+        if not quiet:
+            print(f"Auto PATH update (Python {sys.version_info.major}.{sys.version_info.minor}): {existing[0]}")
 
 
 def _ensure_app_layout():
@@ -132,6 +163,8 @@ def check_log_rotation(max_mb: int = 500):
     if size_mb <= max_mb:
         return
     print(f"\n[Warning] {RUNTIME_LOG} is {size_mb:.1f} MB (limit {max_mb} MB).")
+    if HEADLESS:
+        return
     ans = input("Keep existing log file? [Y/n]: ").strip().lower()
     if ans in ("n", "no"):
         RUNTIME_LOG.unlink(missing_ok=True)
@@ -143,7 +176,6 @@ def print_dependency_notice():
     print(" - Deno / Node.js: JavaScript challenge runtime for yt-dlp signature solving.")
     print(" - yt-dlp: media extraction/download engine.")
     print(" - ffmpeg: remuxing and MP3 extraction.")
-    print(" - spotdl: legacy Spotify fallback path.")
     print(" - rich + pyfiglet: terminal UI and splash rendering.")
     print(r"Windows PATH note: Scripts folder like %APPDATA%\Python\PythonXY\Scripts.")
     print("Linux/macOS PATH counterpart: ~/.local/bin and shell profile export PATH updates.")
@@ -160,21 +192,12 @@ def _runtime_dependency_snapshot():
         "node/nodejs": command_exists("node") or command_exists("nodejs"),
         "yt-dlp": command_exists("yt-dlp"),
         "ffmpeg": command_exists("ffmpeg"),
-        "spotdl": command_exists("spotdl"),
     }
     for name, ok in bins.items():
         status = "found" if ok else "missing"
         print(f" - {name}: {status}")
 
 
-configure_output_root_once()
-auto_add_python_scripts_to_path()
-_ensure_app_layout()
-check_log_rotation()
-install_exportify_vendor_requirements()
-print_dependency_notice()
-log_runtime("Startup: dependency notice shown.")
-
 # ──────────────────────────────────────────────
 # ANSI stripper for yt-dlp colored progress strings
 # ──────────────────────────────────────────────
@@ -199,26 +222,36 @@ def command_exists(cmd: str) -> bool:
     return shutil.which(cmd) is not None
 
 
-print("CrystalMedia performing dependency health check...")
-log_runtime("Dependency health check started.")
-_runtime_dependency_snapshot()
-
-if not command_exists("deno"):
-    print("Deno missing. Install manually if yt-dlp JS challenges fail: https://deno.com")
+def run_dependency_health_check(verbose: bool = True):
+    """Check external binaries and UI packages; prints hints only when ``verbose``."""
+    say = print if verbose else (lambda *_args, **_kwargs: None)
+    say("CrystalMedia performing dependency health check...")
+    log_runtime("Dependency health check started.")
+    if verbose:
+        _runtime_dependency_snapshot()
 
-if not (command_exists("node") or command_exists("nodejs")):
-    print("Node.js missing. Install manually for best yt-dlp runtime fallback: https://nodejs.org/en/download")
+    if not command_exists("deno"):
+        say("Deno missing. Install manually if yt-dlp JS challenges fail: https://deno.com")
 
-if not command_exists("yt-dlp"):
-    print("yt-dlp missing. Install it with: pip install yt-dlp[default,curl-cffi]")
+    if not (command_exists("node") or command_exists("nodejs")):
+        say("Node.js missing. Install manually for best yt-dlp runtime fallback: https://nodejs.org/en/download")
 
-if not command_exists("spotdl"):
-    print("spotdl missing (legacy fallback). Install with: pip install spotdl")
+    if not command_exists("yt-dlp"):
+        say("yt-dlp missing. Install it with: pip install yt-dlp[default,curl-cffi]")
 
-if not command_exists("ffmpeg"):
-    print("ffmpeg missing. Install via your OS package manager (or use Docker).")
+    if not command_exists("ffmpeg"):
+        say("ffmpeg missing. Install via your OS package manager (or use Docker).")
 
+    # rich + pyfiglet
+    for pkg in ["rich", "pyfiglet"]:
+        try:
+            __import__(pkg.replace("-", "_"))
+        except ImportError:
+            print(f"Missing Python dependency: {pkg}. Install with: pip install {pkg}")
 
+    say("Dependency health check completed. Importing libraries...\n")
+    _append_file(DEPS_LOG, f"[{datetime.now().isoformat(timespec='seconds')}] deno={command_exists('deno')} node={command_exists('node') or command_exists('nodejs')} yt-dlp={command_exists('yt-dlp')} ffmpeg={command_exists('ffmpeg')} exportify_req={(Path('vendor') / 'exportify' / 'requirements.txt').exists()}")
+    log_runtime("Dependency health check completed.")
 
 
 def run_quiet(cmd_list):
@@ -249,39 +282,83 @@ def refresh_js_runtimes():
     elif command_exists("nodejs"):
         run_quiet(["nodejs", "--version"])
 
-# rich + pyfiglet
-for pkg in ["rich", "pyfiglet"]:
-    try:
-        __import__(pkg.replace("-", "_"))
-    except ImportError:
-        print(f"Missing Python dependency: {pkg}. Install with: pip install {pkg}")
 
-print("Dependency health check completed. Importing libraries...\n")
-_append_file(DEPS_LOG, f"[{datetime.now().isoformat(timespec='seconds')}] deno={command_exists('deno')} node={command_exists('node') or command_exists('nodejs')} yt-dlp={command_exists('yt-dlp')} ffmpeg={command_exists('ffmpeg')} spotdl={command_exists('spotdl')} exportify_req={(Path('vendor') / 'exportify' / 'requirements.txt').exists()}")
-log_runtime("Dependency health check completed.")
+_JS_RUNTIMES_READY = False
+_JS_RUNTIMES_LOCK = threading.Lock()
+
+
+def ensure_js_runtimes_ready():
+    """Run refresh_js_runtimes() once per process, right before the first download.
+
+    Concurrent callers (daemon workers) wait for the first refresh to finish instead of
+    starting their own.
+    """
+    global _JS_RUNTIMES_READY
+    with _JS_RUNTIMES_LOCK:
+        if _JS_RUNTIMES_READY:
+            return
+        _JS_RUNTIMES_READY = True
+        refresh_js_runtimes()
+
+
+def new_youtube_dl(options: dict | None = None):
+    """Build a YoutubeDL instance, importing yt-dlp on first use."""
+    from yt_dlp import YoutubeDL
+    return YoutubeDL(options)
+
 
-# ──────────────────────────────────────────────
-# NOW import external libraries
-# ──────────────────────────────────────────────
-from rich.console import Console, Group
-from rich.panel import Panel
-from rich.text import Text
-from rich.live import Live
-from rich.layout import Layout
-from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn
-from rich.spinner import Spinner
-from pyfiglet import Figlet
-import yt_dlp
-from yt_dlp import YoutubeDL
-from spotdl import Spotdl
 from crystalmedia.extras import (
     StarfieldBackground,
-    write_mp3_tags,
     iter_downloaded_entries,
     extract_entry_final_path,
 )
-
-console = Console()
+from crystalmedia.archive import (
+    DownloadArchive,
+    query_key,
+    spotify_track_id,
+    spotify_track_key,
+    youtube_key,
+    youtube_video_id,
+)
+from crystalmedia import httpclient
+from crystalmedia import orchestrator as orchestration
+from crystalmedia.cache import MB, DiskCache, info_cache_key, info_ttl, strip_selection
+from crystalmedia.cookies import CookieSourceMemo, source_label
+from crystalmedia.fragments import (
+    DEFAULT_FRAGMENT_BUDGET,
+    MAX_FRAGMENTS,
+    PROFILES as DOWNLOAD_PROFILES,
+    THROUGHPUT,
+    ThroughputMeter,
+    fragment_concurrency,
+    apply_options as apply_fragment_options,
+    fragment_options,
+    parse_rate,
+    sweep_stale_fragments,
+)
+from crystalmedia.jobs import (
+    DONE as JOB_DONE,
+    FAILED as JOB_FAILED,
+    PENDING as JOB_PENDING,
+    RUNNING as JOB_RUNNING,
+    SKIPPED as JOB_SKIPPED,
+    JobManifest,
+    job_id_for,
+    list_unfinished,
+    open_unfinished,
+)
+from crystalmedia.matching import match_cache_key, pick_best, track_from_item
+from crystalmedia.pacing import PROFILES as PACING_PROFILES, ADAPTIVE, Pacer
+from crystalmedia.profiling import maybe_phase
+from crystalmedia.retry import AGE_RESTRICTED, JS_RUNTIME, PERMANENT, RATE_LIMITED, RetryPolicy, classify_error, retry_after_seconds
+from crystalmedia.spotify import iter_collection_track_ids, iter_exportify_tracks
+from crystalmedia.tagging import TaggingStage, tag_info
+from crystalmedia.transcode import TranscodeStage, default_workers as default_transcode_workers, mp3_args, mp4_plan
+from crystalmedia.workers import WorkerLocal, run_bounded
+from crystalmedia.ytdl import YtdlSession
+
+# rich/pyfiglet objects; populated by _load_ui_libraries() during startup().
+console = None
 
 # ──────────────────────────────────────────────
 # Pastel blue theme constants — defined early
@@ -294,10 +371,10 @@ COL_GOOD = "bold #B2F2BB"
 COL_MENU = "bold #D6E4FF"
 
 
-STARFIELD = StarfieldBackground()  # auto-sizes from terminal when available
-FIGLET = Figlet(font='slant')
-FIGLET_ART_LINES = FIGLET.renderText('CrystalMedia').rstrip('\n').splitlines()
+STARFIELD = None
+FIGLET_ART_LINES: list[str] = []
 CURRENT_MEDIA_TITLE = ""
+DEFAULT_DOWNLOAD_WORKERS = 3
 
 
 def _compose_splash_frame(body_lines: list[str] | None = None) -> Text:
@@ -378,26 +455,51 @@ def _compose_plain_splash(body_lines: list[str] | None = None) -> Text:
     return Text("\n".join(lines), style=COL_MENU)
 
 # ──────────────────────────────────────────────
-# List imported libraries with style
+# Lazy library loading
 # ──────────────────────────────────────────────
-console.print("\n[bold cyan]Libraries loaded after healing:[/bold cyan]")
-libs = [
-    ("rich", "console, panel, text, live, layout, progress"),
-    ("pyfiglet", "ascii art"),
-    ("yt_dlp", "YouTube downloader"),
-    ("spotdl", "Spotify downloader"),
-]
-for name, desc in libs:
-    console.print(f" • [bold green]{name}[/bold green] → {desc}")
+def _load_ui_libraries(render_figlet: bool = True):
+    """Import rich (+ pyfiglet for the splash) and build the shared UI objects."""
+    global Console, Group, Panel, Text, Live, Layout, Progress, SpinnerColumn, BarColumn, TextColumn, Spinner
+    global console, STARFIELD, FIGLET_ART_LINES
+    from rich.console import Console, Group
+    from rich.panel import Panel
+    from rich.text import Text
+    from rich.live import Live
+    from rich.layout import Layout
+    from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn
+    from rich.spinner import Spinner
+
+    console = Console()
+    STARFIELD = StarfieldBackground()  # auto-sizes from terminal when available
+    if render_figlet:
+        from pyfiglet import Figlet
+        FIGLET_ART_LINES = Figlet(font='slant').renderText('CrystalMedia').rstrip('\n').splitlines()
+    else:
+        FIGLET_ART_LINES = ["CrystalMedia"]
+
+
+def _import_ytdlp():
+    import yt_dlp  # noqa: F401  (warms the import so the first download doesn't pay for it)
 
-console.print("")
-refresh_js_runtimes()
+
+def print_loaded_libraries():
+    console.print("\n[bold cyan]Libraries loaded after healing:[/bold cyan]")
+    libs = [
+        ("rich", "console, panel, text, live, layout, progress"),
+        ("pyfiglet", "ascii art"),
+        ("yt_dlp", "YouTube downloader"),
+    ]
+    for name, desc in libs:
+        console.print(f" • [bold green]{name}[/bold green] → {desc}")
+    console.print("")
 
 # ──────────────────────────────────────────────
 # Clean Rich Live countdown INSIDE the yellow panel
 # ──────────────────────────────────────────────
 def pause_for_reading(message: str = "Continuing in", seconds: int = 15):
     """Live countdown inside the yellow Panel — press any key to skip."""
+    if HEADLESS:
+        return
     with Live(console=console, refresh_per_second=4, transient=True) as live:
         remaining = seconds
         while remaining > 0:
@@ -430,13 +532,6 @@ def pause_for_reading(message: str = "Continuing in", seconds: int = 15):
             time.sleep(1)
             remaining -= 1
 
-# 5-second countdown after import list
-pause_for_reading("Imports complete", 5)
-
-# Check FFmpeg availability (no runtime install/download)
-if not command_exists("ffmpeg"):
-    console.print(Text("FFmpeg missing — install it to enable audio extraction/remuxing.", style=COL_WARN))
-
 # ──────────────────────────────────────────────
 # Splash variants
 # ──────────────────────────────────────────────
@@ -473,7 +568,7 @@ def clear_screen():
 # ──────────────────────────────────────────────
 # Directory structure
 # ──────────────────────────────────────────────
-def create_folders():
+def create_folders(announce: bool = True):
     base = DOWNLOADS_ROOT
     base.mkdir(exist_ok=True)
     created_paths = []
@@ -482,13 +577,67 @@ def create_folders():
             path = (base / category / subcategory)
             path.mkdir(parents=True, exist_ok=True)
             created_paths.append(path)
+    if not announce:
+        return
     console.print(Text("Output directories initialised.", style=COL_GOOD))
     console.print(Text(f"Base folder: {base.resolve()}", style=COL_MENU))
     for path in created_paths:
         console.print(Text(f" • {path.resolve()}", style=COL_MENU))
     pause_for_reading("Directories ready", 2)
 
-create_folders()
+
+# ──────────────────────────────────────────────
+# Startup
+# ──────────────────────────────────────────────
+_STARTED = False
+
+
+def startup(fast: bool = False, headless: bool = False, profiler=None):
+    """Prepare output folders, libraries and dependency checks (idempotent).
+
+    The full interactive startup keeps the dependency notice, health check, library list
+    and countdowns. ``fast`` skips those, imports only what the UI needs and defers the
+    JS runtime refresh and yt-dlp import to the first download. ``profiler`` is an
+    optional PhaseTimer that receives per-phase timings.
+    """
+    global HEADLESS, _STARTED
+    if _STARTED:
+        return
+    _STARTED = True
+    HEADLESS = headless
+
+    with maybe_phase(profiler, "output root + logs"):
+        configure_output_root_once()
+        # Cheap, and batch/daemon runs need it too for runtime detection and the yt-dlp CLI fallback.
+        auto_add_python_scripts_to_path(quiet=HEADLESS)
+        _ensure_app_layout()
+        check_log_rotation()
+        http_client()
+    if not fast:
+        with maybe_phase(profiler, "dependency notice"):
+            print_dependency_notice()
+            log_runtime("Startup: dependency notice shown.")
+    with maybe_phase(profiler, "dependency health check"):
+        run_dependency_health_check(verbose=not fast)
+    with maybe_phase(profiler, "import rich + pyfiglet"):
+        _load_ui_libraries(render_figlet=not headless)
+    if fast:
+        with maybe_phase(profiler, "output folders"):
+            create_folders(announce=False)
+        return
+
+    with maybe_phase(profiler, "import yt-dlp"):
+        _import_ytdlp()
+    print_loaded_libraries()
+    with maybe_phase(profiler, "JS runtime refresh"):
+        ensure_js_runtimes_ready()
+    # 5-second countdown after import list
+    pause_for_reading("Imports complete", 5)
+    # Check FFmpeg availability (no runtime install/download)
+    if not command_exists("ffmpeg"):
+        console.print(Text("FFmpeg missing — install it to enable audio extraction/remuxing.", style=COL_WARN))
+    with maybe_phase(profiler, "output folders"):
+        create_folders()
 
 # ──────────────────────────────────────────────
 # Fixed Progress Logger with Layout
@@ -496,14 +645,14 @@ create_folders()
 
 class FixedProgressLogger:
     """Animated starfield-backed progress logger with fixed panels."""
-    def __init__(self, console_obj, header_lines: list[str] | None = None):
+    def __init__(self, console_obj, header_lines: list[str] | None = None, track_slots: int = 0):
         self.console = console_obj
         self.logs = []
         self.header_lines = header_lines or ["Download in progress"]
         self.layout = Layout()
         self.layout.split_column(
             Layout(name="header", size=12),
-            Layout(name="progress", size=8),
+            Layout(name="progress", size=8 + max(0, track_slots)),
             Layout(name="logs", size=16),
         )
         self.progress = Progress(
@@ -520,6 +669,7 @@ class FixedProgressLogger:
         self.layout["logs"].update(self._waiting_logs_panel())
         self.started = False
         self._lock = threading.Lock()
+        self._logs_lock = threading.Lock()
         self._stop_event = threading.Event()
         self._anim_thread = None
 
@@ -554,7 +704,9 @@ class FixedProgressLogger:
 
     def _render_log_panel(self):
         log_text = Text()
-        for log_entry in self.logs:
+        with self._logs_lock:
+            log_entries = list(self.logs)
+        for log_entry in log_entries:
             log_text.append_text(log_entry)
             log_text.append("\n")
 
@@ -604,15 +756,17 @@ class FixedProgressLogger:
         else:
             style = COL_MENU
 
-        self.logs.append(Text(msg, style=style))
+        with self._logs_lock:
+            self.logs.append(Text(msg, style=style))
+            if len(self.logs) > 15:
+                self.logs = self.logs[-15:]
+            log_entries = list(self.logs)
         log_runtime(f"[{level.upper()}] {msg}")
         if level in ("error", "warning"):
             log_crash(msg)
-        if len(self.logs) > 15:
-            self.logs = self.logs[-15:]
 
         log_text = Text()
-        for log_entry in self.logs:
+        for log_entry in log_entries:
             log_text.append_text(log_entry)
             log_text.append("\n")
 
@@ -646,6 +800,27 @@ class FixedProgressLogger:
         with self._lock:
             self.layout["progress"].update(self._render_progress_panel())
 
+    def start_track(self, description: str):
+        """Add a per-track bar below the overall progress; returns its task id."""
+        task_id = self.progress.add_task(description[:60], total=100)
+        with self._lock:
+            self.layout["progress"].update(self._render_progress_panel())
+        return task_id
+
+    def update_track(self, task_id, percent: float, description: str | None = None):
+        if description is None:
+            self.progress.update(task_id, completed=percent)
+        else:
+            self.progress.update(task_id, completed=percent, description=description[:60])
+
+    def finish_track(self, task_id):
+        try:
+            self.progress.remove_task(task_id)
+        except KeyError:
+            pass
+        with self._lock:
+            self.layout["progress"].update(self._render_progress_panel())
+
     def mark_complete(self, description: str = "Download complete!"):
         if self.task is None:
             self.task = self.progress.add_task(description, total=100, completed=100)
@@ -685,6 +860,60 @@ class FixedProgressLogger:
 
 
 
+class PlainProgressLogger:
+    """Line-oriented stand-in for FixedProgressLogger used by headless batch runs."""
+    def __init__(self, console_obj, header_lines: list[str] | None = None, track_slots: int = 0):
+        self.console = console_obj
+        self.header_lines = header_lines or ["Download in progress"]
+        self._lock = threading.Lock()
+        self._last_bucket = -1
+        self._next_track = 0
+
+    def start(self):
+        for line in self.header_lines:
+            self.console.print(Text(line, style=COL_ACC))
+
+    def stop(self):
+        return
+
+    def add_log(self, msg: str, level: str = "info"):
+        msg = strip_ansi(msg).replace("\n", " ").strip()
+        style = {"error": COL_ERR, "warning": COL_WARN, "success": COL_GOOD}.get(level, COL_MENU)
+        with self._lock:
+            self.console.print(Text(msg, style=style))
+        log_runtime(f"[{level.upper()}] {msg}")
+        if level in ("error", "warning"):
+            log_crash(msg)
+
+    def update_progress(self, percent: float, description: str = "Downloading"):
+        bucket = int(percent // 25)
+        if bucket != self._last_bucket:
+            self._last_bucket = bucket
+            self.add_log(f"{description}: {percent:.0f}%", "info")
+
+    def start_track(self, description: str):
+        with self._lock:
+            self._next_track += 1
+            return self._next_track
+
+    def update_track(self, task_id, percent: float, description: str | None = None):
+        return
+
+    def finish_track(self, task_id):
+        return
+
+    def mark_complete(self, description: str = "Download complete!"):
+        self.add_log(description, "success")
+
+    def wait_for_continue(self, message: str = "Download success", seconds: int = 30):
+        return
+
+
+def make_progress_logger(header_lines: list[str], track_slots: int = 0):
+    logger_cls = PlainProgressLogger if HEADLESS else FixedProgressLogger
+    return logger_cls(console, header_lines, track_slots=track_slots)
+
+
 def build_download_header(title: str, mode: str, content_type: str, target_dir: Path) -> list[str]:
     return [
         f"Downloading: {title}",
@@ -703,7 +932,7 @@ USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Edg/131.0.0.0",
 ]
 
-def get_ydl_options(is_playlist: bool, content_type: str) -> dict:
+def get_ydl_options(is_playlist: bool, content_type: str, quality: str | None = None, bitrate: str | None = None) -> dict:
     subfolder = "Playlist" if is_playlist else "Single"
     base_path = (
         str(DOWNLOADS_ROOT / ("YT VIDEO" if content_type == "video" else "YT MUSIC") / subfolder / "%(playlist_title)s" / "%(title)s.%(ext)s")
@@ -717,7 +946,7 @@ def get_ydl_options(is_playlist: bool, content_type: str) -> dict:
         "noprogress": True,
         "retries": 20,
         "fragment_retries": 10,
-        "keep_fragments": True,
+        "keep_fragments": False,
         "no_clean_infojson": True,
         "concurrent_fragments": 1,
         "http_headers": {"User-Agent": random.choice(USER_AGENTS)},
@@ -729,19 +958,25 @@ def get_ydl_options(is_playlist: bool, content_type: str) -> dict:
         "extractor_retries": 3,
         "file_access_retries": 3,
     }
-    if is_playlist:
-        options.update({"sleep_requests": 2, "sleep_interval": 5, "max_sleep_interval": 15})
-    else:
-        options.update({"sleep_requests": 1, "sleep_interval": 3, "max_sleep_interval": 10})
     if content_type == "video":
-        options["format"] = select_mp4_quality()
-        options["postprocessors"] = [{"key": "FFmpegVideoConvertor", "preferedformat": "mp4"}]
+        options["format"] = MP4_QUALITY_FORMATS[quality or select_mp4_quality()]
+        # At equal resolution prefer H.264/AAC so merging and remuxing stay stream copies.
+        options["format_sort"] = ["res", "vcodec:h264", "acodec:aac", "ext:mp4:m4a"]
+        # Remux only: the background transcode stage re-encodes codecs MP4 players reject.
+        options["postprocessors"] = [{"key": "FFmpegVideoRemuxer", "preferedformat": "mp4"}]
     else:
         options["format"] = "bestaudio/best"
-        bitrate = select_mp3_bitrate()
-        options["postprocessors"] = [{"key": "FFmpegExtractAudio", "preferredcodec": "mp3", "preferredquality": bitrate}]
+        bitrate = bitrate or select_mp3_bitrate()
+        options["postprocessors"] = [audio_postprocessor(bitrate)]
     return options
 
+
+def audio_postprocessor(bitrate: str) -> dict:
+    """MP3 extraction at ``bitrate``; ``native`` keeps the downloaded Opus/AAC stream (remux only)."""
+    if bitrate == NATIVE_AUDIO:
+        return {"key": "FFmpegExtractAudio", "preferredcodec": "best"}
+    return {"key": "FFmpegExtractAudio", "preferredcodec": "mp3", "preferredquality": bitrate}
+
 def select_option_menu(title: str, options: list[str], default_index: int = 0, subtitle: str | None = None) -> int:
     """Animated arrow-key selection menu that keeps starfield running."""
     selected = max(0, min(default_index, len(options) - 1))
@@ -767,12 +1002,30 @@ def select_option_menu(title: str, options: list[str], default_index: int = 0, s
                 return selected
 
 
+MP3_BITRATES = ["96", "128", "192", "256", "320"]
+NATIVE_AUDIO = "native"
+MP4_QUALITY_FORMATS = {
+    "low": "bestvideo[height<=?360][ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]",
+    "medium": "bestvideo[height<=?720][ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]",
+    "high": "bestvideo[height<=?1080][ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]",
+    "best": "bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]/best",
+}
+
+
 def select_mp3_bitrate() -> str:
-    options = ["Low (96 kbps)", "Medium (128 kbps)", "Standard (192 kbps) [default]", "High (256 kbps)", "Insane (320 kbps)"]
+    options = [
+        "Low (96 kbps)",
+        "Medium (128 kbps)",
+        "Standard (192 kbps) [default]",
+        "High (256 kbps)",
+        "Insane (320 kbps)",
+        "Native (original Opus/M4A, no re-encode)",
+    ]
     selected = select_option_menu("MP3 Bitrate Selection", options, default_index=2, subtitle=(f"Title: {CURRENT_MEDIA_TITLE}" if CURRENT_MEDIA_TITLE else None))
-    return ["96", "128", "192", "256", "320"][selected]
+    return [*MP3_BITRATES, NATIVE_AUDIO][selected]
 
 def select_mp4_quality() -> str:
+    """Quality name (a ``MP4_QUALITY_FORMATS`` key) picked from the menu."""
     options = [
         "Low (~360p)",
         "Medium (~480p–720p)",
@@ -780,13 +1033,7 @@ def select_mp4_quality() -> str:
         "Best (highest available) [default]",
     ]
     choice_idx = select_option_menu("MP4 Quality Selection", options, default_index=3, subtitle=(f"Title: {CURRENT_MEDIA_TITLE}" if CURRENT_MEDIA_TITLE else None))
-    if choice_idx == 0:
-        return "bestvideo[height<=?360][ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]"
-    if choice_idx == 1:
-        return "bestvideo[height<=?720][ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]"
-    if choice_idx == 2:
-        return "bestvideo[height<=?1080][ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]"
-    return "bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]/best"
+    return ["low", "medium", "high", "best"][choice_idx]
 
 
 def select_embed_extras() -> bool:
@@ -847,49 +1094,113 @@ def _cookie_browser_sources():
                 yield source
 
 
-def _cookie_source_label(source):
-    browser_name, _, profile, _ = source
-    return f"{browser_name}{f':{profile}' if profile else ''}"
+COOKIE_MEMO = None
+
 
+def get_cookie_memo() -> CookieSourceMemo:
+    """Working browser cookie source, remembered for ``cookie_source_ttl_hours`` (default 24)."""
+    global COOKIE_MEMO
+    if COOKIE_MEMO is None:
+        ttl = config_int("cookie_source_ttl_hours", 24, minimum=0, maximum=24 * 30) * 3600
+        COOKIE_MEMO = CookieSourceMemo(
+            DiskCache(APP_ROOT / "cache" / "cookie_source.sqlite3", max_bytes=MB, default_ttl=ttl),
+            ttl=ttl,
+        )
+    return COOKIE_MEMO
 
-def try_ytdlp_with_browser_cookies(url_or_query: str, options: dict, progress_logger, extract_info_mode: bool = False):
-    last_error = "No browser cookie source succeeded."
-    for source in _cookie_browser_sources():
+
+def _run_with_cookie_options(cookie_opts: dict, url_or_query: str, extract_info_mode: bool, session: YtdlSession | None, jar=None, extra_info=None):
+    """Run one cookie attempt; returns ``(info_or_None, cookiejar)``."""
+
+    def _run(browser_ydl):
+        if jar is not None and "cookiejar" not in browser_ydl.__dict__:
+            # Seed yt-dlp's cached cookiejar property with the already-decrypted jar.
+            browser_ydl.__dict__["cookiejar"] = jar
+        if extract_info_mode:
+            return browser_ydl.extract_info(url_or_query, download=True, extra_info=extra_info), browser_ydl.cookiejar
+        browser_ydl.download([url_or_query])
+        return None, browser_ydl.cookiejar
+
+    if session is not None:
+        return _run(session.get(cookie_opts))
+    with new_youtube_dl(cookie_opts) as browser_ydl:
+        return _run(browser_ydl)
+
+
+_COOKIE_SCAN_LOCK = threading.Lock()
+
+
+def try_ytdlp_with_browser_cookies(
+    url_or_query: str,
+    options: dict,
+    progress_logger,
+    extract_info_mode: bool = False,
+    session: YtdlSession | None = None,
+    extra_info: dict | None = None,
+):
+    memo = get_cookie_memo()
+
+    def attempt(source, remembered=False):
         cookie_opts = dict(options)
         cookie_opts["cookiesfrombrowser"] = source
-        label = _cookie_source_label(source)
-        progress_logger.add_log(f"Trying browser cookies fallback via: {label}", "warning")
-        try:
-            with YoutubeDL(cookie_opts) as browser_ydl:
-                if extract_info_mode:
-                    info = browser_ydl.extract_info(url_or_query, download=True)
-                    return True, info, label
-                browser_ydl.download([url_or_query])
-                return True, None, label
-        except Exception as e:
-            last_error = str(e)
-
-    # CLI fallback can work in environments where python-embedded cookie loading fails.
-    for source in _cookie_browser_sources():
-        label = _cookie_source_label(source)
-        browser_name, _, profile, _ = source
-        browser_arg = f"{browser_name}:{profile}" if profile else browser_name
-        progress_logger.add_log(f"Trying yt-dlp CLI cookie fallback via: {label}", "warning")
-        cmd = ["yt-dlp", "--cookies-from-browser", browser_arg, "--skip-download", "--simulate", url_or_query]
+        label = source_label(source)
+        if remembered:
+            progress_logger.add_log(f"Using remembered browser cookies: {label}", "info")
+        else:
+            progress_logger.add_log(f"Trying browser cookies fallback via: {label}", "warning")
+        info, jar = _run_with_cookie_options(cookie_opts, url_or_query, extract_info_mode, session, memo.jar(source), extra_info)
+        memo.remember(source, jar)
+        return True, info, label
+
+    # Fast path: go straight to the source that worked before (this run or a recent one).
+    known = memo.known()
+    if known is not None:
         try:
-            subprocess.check_call(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            cookie_opts = dict(options)
-            cookie_opts["cookiesfrombrowser"] = source
-            with YoutubeDL(cookie_opts) as browser_ydl:
-                if extract_info_mode:
-                    info = browser_ydl.extract_info(url_or_query, download=True)
-                    return True, info, label
-                browser_ydl.download([url_or_query])
-                return True, None, label
+            return attempt(known, remembered=True)
         except Exception as e:
-            last_error = str(e)
+            if not is_age_restricted_error(str(e)):
+                # The cookies were fine; this item failed for another reason.
+                return False, None, str(e)
+            memo.forget()
+
+    # Full probe, one worker at a time; others wait and then reuse what it found.
+    with _COOKIE_SCAN_LOCK:
+        found = memo.known()
+        if found is not None and found != known:
+            try:
+                return attempt(found, remembered=True)
+            except Exception as e:
+                return False, None, str(e)
+        if memo.exhausted:
+            return False, None, "No browser cookie source worked earlier in this session."
+        last_error = "No browser cookie source succeeded."
+        for source in _cookie_browser_sources():
+            if source == known:
+                continue
+            try:
+                return attempt(source)
+            except Exception as e:
+                last_error = str(e)
+
+        # CLI fallback can work in environments where python-embedded cookie loading fails.
+        for source in _cookie_browser_sources():
+            label = source_label(source)
+            browser_name, _, profile, _ = source
+            browser_arg = f"{browser_name}:{profile}" if profile else browser_name
+            progress_logger.add_log(f"Trying yt-dlp CLI cookie fallback via: {label}", "warning")
+            cmd = ["yt-dlp", "--cookies-from-browser", browser_arg, "--skip-download", "--simulate", url_or_query]
+            try:
+                subprocess.check_call(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                cookie_opts = dict(options)
+                cookie_opts["cookiesfrombrowser"] = source
+                info, jar = _run_with_cookie_options(cookie_opts, url_or_query, extract_info_mode, session, extra_info=extra_info)
+                memo.remember(source, jar)
+                return True, info, label
+            except Exception as e:
+                last_error = str(e)
 
-    return False, None, last_error
+        memo.exhausted = True
+        return False, None, last_error
 
 
 def extract_final_path_from_info(final_info):
@@ -937,24 +1248,585 @@ def to_js_runtime_option(runtime_list):
         return None
     return {runtime: {} for runtime in runtime_list}
 
-def download_youtube(url: str, content_type: str, is_playlist: bool, embed_extras: bool = False) -> None:
+INFO_CACHE = None
+
+
+def get_info_cache() -> DiskCache:
+    """yt-dlp info-dict cache under APP_ROOT/cache (config: info_cache_ttl_minutes, info_cache_max_mb)."""
+    global INFO_CACHE
+    if INFO_CACHE is None:
+        INFO_CACHE = DiskCache(
+            APP_ROOT / "cache" / "info.sqlite3",
+            max_bytes=config_int("info_cache_max_mb", 64, minimum=0, maximum=4096) * MB,
+            default_ttl=config_int("info_cache_ttl_minutes", 60, minimum=0, maximum=1440) * 60,
+        )
+    return INFO_CACHE
+
+
+EXTRAS_CACHE = None
+
+
+def get_extras_cache() -> DiskCache:
+    """Lyrics + cover-art cache under APP_ROOT/cache (config: extras_cache_max_mb)."""
+    global EXTRAS_CACHE
+    if EXTRAS_CACHE is None:
+        EXTRAS_CACHE = DiskCache(
+            APP_ROOT / "cache" / "extras.sqlite3",
+            max_bytes=config_int("extras_cache_max_mb", 256, minimum=0, maximum=8192) * MB,
+            default_ttl=30 * 86400,
+        )
+    return EXTRAS_CACHE
+
+
+MATCH_CACHE = None
+
+
+def get_match_cache() -> DiskCache:
+    """Chosen YouTube video per Spotify track/query, so repeat runs skip the search."""
+    global MATCH_CACHE
+    if MATCH_CACHE is None:
+        MATCH_CACHE = DiskCache(APP_ROOT / "cache" / "matches.sqlite3", max_bytes=16 * MB, default_ttl=180 * 86400)
+    return MATCH_CACHE
+
+
+def youtube_info_key(url: str, content_type: str, flat: bool = False) -> str:
+    """Info-cache key per mode and probe depth, so audio/video and flat/full probes never mix."""
+    return info_cache_key(url, f"{content_type}:{'flat' if flat else 'full'}")
+
+
+def cache_info(key: str, info: dict):
+    """Store probe output with format-selection keys stripped (see ``strip_selection``)."""
+    cache = get_info_cache()
+    cache.put_json(key, strip_selection(info), ttl=info_ttl(info, cache.default_ttl))
+
+
+def probe_info(url: str, content_type: str, match_filter=None, flat: bool = False) -> dict:
+    """Metadata-only extraction of ``url``, served from the info cache when fresh.
+
+    ``flat`` lists playlist entries (id, url, title) without resolving each video.
+    """
+    key = youtube_info_key(url, content_type, flat)
+    cached = get_info_cache().get_json(key)
+    if cached is not None:
+        return cached
+    probe_options = {"quiet": True}
+    if flat:
+        probe_options["extract_flat"] = "in_playlist"
+    if match_filter is not None:
+        probe_options["match_filter"] = match_filter
+    with new_youtube_dl(probe_options) as ydl:
+        info = ydl.sanitize_info(ydl.extract_info(url, download=False))
+    if isinstance(info, dict):
+        cache_info(key, info)
+    return info
+
+
+DOWNLOAD_ARCHIVE = None
+
+
+def get_download_archive() -> DownloadArchive:
+    """Completed-item index for the current output root (APP_ROOT/archive.jsonl)."""
+    global DOWNLOAD_ARCHIVE
+    if DOWNLOAD_ARCHIVE is None or DOWNLOAD_ARCHIVE.path != APP_ROOT / "archive.jsonl":
+        DOWNLOAD_ARCHIVE = DownloadArchive(APP_ROOT / "archive.jsonl")
+    return DOWNLOAD_ARCHIVE
+
+
+def _entry_output_path(entry: dict, content_type: str):
+    if content_type == "audio":
+        return extract_entry_final_path(entry)
+    requested = entry.get("requested_downloads") or []
+    if requested and isinstance(requested[0], dict) and requested[0].get("filepath"):
+        return Path(requested[0]["filepath"])
+    filename = entry.get("filepath") or entry.get("_filename")
+    return Path(filename) if filename else None
+
+
+def archive_downloaded_entries(info, content_type: str, extra_keys: list[str] | None = None) -> int:
+    """Record every finished entry of a yt-dlp result in the download archive."""
+    archive = get_download_archive()
+    recorded = 0
+    for entry in iter_downloaded_entries(info):
+        path = _entry_output_path(entry, content_type)
+        if not path or not path.exists() or not entry.get("id"):
+            continue
+        keys = [youtube_key(entry["id"], content_type), *(extra_keys or [])]
+        archive.record(keys, path, title=entry.get("title") or "")
+        recorded += 1
+    return recorded
+
+
+def _info_has_downloads(info) -> bool:
+    return any(entry.get("requested_downloads") or entry.get("_filename") for entry in iter_downloaded_entries(info))
+
+
+def configured_max_retries() -> int:
+    """Attempts per item before giving up on transient errors (config key ``max_retries``)."""
+    return config_int("max_retries", 8, minimum=1, maximum=50)
+
+
+def _playlist_entry_url(entry: dict) -> str | None:
+    target = entry.get("webpage_url") or entry.get("url")
+    if target and target.startswith("http"):
+        return target
+    return f"https://www.youtube.com/watch?v={entry['id']}" if entry.get("id") else None
+
+
+def _cancelled(cancel) -> bool:
+    return cancel is not None and cancel.is_set()
+
+
+def _raise_if_cancelled(cancel):
+    """Abort the current yt-dlp download from inside a progress hook."""
+    if _cancelled(cancel):
+        from yt_dlp.utils import DownloadCancelled
+        raise DownloadCancelled("Cancelled")
+
+
+def _download_target_with_retries(
+    target: str,
+    options: dict,
+    session: YtdlSession,
+    policy: RetryPolicy,
+    progress_logger,
+    runtime_profiles: list,
+    runtime_state: dict,
+    info_key: str | None = None,
+    extra_info: dict | None = None,
+    pacer: Pacer | None = None,
+):
+    """Download one URL (a single video or one playlist entry) with classified retries.
+
+    Returns ``(info, error_text, kind)``; ``info`` is None on failure. Permanent errors
+    fail fast, rate limits honour Retry-After, JS challenge failures move to the next
+    runtime profile. Each call may try every profile; ``runtime_state["index"]`` only
+    remembers the profile that last worked so later entries start there.
+    ``runtime_state["cancel"]`` (an Event) stops further attempts.
+    ``pacer`` supplies the sleep options and is told about rate limits.
+    """
+    attempt = 0
+    last_error, kind = "No JS runtime profile left to try.", JS_RUNTIME
+    cancel = runtime_state.get("cancel")
+    start = runtime_state.get("index", 0) % len(runtime_profiles) if runtime_profiles else 0
+    order = [(start + offset) % len(runtime_profiles) for offset in range(len(runtime_profiles))]
+    position = 0
+    while position < len(order):
+        if _cancelled(cancel):
+            return None, "Cancelled", PERMANENT
+        profile_index = order[position]
+        runtime_list = runtime_profiles[profile_index]
+        runtime_value = ",".join(runtime_list) if runtime_list else "default"
+        js_runtime_option = to_js_runtime_option(runtime_list)
+        if js_runtime_option is None:
+            options.pop("js_runtimes", None)
+        else:
+            options["js_runtimes"] = js_runtime_option
+        attempt += 1
+        if pacer is not None:
+            pacer.apply(options)
+        try:
+            downloader = session.get(options)
+            cached_info = get_info_cache().get_json(info_key) if info_key else None
+            if cached_info is not None:
+                # Reuse the probe's extraction (same as yt-dlp --load-info-json); format
+                # selection runs afresh with this job's format spec.
+                info = downloader.process_ie_result({**strip_selection(cached_info), **(extra_info or {})}, download=True)
+                if not _info_has_downloads(info):
+                    get_info_cache().delete(info_key)
+                    raise RuntimeError("Cached metadata produced no downloads (stream URLs expired?)")
+            else:
+                # Post-download info is not cached: only pre-selection probe output is reusable.
+                info = downloader.extract_info(target, download=True, extra_info=extra_info)
+            if pacer is not None and pacer.succeeded():
+                progress_logger.add_log(f"No throttling lately; pacing eased to level {pacer.level}", "info")
+            runtime_state["index"] = profile_index
+            return info, "", None
+        except KeyboardInterrupt:
+            raise
+        except Exception as e:
+            last_error = str(e)
+            kind = classify_error(e)
+            if info_key:
+                get_info_cache().delete(info_key)
+            progress_logger.add_log(f"Attempt {attempt}/{policy.max_attempts} failed ({kind}): {last_error[:80]}", "warning")
+
+            if kind == AGE_RESTRICTED:
+                progress_logger.add_log("Age-restricted content detected. Attempting browser-cookies fallback.", "warning")
+                ok, info_with_cookies, browser_or_err = try_ytdlp_with_browser_cookies(
+                    target, options, progress_logger, extract_info_mode=True, session=session, extra_info=extra_info
+                )
+                if ok:
+                    progress_logger.add_log(f"Cookie fallback succeeded with browser: {browser_or_err}", "success")
+                    return info_with_cookies, "", None
+                progress_logger.add_log(f"Cookie fallback failed: {browser_or_err[:120]}", "warning")
+                return None, last_error, kind
+            if kind == JS_RUNTIME:
+                position += 1
+                progress_logger.add_log(f"Runtime {runtime_value} failed; falling back to next runtime profile.", "warning")
+                if position < len(order):
+                    progress_logger.add_log(f"JS runtime try {position + 1}/{len(order)}", "info")
+                continue
+            if kind == RATE_LIMITED:
+                options["http_headers"]["User-Agent"] = random.choice(USER_AGENTS)
+                progress_logger.add_log("Rate limit detected. Rotating user-agent...", "warning")
+                if pacer is not None and pacer.throttled():
+                    progress_logger.add_log(f"Slowing down: pacing level {pacer.level}", "warning")
+            delay = policy.next_delay(kind, attempt, retry_after_seconds(e))
+            if delay is None:
+                if kind == PERMANENT:
+                    progress_logger.add_log("Permanent error; not retrying.", "error")
+                return None, last_error, kind
+            progress_logger.add_log(f"Retrying in {delay:.0f}s", "info")
+            if cancel is not None:
+                cancel.wait(delay)
+            else:
+                time.sleep(delay)
+    return None, last_error, kind
+
+
+def configured_transcode_workers() -> int:
+    """ffmpeg processes run beside the downloads (``transcode_workers``; 0 = inline in yt-dlp)."""
+    return config_int("transcode_workers", default_transcode_workers(), minimum=0, maximum=32)
+
+
+def pipeline_transcode(options: dict, content_type: str, tagging: TaggingStage | None, log, workers: int) -> TranscodeStage:
+    """Move the ffmpeg conversion out of yt-dlp into a ``TranscodeStage`` fed by its hooks.
+
+    Encoded MP3s go on to ``tagging``; ``final_ext`` keeps yt-dlp's "already downloaded"
+    check looking for the converted file.
+    """
+    converter = options["postprocessors"][0]
+    if content_type == "audio":
+        stage = TranscodeStage(
+            "mp3", mp3_args(converter["preferredquality"]), max_workers=workers, on_done=tagging.submit if tagging else None, log=log
+        )
+    else:
+        stage = TranscodeStage("mp4", max_workers=workers, log=log, planner=mp4_plan)
+    options["postprocessors"] = options["postprocessors"][1:]
+    options["final_ext"] = stage.target_ext[1:]
+    options["postprocessor_hooks"] = [stage.postprocessor_hook]
+    return stage
+
+
+def configured_playlist_workers() -> int:
+    """Playlist entries downloaded in parallel (config key ``playlist_workers``)."""
+    return config_int("playlist_workers", 1, minimum=1, maximum=8)
+
+
+def youtube_job_path(url: str, content_type: str) -> Path:
+    return APP_ROOT / "jobs" / f"{job_id_for('youtube', url, {'content_type': content_type})}.jsonl"
+
+
+def spotify_job_path(url: str) -> Path:
+    return APP_ROOT / "jobs" / f"{job_id_for('spotify', url)}.jsonl"
+
+
+def unfinished_jobs() -> list[dict]:
+    """Headers of interrupted jobs under ``APP_ROOT/jobs``, oldest first."""
+    return [manifest.header for manifest in list_unfinished(APP_ROOT / "jobs")]
+
+
+def playlist_progress(url: str, content_type: str) -> dict | None:
+    """Per-entry status of a YouTube playlist job from its journal (None before expansion)."""
+    path = youtube_job_path(url, content_type)
+    if not path.exists():
+        return None
+    manifest = JobManifest(path)
+    return {
+        "counts": manifest.counts(),
+        "entries": [
+            {key: entry.get(key) for key in ("index", "key", "title", "status", "attempts", "path", "error_kind", "tag_status")}
+            for entry in manifest.ordered()
+        ],
+    }
+
+
+def resume_job(header: dict) -> bool:
+    """Continue an unfinished job with the parameters it was started with.
+
+    Journals written before menu choices were recorded may hold None; the batch defaults
+    stand in so a headless resume never opens a menu.
+    """
+    params = header.get("params") or {}
+    if header.get("kind") == "spotify":
+        csv_path = params.get("csv_path")
+        return download_spotify(
+            header["url"],
+            True,
+            embed_extras=bool(params.get("embed_extras")),
+            csv_path=Path(csv_path) if csv_path and Path(csv_path).is_file() else None,
+            bitrate=params.get("bitrate") or "192",
+        )
+    return download_youtube(
+        header["url"],
+        header.get("content_type", "audio"),
+        True,
+        embed_extras=bool(params.get("embed_extras")),
+        quality=params.get("quality") or "best",
+        bitrate=params.get("bitrate") or "192",
+        js_runtime=params.get("js_runtime") or "auto",
+        fragments=params.get("fragments"),
+        ratelimit=params.get("ratelimit"),
+        pacing=params.get("pacing"),
+    )
+
+
+def configured_download_profile() -> str:
+    """``download_profile``: ``throughput`` (parallel fragments) or ``balanced`` (one at a time)."""
+    return config_choice("download_profile", THROUGHPUT, DOWNLOAD_PROFILES)
+
+
+def configured_pacing_profile() -> str:
+    """``pacing``: ``adaptive`` (sleep only after throttling), ``aggressive``, ``balanced`` or ``stealth``."""
+    return config_choice("pacing", ADAPTIVE, PACING_PROFILES)
+
+
+def job_fragment_options(content_type: str, parallel_downloads: int, fragments: int | None = None, ratelimit=None) -> dict:
+    """Fragment concurrency and bandwidth cap for one job (explicit arguments override config)."""
+    concurrency = fragment_concurrency(
+        configured_download_profile(),
+        content_type,
+        parallel_downloads,
+        budget=config_int("fragment_budget", DEFAULT_FRAGMENT_BUDGET, minimum=1, maximum=MAX_FRAGMENTS),
+        requested=fragments or config_int("concurrent_fragments", 0, minimum=0, maximum=MAX_FRAGMENTS),
+    )
+    cap = parse_rate(ratelimit) or config_int("ratelimit_kbps", 0, minimum=0, maximum=10 ** 7) * 1024
+    return fragment_options(
+        concurrency,
+        cap or None,
+        parallel_downloads,
+        keep_fragments=bool(config_int("keep_fragments", 0, minimum=0, maximum=1)),
+        dashy=content_type == "video",
+    )
+
+
+def benchmark_fragments(url: str, content_type: str, counts, ratelimit=None) -> list[dict]:
+    """Download ``url`` once per fragment count into a scratch folder and report MB/s for each."""
+    results = []
+    for count in counts:
+        meter = ThroughputMeter()
+        error = None
+        with tempfile.TemporaryDirectory(prefix="crystalmedia-bench-") as scratch:
+            options = {
+                "outtmpl": str(Path(scratch) / "%(id)s.%(ext)s"),
+                "quiet": True,
+                "no_warnings": True,
+                "noprogress": True,
+                "format": "bestaudio/best" if content_type == "audio" else "bestvideo*/best",
+                "http_headers": {"User-Agent": random.choice(USER_AGENTS)},
+                "progress_hooks": [meter.observe],
+            }
+            apply_fragment_options(options, fragment_options(count, parse_rate(ratelimit), dashy=content_type == "video"))
+            try:
+                with new_youtube_dl(options) as downloader:
+                    downloader.download([url])
+            except Exception as exc:
+                error = str(exc)[:200]
+        results.append({"fragments": count, "bytes": meter.total_bytes, "seconds": meter.seconds, "mb_per_second": meter.mb_per_second(), "error": error})
+    return results
+
+
+def _entry_options(options: dict) -> dict:
+    """Per-worker copy of yt-dlp options (workers rotate User-Agent / runtime independently)."""
+    copied = dict(options)
+    copied["http_headers"] = dict(options.get("http_headers") or {})
+    return copied
+
+
+def _run_playlist_manifest(manifest: JobManifest, options, policy, progress_logger, runtime_profiles, runtime_state, archive, content_type, workers, track_state, pacer=None, transcode=None):
+    """Run every runnable manifest entry as its own task; returns the finished info dicts."""
+    header = manifest.header
+    for entry in manifest.ordered():
+        # A crash between download and transcode leaves a "done" entry without its file.
+        if entry["status"] == JOB_DONE and entry.get("path") and not Path(entry["path"]).exists():
+            manifest.update(entry["key"], status=JOB_PENDING)
+    todo = manifest.runnable()
+    total = len(manifest.entries)
+    extra_common = {
+        "playlist": header.get("title"),
+        "playlist_title": header.get("title"),
+        "playlist_id": header.get("playlist_id"),
+        "n_entries": total,
+        "playlist_count": total,
+    }
+    if len(todo) < total:
+        progress_logger.add_log(f"Resuming job: {total - len(todo)}/{total} entries already finished", "info")
+    if workers > 1:
+        progress_logger.add_log(f"Playlist workers: {workers}", "info")
+    contexts = WorkerLocal(lambda: (YtdlSession(new_youtube_dl), _entry_options(options)), lambda ctx: ctx[0].close())
+    results = []
+
+    def run_entry(_idx, entry):
+        key = entry["key"]
+        label = f"[{entry['index']}/{total}] {entry.get('title') or key}"
+        if _cancelled(runtime_state.get("cancel")):
+            return False
+        if entry.get("id") and archive.lookup(youtube_key(entry["id"], content_type)):
+            manifest.update(key, status=JOB_SKIPPED)
+            progress_logger.add_log(f"{label} already downloaded", "success")
+            return True
+        manifest.update(key, status=JOB_RUNNING, attempts=entry.get("attempts", 0) + 1)
+        progress_logger.add_log(label, "info")
+        session, entry_options = contexts.get()
+        if workers > 1:
+            track_state.task_id = progress_logger.start_track(label)
+        try:
+            info, err_text, kind = _download_target_with_retries(
+                entry["url"], entry_options, session, policy, progress_logger, runtime_profiles, runtime_state,
+                info_key=youtube_info_key(entry["url"], content_type),
+                extra_info={**extra_common, "playlist_index": entry.get("playlist_index")},
+                pacer=pacer,
+            )
+        finally:
+            if workers > 1:
+                progress_logger.finish_track(track_state.task_id)
+                track_state.task_id = None
+        if info is None and _cancelled(runtime_state.get("cancel")):
+            manifest.update(key, status=JOB_PENDING)
+            return False
+        if info is None:
+            manifest.update(key, status=JOB_FAILED, error=err_text[:300], error_kind=kind)
+            progress_logger.add_log(f"{label} failed ({kind}): {err_text[:100]}", "error")
+            return False
+        downloaded = list(iter_downloaded_entries(info))
+        if transcode is not None:
+            downloaded = [transcode.retarget(item) for item in downloaded]
+        path = _entry_output_path(downloaded[0], content_type) if downloaded else None
+        manifest.update(
+            key,
+            status=JOB_DONE,
+            path=str(path) if path else None,
+            tag_info=tag_info(downloaded[0]) if downloaded else None,
+            error=None,
+            error_kind=None,
+        )
+        results.append(info)
+        return True
+
+    finished = {"count": 0}
+
+    def on_done(_idx, entry, _ok, error):
+        finished["count"] += 1
+        if error is not None:
+            manifest.update(entry["key"], status=JOB_FAILED, error=str(error)[:300], error_kind="transient")
+            progress_logger.add_log(f"Worker error for {entry.get('title') or entry['key']}: {str(error)[:120]}", "warning")
+        done = total - len(todo) + finished["count"]
+        progress_logger.update_progress(done / max(total, 1) * 100, f"Playlist {done}/{total}")
+
+    try:
+        run_bounded(todo, run_entry, workers, on_done)
+    finally:
+        contexts.close_all()
+    return results
+
+
+def download_youtube(
+    url: str,
+    content_type: str,
+    is_playlist: bool,
+    embed_extras: bool = False,
+    quality: str | None = None,
+    bitrate: str | None = None,
+    js_runtime: str | None = None,
+    fragments: int | None = None,
+    ratelimit: str | None = None,
+    pacing: str | None = None,
+    cancel: threading.Event | None = None,
+) -> bool:
+    """Download a YouTube item/playlist; menus are skipped for options passed explicitly.
+
+    Setting ``cancel`` stops the job between (and inside) downloads; unfinished playlist
+    entries stay pending in the job journal.
+    """
     global CURRENT_MEDIA_TITLE
     title = "Unknown"
     CURRENT_MEDIA_TITLE = ""
-    try:
-        with YoutubeDL({"quiet": True}) as ydl:
-            info = ydl.extract_info(url, download=False)
+    archive = get_download_archive()
+    video_id = None if is_playlist else youtube_video_id(url)
+    archived = archive.lookup(youtube_key(video_id, content_type)) if video_id else None
+    if archived:
+        console.print(Text(f"Already downloaded (archive): {archived['path']}", style=COL_GOOD))
+        return True
+    archive_filter = archive.youtube_match_filter(content_type)
+
+    # Only a single video's full probe is reusable for the download itself.
+    info_key = None if is_playlist else youtube_info_key(url, content_type)
+    playlist_info = None
+    manifest = None
+    manifest_path = None
+    if is_playlist:
+        manifest_path = youtube_job_path(url, content_type)
+        manifest = open_unfinished(manifest_path)
+        if manifest is not None and not manifest.entries:
+            manifest = None
+    if manifest is not None:
+        title = manifest.header.get("title") or title
+        CURRENT_MEDIA_TITLE = title
+        counts = manifest.counts()
+        console.print(Text(f"Resuming playlist job: {title} ({counts[JOB_DONE] + counts[JOB_SKIPPED]}/{len(manifest.entries)} done)", style=COL_ACC))
+        # The journaled choices answer the menus; options passed explicitly still win.
+        params = manifest.header.get("params") or {}
+        embed_extras = embed_extras or bool(params.get("embed_extras"))
+        quality = quality or params.get("quality")
+        bitrate = bitrate or params.get("bitrate")
+        js_runtime = js_runtime or params.get("js_runtime")
+        fragments = fragments if fragments is not None else params.get("fragments")
+        ratelimit = ratelimit or params.get("ratelimit")
+        pacing = pacing or params.get("pacing")
+    else:
+        try:
+            info = probe_info(url, content_type, match_filter=archive_filter if is_playlist else None, flat=is_playlist)
             title = info.get('title', 'Unknown')
             if is_playlist:
                 title = info.get('playlist_title', title) or title
-        CURRENT_MEDIA_TITLE = title
-        if is_playlist:
-            console.print(Text(f"Downloading playlist: {title}", style=COL_ACC))
-        else:
-            media_label = "video" if content_type == "video" else "audio"
-            console.print(Text(f"Downloading {media_label}: {title}", style=COL_ACC))
-    except Exception:
-        console.print(Text("Could not extract title — downloading anyway...", style=COL_WARN))
+                playlist_info = info
+            CURRENT_MEDIA_TITLE = title
+            if is_playlist:
+                console.print(Text(f"Downloading playlist: {title}", style=COL_ACC))
+            else:
+                media_label = "video" if content_type == "video" else "audio"
+                console.print(Text(f"Downloading {media_label}: {title}", style=COL_ACC))
+        except Exception:
+            console.print(Text("Could not extract title — downloading anyway...", style=COL_WARN))
+    # Settle menu choices before the journal is written: --resume runs headless and must not prompt.
+    if content_type == "video":
+        quality = quality or select_mp4_quality()
+    else:
+        bitrate = bitrate or select_mp3_bitrate()
+    js_runtime = js_runtime or select_js_runtime_preference()
+    if manifest is None:
+        entries = [e for e in (playlist_info or {}).get("entries") or [] if isinstance(e, dict) and _playlist_entry_url(e)]
+        if entries:
+            # Expand once and persist, so a crash or restart resumes without re-extracting.
+            manifest = JobManifest.create(
+                manifest_path,
+                {
+                    "kind": "youtube",
+                    "url": url,
+                    "content_type": content_type,
+                    "title": playlist_info.get("title") or title,
+                    "playlist_id": playlist_info.get("id"),
+                    "params": {
+                        "embed_extras": embed_extras,
+                        "quality": quality,
+                        "bitrate": bitrate,
+                        "js_runtime": js_runtime,
+                        "fragments": fragments,
+                        "ratelimit": ratelimit,
+                        "pacing": pacing,
+                    },
+                },
+                [
+                    {
+                        "key": entry.get("id") or _playlist_entry_url(entry),
+                        "id": entry.get("id"),
+                        "url": _playlist_entry_url(entry),
+                        "title": entry.get("title") or entry.get("id"),
+                        "playlist_index": entry.get("playlist_index") or index,
+                    }
+                    for index, entry in enumerate(entries, start=1)
+                ],
+            )
 
     subfolder = "Playlist" if is_playlist else "Single"
     target_dir = DOWNLOADS_ROOT / ("YT VIDEO" if content_type == "video" else "YT MUSIC") / subfolder
@@ -963,19 +1835,35 @@ def download_youtube(url: str, content_type: str, is_playlist: bool, embed_extra
     mode = "Playlist" if is_playlist else "Single Item"
     console.print(Text(f"Initiating {mode} {content_type.upper()} download → {target_dir}", style=COL_ACC))
 
-    options = get_ydl_options(is_playlist, content_type)
+    options = get_ydl_options(is_playlist, content_type, quality=quality, bitrate=bitrate)
+    options["match_filter"] = archive_filter
 
-    runtime_preference = select_js_runtime_preference()
+    runtime_preference = js_runtime or select_js_runtime_preference()
+    ensure_js_runtimes_ready()
 
-    STARFIELD.stop()
-    clear_screen()
+    if not HEADLESS:
+        STARFIELD.stop()
+        clear_screen()
+
+    entry_workers = configured_playlist_workers() if manifest is not None else 1
+    apply_fragment_options(options, job_fragment_options(content_type, entry_workers, fragments, ratelimit))
+    pacer = Pacer(pacing or configured_pacing_profile(), is_playlist)
+    pacer.apply(options)
+    swept, swept_bytes = sweep_stale_fragments(target_dir)
 
     # Initialize fixed progress logger
     progress_header = build_download_header(title, mode, content_type, target_dir)
-    progress_logger = FixedProgressLogger(console, progress_header)
+    progress_logger = make_progress_logger(progress_header, track_slots=min(entry_workers, 6) if entry_workers > 1 else 0)
     progress_logger.start()
     progress_logger.add_log(f"Starting {mode} {content_type.upper()} download", "info")
     progress_logger.add_log(f"Title: {title}", "info")
+    fragment_note = f"Fragments: {options['concurrent_fragments']} per download"
+    if options.get("ratelimit"):
+        fragment_note += f", capped at {options['ratelimit'] * entry_workers / 1e6:.2f} MB/s"
+    progress_logger.add_log(fragment_note, "info")
+    progress_logger.add_log(f"Pacing: {pacer.profile}" + (" (no sleeps until throttled)" if pacer.adaptive else ""), "info")
+    if swept:
+        progress_logger.add_log(f"Removed {swept} stale fragment file(s) ({swept_bytes / 1e6:.1f} MB)", "info")
 
     class FixedYellowLogger:
         def __init__(self, logger):
@@ -1024,7 +1912,19 @@ def download_youtube(url: str, content_type: str, is_playlist: bool, embed_extra
 
     options["logger"] = FixedYellowLogger(progress_logger)
 
+    # With parallel playlist entries each worker reports into its own track row.
+    track_state = threading.local()
+    meter = ThroughputMeter()
+
     def progress_hook(d):
+        _raise_if_cancelled(cancel)
+        meter.observe(d)
+        task_id = getattr(track_state, "task_id", None)
+        if task_id is not None:
+            percent = _hook_percent(d) if d['status'] == 'downloading' else 100 if d['status'] == 'finished' else None
+            if percent is not None:
+                progress_logger.update_track(task_id, percent)
+            return
         if d['status'] == 'downloading':
             raw_percent = d.get('_percent_str', '0%')
             clean_percent = strip_ansi(raw_percent).strip('%')
@@ -1039,62 +1939,89 @@ def download_youtube(url: str, content_type: str, is_playlist: bool, embed_extra
 
     options["progress_hooks"] = [progress_hook]
 
-    retry_count = 0
-    max_retries = 30
+    # MP3s are tagged in the background as each one finishes, overlapping later downloads.
+    tagging = None
+    if content_type == "audio":
+        on_tagged = None
+        if manifest is not None:
+            def on_tagged(path, info, ok):
+                if info.get("id") in manifest.entries:
+                    manifest.update(info["id"], tag_status="tagged" if ok else "failed", path=str(path))
+        tagging = TaggingStage(
+            USER_AGENTS,
+            embed_extras,
+            max_workers=configured_tag_workers(),
+            log=progress_logger.add_log,
+            cache=get_extras_cache(),
+            on_result=on_tagged,
+            orchestrator=orchestrator(),
+        )
+        options["postprocessor_hooks"] = [tagging.postprocessor_hook]
+
+    # ffmpeg runs on its own pool so the next download starts while this one encodes.
+    transcode = None
+    transcode_workers = configured_transcode_workers()
+    # Native audio is only remuxed by yt-dlp, so there is nothing to hand to the pool.
+    needs_encode = content_type == "video" or options["postprocessors"][0].get("preferredcodec") != "best"
+    if transcode_workers and needs_encode and command_exists("ffmpeg"):
+        transcode = pipeline_transcode(options, content_type, tagging, progress_logger.add_log, transcode_workers)
+        progress_logger.add_log(f"Transcoding on {transcode.workers} background worker(s)", "info")
+
     final_info = None
     final_path = None
     download_completed = False
+    failed_items = []
+    skipped_items = 0
 
+    policy = RetryPolicy(max_attempts=configured_max_retries())
     runtime_profiles = build_js_runtime_profiles(runtime_preference)
+    runtime_state = {"index": 0, "cancel": cancel}
+    progress_logger.add_log(f"JS runtime try 1/{len(runtime_profiles)}", "info")
+    # One warm YoutubeDL across retries; rebuilt only when options change (runtime, UA, cookies).
+    session = YtdlSession(new_youtube_dl)
+    # Errors must surface so they can be classified; playlists are retried per entry below.
+    options["ignoreerrors"] = False
 
-    for runtime_try, runtime_list in enumerate(runtime_profiles, start=1):
-        runtime_value = ",".join(runtime_list) if runtime_list else "default"
-        js_runtime_option = to_js_runtime_option(runtime_list)
-        if js_runtime_option is None:
-            options.pop("js_runtimes", None)
+    try:
+        if manifest is not None:
+            results = _run_playlist_manifest(
+                manifest, options, policy, progress_logger, runtime_profiles, runtime_state, archive, content_type, entry_workers, track_state, pacer, transcode
+            )
+            failed_items = [entry.get("title") or entry["key"] for entry in manifest.ordered() if entry["status"] == JOB_FAILED]
+            skipped_items = sum(1 for entry in manifest.ordered() if entry["status"] == JOB_SKIPPED)
+            final_info = {"entries": results}
+            download_completed = bool(results) or not failed_items
+            if not manifest.runnable():
+                manifest.update_job(status=JOB_DONE)
         else:
-            options["js_runtimes"] = js_runtime_option
-        progress_logger.add_log(f"JS runtime try {runtime_try}/{len(runtime_profiles)} → {runtime_value}", "info")
-        while retry_count < max_retries:
-            try:
-                with YoutubeDL(options) as downloader:
-                    final_info = downloader.extract_info(url, download=True)
-
+            if is_playlist:
+                # Entries could not be listed up front; fall back to one playlist-wide call.
+                options["ignoreerrors"] = True
+            final_info, err_text, kind = _download_target_with_retries(
+                url, options, session, policy, progress_logger, runtime_profiles, runtime_state, info_key=info_key, pacer=pacer
+            )
+            download_completed = final_info is not None
+            if download_completed:
                 final_path = extract_final_path_from_info(final_info)
-                download_completed = True
-                break
-            except KeyboardInterrupt:
-                progress_logger.stop()
-                raise
-            except Exception as e:
-                err_text = str(e)
-                retry_count += 1
-                progress_logger.add_log(f"Attempt {retry_count}/{max_retries} failed: {err_text[:80]}", "warning")
-
-                if is_age_restricted_error(err_text):
-                    progress_logger.add_log("Age-restricted content detected. Attempting browser-cookies fallback.", "warning")
-                    ok, info_with_cookies, browser_or_err = try_ytdlp_with_browser_cookies(url, options, progress_logger, extract_info_mode=True)
-                    if ok:
-                        final_info = info_with_cookies
-                        final_path = extract_final_path_from_info(info_with_cookies)
-                        progress_logger.add_log(f"Cookie fallback succeeded with browser: {browser_or_err}", "success")
-                        download_completed = True
-                        break
-                    progress_logger.add_log(f"Cookie fallback failed: {browser_or_err[:120]}", "warning")
-
-                if any(keyword in err_text.lower() for keyword in ["rate limit", "throttl", "429", "443"]):
-                    options["http_headers"]["User-Agent"] = random.choice(USER_AGENTS)
-                    progress_logger.add_log("Rate limit detected. Rotating user-agent...", "warning")
-                if any(k in err_text.lower() for k in ["jsc", "challenge", "signature", "deno", "node"]):
-                    progress_logger.add_log(f"Runtime {runtime_value} failed; falling back to next runtime profile.", "warning")
-                    console.print(Text(f"Runtime {runtime_value} failed; falling back to next runtime profile.", style=COL_WARN))
-                    break
-                time.sleep(random.uniform(4, 10))
-
-        if download_completed:
-            break
-
-    if not download_completed:
+    except KeyboardInterrupt:
+        session.close()
+        if transcode is not None:
+            transcode.close(wait=False)
+        progress_logger.stop()
+        raise
+
+    if session.builds:
+        progress_logger.add_log(session.stats_line(), "info")
+    session.close()
+    if meter.total_bytes:
+        progress_logger.add_log(meter.stats_line(), "info")
+    progress_logger.add_log(pacer.stats_line(), "info")
+    if manifest is not None:
+        manifest.update_job(**pacer.stats())
+
+    if _cancelled(cancel):
+        progress_logger.add_log("Job cancelled; finished items are kept.", "warning")
+    elif not download_completed and manifest is None and kind != PERMANENT:
         progress_logger.stop()
         console.print(Text("All selected JS runtimes failed. Switching to fallback Z (noisy yt-dlp output)...", style=COL_WARN))
         noisy_options = dict(options)
@@ -1104,45 +2031,114 @@ def download_youtube(url: str, content_type: str, is_playlist: bool, embed_extra
         noisy_options.pop("logger", None)
         noisy_options.pop("progress_hooks", None)
         try:
-            with YoutubeDL(noisy_options) as noisy_downloader:
+            with new_youtube_dl(noisy_options) as noisy_downloader:
                 final_info = noisy_downloader.extract_info(url, download=True)
             final_path = extract_final_path_from_info(final_info)
             download_completed = True
         except Exception as e:
             console.print(Text(f"Noisy fallback failed: {str(e)}", style=COL_ERR))
 
-    if download_completed:
-        if content_type == "audio" and isinstance(final_info, dict):
+    if transcode is not None:
+        if transcode.pending:
+            progress_logger.update_progress(100, f"Encoding ({transcode.pending} left)")
+        encoded, encode_failed = transcode.close()
+        if encoded or encode_failed or transcode.fast_path:
+            progress_logger.add_log(transcode.stats_line(), "info")
+        if isinstance(final_info, dict):
+            for entry in iter_downloaded_entries(final_info):
+                transcode.retarget(entry)
+            final_path = extract_final_path_from_info(final_info) if final_path else None
+
+    if tagging is not None:
+        if download_completed and isinstance(final_info, dict):
+            # Catch files the hook never saw (cookie/noisy fallbacks, pre-existing downloads).
             for entry in iter_downloaded_entries(final_info):
                 mp3_path = extract_entry_final_path(entry)
-                if not mp3_path:
-                    continue
-                try:
-                    write_mp3_tags(mp3_path, entry, embed_extras=embed_extras, user_agents=USER_AGENTS, log=progress_logger.add_log)
-                except Exception as e:
-                    progress_logger.add_log(f"Metadata/lyrics embed failed for {mp3_path.name}: {str(e)[:120]}", "warning")
-        progress_logger.mark_complete("Download complete!")
+                if mp3_path and mp3_path.exists():
+                    tagging.submit(mp3_path, entry)
+        if manifest is not None:
+            # Files downloaded before a crash but never tagged.
+            for entry in manifest.ordered():
+                path = Path(entry["path"]) if entry["status"] == JOB_DONE and entry.get("path") else None
+                if path is not None and entry.get("tag_status") != "tagged" and path.exists():
+                    tagging.submit(path, entry.get("tag_info") or {"id": entry["key"], "title": entry.get("title")})
+        if tagging.pending:
+            progress_logger.update_progress(100, f"Tagging ({tagging.pending} left)")
+        tagged, tag_failed = tagging.close()
+        if tagged or tag_failed:
+            progress_logger.add_log(f"Tagged {tagged} file(s); {tag_failed} tagging failure(s).", "info")
+
+    if download_completed:
+        # Archive after tagging so the recorded size/checksum match the final file.
+        archived_now = archive_downloaded_entries(final_info, content_type)
+        if archived_now:
+            progress_logger.add_log(f"Archived {archived_now} item(s); re-runs will skip them.", "info")
+        if skipped_items:
+            progress_logger.add_log(f"Skipped {skipped_items} item(s) already in the archive.", "info")
+        if failed_items:
+            progress_logger.add_log(f"⚠ {len(failed_items)} item(s) failed: {', '.join(failed_items[:5])}", "warning")
+            progress_logger.add_log("Run the same playlist again to retry only the failed entries.", "info")
+        progress_logger.mark_complete("Download complete!" if not failed_items else f"Done with {len(failed_items)} failure(s)")
         if final_path:
             progress_logger.add_log(f"✓ Final file: {final_path}", "success")
         progress_logger.add_log(f"✓ Download complete → {target_dir}", "success")
         progress_logger.wait_for_continue("Download success", 30)
-        if final_path:
-            wait_for_enter_with_animation(f"Final file saved at: {final_path}")
-        else:
-            wait_for_enter_with_animation(f"Download complete → {target_dir}")
+        if not HEADLESS:
+            if final_path:
+                wait_for_enter_with_animation(f"Final file saved at: {final_path}")
+            else:
+                wait_for_enter_with_animation(f"Download complete → {target_dir}")
         CURRENT_MEDIA_TITLE = ""
-        return
+        return not failed_items and not _cancelled(cancel)
 
-    progress_logger.add_log("Maximum retries reached", "error")
+    progress_logger.add_log("Download failed; retries exhausted or error is permanent", "error")
     progress_logger.stop()
-    console.print(Text("Maximum retries reached. Check connection or try again later.", style=COL_ERR))
+    console.print(Text("Download failed. Check the URL/connection or try again later.", style=COL_ERR))
     pause_for_reading("Max retries — review above", 15)
     CURRENT_MEDIA_TITLE = ""
+    return False
+
+HTTP_CLIENT_CONFIGURED = False
+
+
+def http_client():
+    """Shared keep-alive HTTP client, sized from config (``http_max_per_host``, ``http_retries``)."""
+    global HTTP_CLIENT_CONFIGURED
+    if not HTTP_CLIENT_CONFIGURED:
+        HTTP_CLIENT_CONFIGURED = True
+        client = httpclient.configure(
+            max_per_host=config_int("http_max_per_host", 4, minimum=1, maximum=32),
+            retries=config_int("http_retries", 2, minimum=0, maximum=10),
+        )
+        client.set_rate_limit("open.spotify.com", config_int("spotify_requests_per_second", 10, minimum=0, maximum=100))
+        return client
+    return httpclient.default_client()
+
+ORCHESTRATOR_CONFIGURED = False
+
+
+def orchestrator():
+    """Shared asyncio loop for lookups, sized from config (``async_lookups``, ``async_blocking_workers``)."""
+    global ORCHESTRATOR_CONFIGURED
+    if not ORCHESTRATOR_CONFIGURED:
+        ORCHESTRATOR_CONFIGURED = True
+        return orchestration.configure(
+            max_lookups=config_int("async_lookups", orchestration.DEFAULT_LOOKUPS, minimum=1, maximum=512),
+            max_blocking=config_int("async_blocking_workers", orchestration.DEFAULT_BLOCKING, minimum=1, maximum=32),
+        )
+    return orchestration.default_orchestrator()
+
+
+def _spotify_oembed(url: str) -> dict:
+    return http_client().get_json(
+        f"https://open.spotify.com/oembed?url={urllib.parse.quote(url, safe=':/')}",
+        headers={"User-Agent": random.choice(USER_AGENTS)},
+        timeout=20,
+    )
+
 
 def _spotify_oembed_query(url: str) -> str:
-    req = urllib.request.Request(f"https://open.spotify.com/oembed?url={url}", headers={"User-Agent": random.choice(USER_AGENTS)})
-    with urllib.request.urlopen(req, timeout=20) as resp:
-        payload = json.loads(resp.read().decode("utf-8", errors="ignore"))
+    payload = _spotify_oembed(url)
     title = payload.get("title", "")
     author = payload.get("author_name", "")
     query = f"{title} {author}".strip()
@@ -1157,12 +2153,7 @@ def _playlist_name_from_url(url: str) -> str:
 def _playlist_display_name_from_url(url: str) -> str:
     """Prefer human playlist title from Spotify oEmbed; fallback to id slug."""
     try:
-        req = urllib.request.Request(
-            f"https://open.spotify.com/oembed?url={url}",
-            headers={"User-Agent": random.choice(USER_AGENTS)},
-        )
-        with urllib.request.urlopen(req, timeout=20) as resp:
-            payload = json.loads(resp.read().decode("utf-8", errors="ignore"))
+        payload = _spotify_oembed(url)
         title = (payload.get("title") or "").strip()
         if title:
             return title
@@ -1233,20 +2224,9 @@ def _find_exportify_csv(playlist_name: str):
     return files[0]
 
 
-def _queries_from_exportify_csv(csv_path: Path, max_tracks: int = 300):
-    queries = []
-    with csv_path.open("r", encoding="utf-8-sig", newline="") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            title = (row.get("Track Name") or row.get("track_name") or "").strip()
-            artists = (row.get("Artist Name(s)") or row.get("artist_names") or row.get("Artist Name") or "").strip()
-            if title:
-                query = f"{title} {artists}".strip()
-                if query and query not in queries:
-                    queries.append(query)
-            if len(queries) >= max_tracks:
-                break
-    return queries
+def _queries_from_exportify_csv(csv_path: Path, max_tracks: int | None = None):
+    """Stream Exportify rows as track items (no cap unless ``max_tracks`` is given)."""
+    return _peek_stream(islice(iter_exportify_tracks(csv_path), max_tracks))
 
 
 def _spotify_exportify_queries_interactive(url: str, wait_seconds: int = 180):
@@ -1281,114 +2261,104 @@ def _spotify_exportify_queries_interactive(url: str, wait_seconds: int = 180):
             console.print(Text(f"CSV filename doesn't look like playlist '{default_name}', continuing anyway.", style=COL_WARN))
         return _queries_from_exportify_csv(csv_path)
 
-    # No explicit filename: keep checking newest file until timeout.
-    remaining = max(wait_seconds, 10)
-    while remaining > 0:
-        guessed_csv = _find_exportify_csv(default_name)
-        if guessed_csv and guessed_csv.exists():
-            if not _csv_matches_playlist_name(guessed_csv, default_name):
-                console.print(Text(f"Using newest CSV despite name mismatch: {guessed_csv.name}", style=COL_WARN))
-            else:
-                console.print(Text(f"Detected Exportify CSV: {guessed_csv}", style=COL_GOOD))
-            try:
-                return _queries_from_exportify_csv(guessed_csv)
-            except Exception as e:
-                console.print(Text(f"Failed to parse CSV: {str(e)}", style=COL_ERR))
-                return []
-        if remaining % 10 == 0:
-            console.print(Text(f"Waiting for CSV in ./csv ... {remaining}s", style=COL_MENU))
-        time.sleep(1)
-        remaining -= 1
-
-    console.print(Text("Timed out waiting for CSV in ./csv.", style=COL_WARN))
-    return []
+    # No explicit filename: watch for the newest file until timeout.
+    def existing_csv():
+        path = _find_exportify_csv(default_name)
+        return path if path and path.exists() else None
+
+    def report_wait(remaining: float):
+        seconds = int(round(remaining))
+        if seconds % 10 == 0:
+            console.print(Text(f"Waiting for CSV in ./csv ... {seconds}s", style=COL_MENU))
+
+    loop = orchestrator()
+    guessed_csv = loop.run(loop.wait_for(existing_csv, max(wait_seconds, 10), interval=1.0, on_wait=report_wait))
+    if guessed_csv is None:
+        console.print(Text("Timed out waiting for CSV in ./csv.", style=COL_WARN))
+        return []
+    if not _csv_matches_playlist_name(guessed_csv, default_name):
+        console.print(Text(f"Using newest CSV despite name mismatch: {guessed_csv.name}", style=COL_WARN))
+    else:
+        console.print(Text(f"Detected Exportify CSV: {guessed_csv}", style=COL_GOOD))
+    try:
+        return _queries_from_exportify_csv(guessed_csv)
+    except Exception as e:
+        console.print(Text(f"Failed to parse CSV: {str(e)}", style=COL_ERR))
+        return []
 
 
 def _resolve_spotify_url(url: str) -> str:
     """Follow Spotify share redirects and return canonical open.spotify URL when possible."""
     try:
-        req = urllib.request.Request(url, headers={"User-Agent": random.choice(USER_AGENTS)})
-        with urllib.request.urlopen(req, timeout=20) as resp:
-            final_url = resp.geturl()
+        final_url = http_client().final_url(url, headers={"User-Agent": random.choice(USER_AGENTS)}, timeout=20)
         return final_url or url
     except Exception:
         return url
 
 
-def _extract_track_ids_from_page(page: str, max_tracks: int = 30):
-    track_ids = []
+def _iter_track_id_queries(track_ids, workers: int | None = None):
+    """Resolve streamed track ids to search items concurrently, keeping playlist order.
 
-    patterns = [
-        r'/track/([A-Za-z0-9]{22})',
-        r'\/track\/([A-Za-z0-9]{22})',
-        r'open\.spotify\.com/track/([A-Za-z0-9]{22})',
-        r'spotify:track:([A-Za-z0-9]{22})',
-        r'spotify%3Atrack%3A([A-Za-z0-9]{22})',
-        r'spotify%253Atrack%253A([A-Za-z0-9]{22})',
-        r'"uri"\s*:\s*"spotify:track:([A-Za-z0-9]{22})"',
-        r'"entityUri"\s*:\s*"spotify:track:([A-Za-z0-9]{22})"',
-    ]
-    for pattern in patterns:
-        for tid in re.findall(pattern, page):
-            if tid not in track_ids:
-                track_ids.append(tid)
-            if len(track_ids) >= max_tracks:
-                return track_ids
-
-    next_data_match = re.search(r'<script[^>]*id="__NEXT_DATA__"[^>]*>(.*?)</script>', page, flags=re.S)
-    if next_data_match:
-        payload_text = next_data_match.group(1)
-        for tid in re.findall(r'"spotify:track:([A-Za-z0-9]{22})"', payload_text):
-            if tid not in track_ids:
-                track_ids.append(tid)
-            if len(track_ids) >= max_tracks:
-                return track_ids
-
-    return track_ids
-
-
-def _spotify_page_queries(url: str, max_tracks: int = 30):
+    Each id is an oEmbed lookup coroutine on the shared loop, with up to ``2 * workers``
+    running ahead of the consumer, so the first items are ready while later ids are
+    still being discovered. Ids whose lookup fails or comes back empty (blocked/throttled)
+    fall back to their ``open.spotify.com/track/{id}`` URL in place.
+    """
+    http_client()
+    workers = workers or config_int("spotify_oembed_workers", 8, minimum=1, maximum=32)
+    loop = orchestrator()
+
+    async def resolve(tid):
+        return await loop.lookup(_spotify_oembed_query, f"https://open.spotify.com/track/{tid}")
+
+    seen = set()
+    for tid, query, error in loop.stream_ordered(track_ids, resolve, workers * 2):
+        if error is not None or not query:
+            query = f"https://open.spotify.com/track/{tid}"
+        if query not in seen:
+            seen.add(query)
+            yield {"query": query, "spotify_id": tid}
+
+
+def _spotify_page_queries(url: str, max_tracks: int | None = None):
+    """Stream search items for a Spotify playlist/album page, paging past the first screen.
+
+    Yields as track ids are discovered and resolved; ``max_tracks`` optionally caps the
+    count. Falls back to parsing track rows from the first page when no ids are found.
+    """
     url = _resolve_spotify_url(url)
-    req = urllib.request.Request(
+    first_page = []
+
+    def get_text(page_url, headers):
+        text = http_client().get_text(page_url, headers=headers, timeout=25)
+        if not first_page:
+            first_page.append(text)
+        return text
+
+    def get_json(api_url, headers):
+        return http_client().get_json(api_url, headers=headers, timeout=25)
+
+    track_ids = iter_collection_track_ids(
         url,
+        get_text,
+        get_json,
         headers={
             "User-Agent": random.choice(USER_AGENTS),
             "Accept-Language": "en-US,en;q=0.9",
             "Referer": "https://open.spotify.com/",
         },
+        log=log_runtime,
     )
-    with urllib.request.urlopen(req, timeout=25) as resp:
-        page = resp.read().decode("utf-8", errors="ignore")
-
-    queries = []
-    track_ids = _extract_track_ids_from_page(page, max_tracks=max_tracks)
-
-    unresolved_track_ids = []
-    for tid in track_ids:
-        try:
-            q = _spotify_oembed_query(f"https://open.spotify.com/track/{tid}")
-            if q and q not in queries:
-                queries.append(q)
-            else:
-                unresolved_track_ids.append(tid)
-        except Exception:
-            unresolved_track_ids.append(tid)
-            continue
-        if len(queries) >= max_tracks:
-            break
-
-    if queries:
-        return queries
-
-    # Last-resort fallback when IDs were found but oEmbed lookup is blocked/throttled.
-    for tid in unresolved_track_ids[:max_tracks]:
-        queries.append(f"https://open.spotify.com/track/{tid}")
-
-    if queries:
-        return queries
+    produced = 0
+    for item in _iter_track_id_queries(islice(track_ids, max_tracks)):
+        produced += 1
+        yield item
+    if produced or not first_page:
+        return
 
     # Fallback: row/label HTML parsing.
-    rows = re.findall(r'data-testid="track-row".*?(?=data-testid="track-row"|</body>)', page, flags=re.S)
+    queries = []
+    rows = re.findall(r'data-testid="track-row".*?(?=data-testid="track-row"|</body>)', first_page[0], flags=re.S)
     for row in rows:
         title_match = re.search(r'data-encore-id="listRowTitle"[^>]*>\s*<span[^>]*>(.*?)</span>', row, flags=re.S)
         artist_match = re.search(r'data-encore-id="text">(.*?)</span>', row, flags=re.S)
@@ -1401,12 +2371,95 @@ def _spotify_page_queries(url: str, max_tracks: int = 30):
         query = f"{title} {artist}".strip()
         if query and query not in queries:
             queries.append(query)
-        if len(queries) >= max_tracks:
+            yield query
+        if max_tracks and len(queries) >= max_tracks:
             break
-    return queries
 
 
-def _download_spotify_queries_with_ytdlp(queries, target_dir: Path, progress_logger: FixedProgressLogger, embed_extras: bool = False):
+def _peek_stream(items):
+    """Pull the first item (surfacing fetch errors now); returns [] when empty, else an iterator."""
+    items = iter(items)
+    try:
+        first = next(items)
+    except StopIteration:
+        return []
+    return chain([first], items)
+
+
+def _query_text(item) -> str:
+    """Search text for a Spotify work item (plain query string or metadata dict)."""
+    return item["query"] if isinstance(item, dict) else str(item)
+
+
+def _query_archive_keys(item) -> list[str]:
+    query = _query_text(item)
+    keys = [query_key(query)]
+    track_id = (item.get("spotify_id") if isinstance(item, dict) else None) or spotify_track_id(query)
+    if track_id:
+        keys.insert(0, spotify_track_key(track_id))
+    return keys
+
+
+def configured_tag_workers() -> int:
+    """Concurrent lyrics/cover lookups while tagging (config key ``tag_workers``)."""
+    return config_int("tag_workers", 4, minimum=1, maximum=16)
+
+
+def configured_match_candidates() -> int:
+    """Search results scored per Spotify track (config key ``match_candidates``)."""
+    return config_int("match_candidates", 5, minimum=1, maximum=20)
+
+
+def _choose_match(downloader, item, candidate_count: int, cache: DiskCache):
+    """Pick the best-scoring search hit for ``item`` without downloading anything.
+
+    Returns ``(watch_url, cache_key, from_cache)``; ``watch_url`` is None when no
+    candidate scores well enough, in which case the caller keeps ``ytsearch1:``.
+    """
+    track = track_from_item(item)
+    key = match_cache_key(track)
+    cached = cache.get_json(key)
+    if cached and cached.get("id"):
+        return f"https://www.youtube.com/watch?v={cached['id']}", key, True
+    result = downloader.extract_info(f"ytsearch{candidate_count}:{_query_text(item)}", download=False, process=False)
+    candidates = list(islice((result or {}).get("entries") or [], candidate_count))
+    best = pick_best(track, candidates)
+    if best is None:
+        return None, key, False
+    candidate, score = best
+    cache.put_json(key, {"id": candidate["id"], "title": candidate.get("title"), "score": round(score, 3)})
+    return f"https://www.youtube.com/watch?v={candidate['id']}", key, False
+
+
+def configured_download_workers() -> int:
+    """Parallel track downloads for Spotify jobs (config key ``download_workers``)."""
+    return config_int("download_workers", DEFAULT_DOWNLOAD_WORKERS, minimum=1, maximum=16)
+
+
+def _close_ytdl(downloader):
+    downloader.__exit__(None, None, None)
+
+
+def _hook_percent(d: dict):
+    total = d.get("total_bytes") or d.get("total_bytes_estimate")
+    downloaded = d.get("downloaded_bytes")
+    if total and downloaded is not None:
+        return min(100.0, (downloaded / total) * 100)
+    try:
+        return float(strip_ansi(d.get("_percent_str", "")).strip().strip("%"))
+    except ValueError:
+        return None
+
+
+def _download_spotify_queries_with_ytdlp(
+    queries,
+    target_dir: Path,
+    progress_logger: FixedProgressLogger,
+    embed_extras: bool = False,
+    workers: int | None = None,
+    bitrate: str = "192",
+    cancel: threading.Event | None = None,
+):
     target_dir.mkdir(parents=True, exist_ok=True)
 
     class SpotifyYTDLPLogger:
@@ -1430,72 +2483,194 @@ def _download_spotify_queries_with_ytdlp(queries, target_dir: Path, progress_log
         def error(self, msg):
             self.logger.add_log(strip_ansi(str(msg)), 'error')
 
+    # Each worker thread reuses its own YoutubeDL, so hooks find their track via thread-local state.
+    track_state = threading.local()
+
+    def progress_hook(d):
+        _raise_if_cancelled(cancel)
+        task_id = getattr(track_state, "task_id", None)
+        if task_id is None:
+            return
+        if d.get("status") == "downloading":
+            percent = _hook_percent(d)
+            if percent is not None:
+                progress_logger.update_track(task_id, percent)
+        elif d.get("status") == "finished":
+            progress_logger.update_track(task_id, 100)
+
     ydl_opts = {
         "quiet": True,
         "no_warnings": True,
         "noprogress": True,
         "format": "bestaudio/best",
         "outtmpl": str(target_dir / "%(title)s.%(ext)s"),
-        "postprocessors": [{"key": "FFmpegExtractAudio", "preferredcodec": "mp3", "preferredquality": "192"}],
+        "postprocessors": [audio_postprocessor(bitrate)],
         "http_headers": {"User-Agent": random.choice(USER_AGENTS)},
         "logger": SpotifyYTDLPLogger(progress_logger),
+        "progress_hooks": [progress_hook],
     }
-
-    count = 0
-    failed = 0
-    total = max(len(queries), 1)
-    for idx, query in enumerate(queries, start=1):
-        progress_logger.add_log(f"[{idx}/{len(queries)}] Spotify fallback search: {query}", "info")
-        progress_logger.update_progress(((idx - 1) / total) * 100, "Searching & downloading")
-        query_ok = False
+    tagging = None
+    if embed_extras:
+        tagging = TaggingStage(
+            USER_AGENTS, True, max_workers=configured_tag_workers(), log=progress_logger.add_log, cache=get_extras_cache(), orchestrator=orchestrator()
+        )
+        ydl_opts["postprocessor_hooks"] = [tagging.postprocessor_hook]
+
+    # MP3 encodes run on the transcode pool, as in download_youtube, so the next search starts at once.
+    transcode = None
+    transcode_workers = configured_transcode_workers()
+    if transcode_workers and bitrate != NATIVE_AUDIO and command_exists("ffmpeg"):
+        transcode = pipeline_transcode(ydl_opts, "audio", tagging, progress_logger.add_log, transcode_workers)
+        progress_logger.add_log(f"Transcoding on {transcode.workers} background worker(s)", "info")
+
+    worker_count = max(1, workers or configured_download_workers())
+    downloaders = WorkerLocal(lambda: new_youtube_dl(ydl_opts), _close_ytdl)
+    # Search probes run on the orchestrator's blocking pool, each thread with its own YoutubeDL.
+    probes = WorkerLocal(lambda: new_youtube_dl(ydl_opts), _close_ytdl)
+    cookie_sessions = WorkerLocal(lambda: YtdlSession(new_youtube_dl), YtdlSession.close)
+    known_total = len(queries) if isinstance(queries, (list, tuple)) else None
+    discovered = {"count": 0}
+
+    def _counted(items):
+        for item in items:
+            discovered["count"] += 1
+            yield item
+
+    progress_logger.add_log(f"Download workers: {worker_count}", "info")
+    progress_logger.update_progress(0, "Searching & downloading")
+
+    archive = get_download_archive()
+    match_cache = get_match_cache()
+    candidate_count = configured_match_candidates()
+    archived_hits = []
+    finished_results = []
+    loop = orchestrator()
+
+    async def prefetch_match(item):
+        """Pick the search match for ``item`` while earlier items are still downloading."""
+        if _cancelled(cancel) or archive.find(_query_archive_keys(item)):
+            return None
+        return await loop.offload(lambda: _choose_match(probes.get(), item, candidate_count, match_cache))
+
+    matched_items = loop.stream_ordered(_counted(queries), prefetch_match, max(2, worker_count * 2))
+
+    def fetch_one(idx, work):
+        item, match, match_error = work
+        if _cancelled(cancel):
+            return False
+        query = _query_text(item)
+        keys = _query_archive_keys(item)
+        label = f"[{idx}/{known_total or '…'}] {query}"
+        record = archive.find(keys)
+        if record:
+            archived_hits.append(query)
+            progress_logger.add_log(f"{label} already downloaded: {Path(record['path']).name}", "success")
+            return True
+        progress_logger.add_log(f"{label} Spotify fallback search", "info")
+        track_state.task_id = progress_logger.start_track(label)
+        target, match_key, from_cache = f"ytsearch1:{query}", None, False
+        if match_error is not None:
+            progress_logger.add_log(f"{label} candidate scoring skipped: {str(match_error)[:100]}", "warning")
+        elif match is not None:
+            matched, match_key, from_cache = match
+            if matched:
+                target = matched
         try:
-            with YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(f"ytsearch1:{query}", download=True)
-            if embed_extras and isinstance(info, dict):
-                for entry in iter_downloaded_entries(info):
-                    mp3_path = extract_entry_final_path(entry)
-                    if mp3_path:
-                        write_mp3_tags(mp3_path, entry, embed_extras=True, user_agents=USER_AGENTS, log=progress_logger.add_log)
-            query_ok = True
+            info = downloaders.get().extract_info(target, download=True)
+            finished_results.append((info, keys))
+            return True
         except Exception as e:
             err_text = str(e)
+            if from_cache and not is_age_restricted_error(err_text):
+                match_cache.delete(match_key)
             if is_age_restricted_error(err_text):
                 progress_logger.add_log("Age-restricted result detected. Attempting browser-cookies fallback.", "warning")
-                ok, _, browser_or_err = try_ytdlp_with_browser_cookies(f"ytsearch1:{query}", ydl_opts, progress_logger, extract_info_mode=False)
+                ok, info, browser_or_err = try_ytdlp_with_browser_cookies(target, ydl_opts, progress_logger, extract_info_mode=True, session=cookie_sessions.get())
                 if ok:
                     progress_logger.add_log(f"Cookie fallback succeeded with browser: {browser_or_err}", "success")
-                    query_ok = True
-                else:
-                    progress_logger.add_log(f"Cookie fallback failed for query: {query}", "warning")
-                    progress_logger.add_log(f"Last cookie error: {browser_or_err[:120]}", "warning")
+                    finished_results.append((info, keys))
+                    return True
+                progress_logger.add_log(f"Cookie fallback failed for query: {query}", "warning")
+                progress_logger.add_log(f"Last cookie error: {browser_or_err[:120]}", "warning")
             else:
                 progress_logger.add_log(f"Failed query skipped: {query}", "warning")
                 progress_logger.add_log(err_text[:120], "warning")
+            return False
+        finally:
+            progress_logger.finish_track(track_state.task_id)
+            track_state.task_id = None
 
-        if query_ok:
-            count += 1
-        else:
-            failed += 1
-        progress_logger.update_progress((idx / total) * 100, "Searching & downloading")
-
-    return count, failed
+    counts = {"downloaded": 0, "failed": 0}
 
+    def on_done(_idx, work, ok, error):
+        if error is not None:
+            progress_logger.add_log(f"Worker error for {_query_text(work[0])}: {str(error)[:120]}", "warning")
+        counts["downloaded" if ok else "failed"] += 1
+        finished = counts["downloaded"] + counts["failed"]
+        total = known_total or discovered["count"]
+        suffix = "" if known_total else "+"
+        progress_logger.update_progress((finished / max(total, 1)) * 100, f"Searching & downloading ({finished}/{total}{suffix})")
 
-def download_spotify(url: str, is_playlist: bool, embed_extras: bool = False) -> None:
+    try:
+        run_bounded(matched_items, fetch_one, worker_count, on_done)
+    finally:
+        matched_items.close()
+        instances = downloaders.created_count + probes.created_count
+        progress_logger.add_log(f"yt-dlp instances: {instances} for {counts['downloaded'] + counts['failed']} item(s)", "info")
+        progress_logger.add_log(loop.stats_line(), "info")
+        downloaders.close_all()
+        probes.close_all()
+        cookie_sessions.close_all()
+        if transcode is not None:
+            if transcode.pending:
+                progress_logger.update_progress(100, f"Encoding ({transcode.pending} left)")
+            encoded, encode_failed = transcode.close()
+            if encoded or encode_failed or transcode.fast_path:
+                progress_logger.add_log(transcode.stats_line(), "info")
+            for info, _keys in finished_results:
+                for entry in iter_downloaded_entries(info):
+                    transcode.retarget(entry)
+        if tagging is not None:
+            for info, _keys in finished_results:
+                for entry in iter_downloaded_entries(info):
+                    mp3_path = extract_entry_final_path(entry)
+                    if mp3_path and mp3_path.exists():
+                        tagging.submit(mp3_path, entry)
+            tagging.close()
+    # Archive after tagging so the recorded size/checksum match the final file.
+    for info, keys in finished_results:
+        archive_downloaded_entries(info, "audio", extra_keys=keys)
+    if archived_hits:
+        progress_logger.add_log(f"Skipped {len(archived_hits)} track(s) already in the archive.", "info")
+    progress_logger.add_log(match_cache.stats_line("Search match"), "info")
+
+    return counts["downloaded"], counts["failed"]
+
+
+def download_spotify(
+    url: str,
+    is_playlist: bool,
+    embed_extras: bool = False,
+    csv_path: Path | None = None,
+    bitrate: str | None = None,
+    workers: int | None = None,
+    cancel: threading.Event | None = None,
+) -> bool:
+    """Download Spotify tracks via yt-dlp search; returns True when every track succeeded."""
     subfolder = "Playlist" if is_playlist else "Single"
     target_dir = DOWNLOADS_ROOT / "SPOTIFY" / subfolder
     target_dir.mkdir(parents=True, exist_ok=True)
 
     resolved_url = _resolve_spotify_url(url)
+    track_id = None if is_playlist else spotify_track_id(resolved_url)
+    archived = get_download_archive().lookup(spotify_track_key(track_id)) if track_id else None
+    if archived:
+        console.print(Text(f"Already downloaded (archive): {archived['path']}", style=COL_GOOD))
+        return True
     queries = []
     display_title = "Spotify playlist" if is_playlist else "Spotify audio"
     try:
-        req = urllib.request.Request(
-            f"https://open.spotify.com/oembed?url={resolved_url}",
-            headers={"User-Agent": random.choice(USER_AGENTS)},
-        )
-        with urllib.request.urlopen(req, timeout=20) as resp:
-            payload = json.loads(resp.read().decode("utf-8", errors="ignore"))
+        payload = _spotify_oembed(resolved_url)
         title = (payload.get("title") or "").strip()
         author = (payload.get("author_name") or "").strip()
         if title:
@@ -1505,39 +2680,67 @@ def download_spotify(url: str, is_playlist: bool, embed_extras: bool = False) ->
             display_title = _playlist_display_name_from_url(resolved_url)
 
     console.print(Text(f"Downloading spotify {'playlist' if is_playlist else 'audio'}: {display_title}", style=COL_ACC))
+    ensure_js_runtimes_ready()
 
     try:
         if is_playlist or "/playlist/" in resolved_url or "/album/" in resolved_url:
             # Exportify is the primary path for playlist metadata.
-            queries = _spotify_exportify_queries_interactive(resolved_url)
+            if csv_path is not None:
+                queries = _queries_from_exportify_csv(Path(csv_path))
+            elif not HEADLESS:
+                queries = _spotify_exportify_queries_interactive(resolved_url)
             if not queries:
                 console.print(Text("Exportify produced no tracks; trying direct Spotify scrape fallback...", style=COL_WARN))
-                queries = _spotify_page_queries(resolved_url)
+                queries = _peek_stream(_spotify_page_queries(resolved_url))
         else:
             q = _spotify_oembed_query(resolved_url)
             if q:
-                queries = [q]
+                queries = [{"query": q, "spotify_id": spotify_track_id(resolved_url)}]
     except Exception as e:
         console.print(Text(f"Metadata parsing fallback triggered: {str(e)[:120]}", style=COL_WARN))
 
+    job = None
+    if is_playlist and queries:
+        # Tracks are not journaled here: the archive already skips finished ones on resume.
+        job_path = spotify_job_path(resolved_url)
+        job = open_unfinished(job_path) or JobManifest.create(
+            job_path,
+            {
+                "kind": "spotify",
+                "url": resolved_url,
+                "title": display_title,
+                "params": {"embed_extras": embed_extras, "bitrate": bitrate, "csv_path": str(csv_path) if csv_path else None},
+            },
+            [],
+        )
+
     mode = "Playlist" if is_playlist else "Single Item"
     progress_header = build_download_header(display_title, mode, "audio", target_dir)
-    progress_logger = FixedProgressLogger(console, progress_header)
+    worker_count = workers or configured_download_workers()
+    streamed = not isinstance(queries, list)
+    progress_logger = make_progress_logger(progress_header, track_slots=min(worker_count, 6) if streamed or len(queries) > 1 else 0)
     progress_logger.start()
     progress_logger.add_log("Spotify downloader (no-premium fallback mode)", "info")
     progress_logger.add_log(f"Title: {display_title}", "info")
 
     if queries:
         try:
-            progress_logger.add_log(f"Loaded {len(queries)} metadata query item(s)", "info")
-            downloaded, failed = _download_spotify_queries_with_ytdlp(queries, target_dir, progress_logger, embed_extras=embed_extras)
+            if streamed:
+                progress_logger.add_log("Streaming tracks from the Spotify page; downloads start as they are found", "info")
+            else:
+                progress_logger.add_log(f"Loaded {len(queries)} metadata query item(s)", "info")
+            downloaded, failed = _download_spotify_queries_with_ytdlp(
+                queries, target_dir, progress_logger, embed_extras=embed_extras, workers=worker_count, bitrate=bitrate or "192", cancel=cancel
+            )
             progress_logger.mark_complete(f"Downloaded {downloaded} track(s); skipped {failed}.")
             progress_logger.add_log(f"✓ Downloaded {downloaded} track(s) → {target_dir}", "success")
             if failed:
                 progress_logger.add_log(f"⚠ Skipped {failed} track(s) that failed extraction.", "warning")
+            if job is not None:
+                job.update_job(status=JOB_DONE if not failed else JOB_RUNNING, downloaded=downloaded, failed=failed)
             progress_logger.wait_for_continue("Spotify download success", 30)
             console.print(Text(f"Downloaded {downloaded} track(s) (skipped {failed}) → {target_dir}", style=COL_GOOD))
-            return
+            return failed == 0
         except Exception as e:
             progress_logger.add_log(f"yt-dlp Spotify fallback failed: {str(e)}", "error")
 
@@ -1547,6 +2750,7 @@ def download_spotify(url: str, is_playlist: bool, embed_extras: bool = False) ->
     progress_logger.stop()
     console.print(Text("Spotify metadata parsing failed for this URL. Export CSV via Exportify and retry.", style=COL_ERR))
     pause_for_reading("Spotify metadata parse failed — review above", 15)
+    return False
 
 
 # ──────────────────────────────────────────────
@@ -1717,7 +2921,8 @@ def prompt_resource_url_with_animation() -> str:
 # ──────────────────────────────────────────────
 # Primary application loop
 # ──────────────────────────────────────────────
-def main_loop():
+def main_loop(fast_start: bool = False):
+    startup(fast=fast_start)
     categories = ["YouTube Video (MP4)", "YouTube Music (MP3)", "Spotify", "Exit"]
     selected_index = 0
     STARFIELD.start()
@@ -17,10 +17,10 @@ def _write_bootstrap_crash_log(message: str):
         fh.write(f"[{datetime.now().isoformat(timespec='seconds')}] {message}\n")
 
 
-def run():
+def run(fast_start: bool = False):
     try:
         from CrystalMedia import main_loop
-        main_loop()
+        main_loop(fast_start=fast_start)
     except Exception as exc:
         _write_bootstrap_crash_log(f"Bootstrap fatal error: {exc}")
         _write_bootstrap_crash_log(traceback.format_exc())
@@ -0,0 +1,139 @@
+"""Persistent download archive so re-runs only fetch new or changed items."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, Optional
+
+_YT_VIDEO_ID = re.compile(r"(?:v=|youtu\.be/|/shorts/|/embed/|/live/)([A-Za-z0-9_-]{11})")
+_SPOTIFY_TRACK_ID = re.compile(r"(?:/track/|spotify:track:)([A-Za-z0-9]{22})")
+
+
+def youtube_video_id(url: str) -> Optional[str]:
+    match = _YT_VIDEO_ID.search(url or "")
+    return match.group(1) if match else None
+
+
+def spotify_track_id(value: str) -> Optional[str]:
+    match = _SPOTIFY_TRACK_ID.search(value or "")
+    return match.group(1) if match else None
+
+
+def normalize_query(query: str) -> str:
+    return " ".join((query or "").lower().split())
+
+
+def youtube_key(video_id: str, content_type: str) -> str:
+    return f"youtube:{content_type}:{video_id}"
+
+
+def spotify_track_key(track_id: str) -> str:
+    return f"spotify:track:{track_id}"
+
+
+def query_key(query: str) -> str:
+    return f"query:{normalize_query(query)}"
+
+
+def file_sha256(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with Path(path).open("rb") as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DownloadArchive:
+    """Append-only JSONL index of completed items (key → final path, size, checksum).
+
+    An entry only counts as complete while its file still exists unchanged; a size or
+    checksum mismatch makes the item eligible for download again.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._records: dict[str, dict] = {}
+        self._verified: set[str] = set()
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        with self.path.open("r", encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(record, dict) and record.get("key"):
+                    self._records[record["key"]] = record
+
+    def __len__(self):
+        return len(self._records)
+
+    def lookup(self, key: str) -> Optional[dict]:
+        """Return the record for ``key`` if its file is still present and unchanged."""
+        with self._lock:
+            record = self._records.get(key)
+        if not record:
+            return None
+        path = Path(record.get("path") or "")
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        if stat.st_size != record.get("size"):
+            return None
+        if key not in self._verified and abs(stat.st_mtime - record.get("mtime", 0)) > 1:
+            if file_sha256(path) != record.get("sha256"):
+                return None
+        self._verified.add(key)
+        return record
+
+    def find(self, keys: Iterable[str]) -> Optional[dict]:
+        for key in keys:
+            record = self.lookup(key)
+            if record:
+                return record
+        return None
+
+    def record(self, keys: Iterable[str], path: Path, **extra):
+        path = Path(path)
+        if not path.exists():
+            return
+        stat = path.stat()
+        base = {
+            "path": str(path.resolve()),
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "sha256": file_sha256(path),
+            "ts": int(time.time()),
+            **extra,
+        }
+        lines = []
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                record = {"key": key, **base}
+                self._records[key] = record
+                self._verified.add(key)
+                lines.append(json.dumps(record, ensure_ascii=False))
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as fh:
+                fh.write("".join(line + "\n" for line in lines))
+
+    def youtube_match_filter(self, content_type: str):
+        """yt-dlp ``match_filter`` that skips archived videos before they are extracted."""
+
+        def _filter(info_dict, *, incomplete=False):
+            video_id = info_dict.get("id")
+            if video_id and self.lookup(youtube_key(video_id, content_type)):
+                return f"{video_id} is already in the CrystalMedia archive"
+            return None
+
+        return _filter
@@ -0,0 +1,174 @@
+"""On-disk caches for metadata lookups (SQLite, TTL-bounded, size-capped LRU)."""
+
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+import threading
+import time
+import urllib.parse
+import zlib
+from pathlib import Path
+from typing import Optional
+
+from .archive import youtube_video_id
+
+MB = 1024 * 1024
+
+
+class DiskCache:
+    """Key/value store with per-entry expiry and least-recently-used eviction by size."""
+
+    def __init__(self, path: Path, max_bytes: int = 64 * MB, default_ttl: float = 3600):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max(0, int(max_bytes))
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL,"
+            " expires REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+        self._db.commit()
+
+    @property
+    def enabled(self) -> bool:
+        return self.default_ttl > 0 and self.max_bytes > 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        if not self.enabled:
+            return None
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT value, expires FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None or row[1] <= now:
+                if row is not None:
+                    self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    self._db.commit()
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, value: bytes, ttl: Optional[float] = None):
+        if not self.enabled:
+            return
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl <= 0 or len(value) > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, expires, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, sqlite3.Binary(value), len(value), now + ttl, now),
+            )
+            self._evict_locked(now)
+            self._db.commit()
+
+    def delete(self, key: str):
+        with self._lock:
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._db.commit()
+
+    def get_json(self, key: str):
+        raw = self.get(key)
+        if raw is None:
+            return None
+        try:
+            return json.loads(zlib.decompress(raw).decode("utf-8"))
+        except (zlib.error, ValueError):
+            self.delete(key)
+            return None
+
+    def put_json(self, key: str, value, ttl: Optional[float] = None):
+        payload = json.dumps(value, default=str, separators=(",", ":")).encode("utf-8")
+        self.put(key, zlib.compress(payload, 6), ttl=ttl)
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def stats_line(self, label: str) -> str:
+        return f"{label} cache: {self.hits} hit(s), {self.misses} miss(es)"
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def _evict_locked(self, now: float):
+        self._db.execute("DELETE FROM entries WHERE expires <= ?", (now,))
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._db.execute("SELECT key, size FROM entries ORDER BY accessed ASC").fetchall():
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+
+_YT_PLAYLIST_ID = re.compile(r"[?&]list=([A-Za-z0-9_-]+)")
+
+
+def info_cache_key(url: str, variant: str = "") -> str:
+    """Stable cache key for a YouTube URL: playlist id, else video id, else the normalized URL.
+
+    ``variant`` (e.g. ``audio:flat``) keeps probes made with different options apart.
+    """
+    url = (url or "").strip()
+    suffix = f":{variant}" if variant else ""
+    playlist = _YT_PLAYLIST_ID.search(url)
+    if playlist:
+        return f"yt:playlist:{playlist.group(1)}{suffix}"
+    video_id = youtube_video_id(url)
+    if video_id:
+        return f"yt:video:{video_id}{suffix}"
+    parts = urllib.parse.urlsplit(url)
+    return f"url:{parts.netloc.lower()}{parts.path}?{parts.query}{suffix}"
+
+
+# Set by yt-dlp's format selection and download; a reused probe must not carry them over,
+# or a single-format pick (bestaudio) keeps the probe's video+audio ``requested_formats``.
+SELECTION_KEYS = ("requested_formats", "requested_downloads", "format_id", "url", "filepath", "_filename")
+
+
+def strip_selection(info):
+    """Copy of ``info`` without format-selection/download keys (also in resolved playlist entries)."""
+    if not isinstance(info, dict):
+        return info
+    if info.get("_type") in ("url", "url_transparent"):
+        # Flat playlist entries: ``url`` is the entry's page URL, not a chosen format.
+        return dict(info)
+    cleaned = {key: value for key, value in info.items() if key not in SELECTION_KEYS and not key.startswith("__")}
+    if isinstance(cleaned.get("entries"), list):
+        cleaned["entries"] = [strip_selection(entry) for entry in cleaned["entries"]]
+    return cleaned
+
+
+def _iter_format_urls(info):
+    if not isinstance(info, dict):
+        return
+    for fmt in info.get("formats") or []:
+        if isinstance(fmt, dict) and fmt.get("url"):
+            yield fmt["url"]
+    for entry in info.get("entries") or []:
+        yield from _iter_format_urls(entry)
+
+
+def info_ttl(info: dict, default_ttl: float, now: Optional[float] = None, margin: float = 300) -> float:
+    """Cap ``default_ttl`` so cached info expires before its signed stream URLs (``expire=``) do."""
+    now = time.time() if now is None else now
+    ttl = default_ttl
+    for url in _iter_format_urls(info):
+        match = re.search(r"[?&/]expire[=/](\d{9,11})", url)
+        if match:
+            ttl = min(ttl, int(match.group(1)) - now - margin)
+    return max(0.0, ttl)
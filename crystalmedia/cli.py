@@ -1,6 +1,235 @@
-"""Console script entrypoint for CrystalMedia."""
+"""Console script entrypoint for CrystalMedia.
 
+Without ``--mode`` the interactive TUI starts as before. With ``--mode`` the given URLs
+are downloaded headlessly (no menus, Live screens or countdowns) and the exit status
+reports the outcome. ``--resume`` continues playlist jobs that were interrupted.
+"""
 
-def main():
-    from CrystalMedia import main_loop
-    main_loop()
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_MISSING_DEPENDENCY = 3
+EXIT_INTERRUPTED = 130
+
+MODES = ("youtube-video", "youtube-audio", "spotify")
+QUALITIES = ("low", "medium", "high", "best")
+BITRATES = ("96", "128", "192", "256", "320", "native")
+JS_RUNTIMES = ("auto", "deno", "node")
+PACING = ("adaptive", "aggressive", "balanced", "stealth")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="crystalmedia",
+        description="Cross-platform media downloader for YouTube and Spotify. Run without --mode for the interactive UI.",
+    )
+    parser.add_argument("urls", nargs="*", metavar="URL", help="resource URL(s) to download")
+    parser.add_argument("--mode", choices=MODES, help="download headlessly in this mode")
+    parser.add_argument("-f", "--url-file", type=Path, help="text file with one URL per line (# starts a comment)")
+    parser.add_argument("--playlist", action="store_true", help="treat URLs as playlists")
+    parser.add_argument("--quality", choices=QUALITIES, default="best", help="MP4 quality preset (default: best)")
+    parser.add_argument("--bitrate", choices=BITRATES, default="192", help="MP3 bitrate in kbps, or native to keep the original Opus/M4A stream (default: 192)")
+    parser.add_argument("--embed-extras", action="store_true", help="embed lyrics, cover art and metadata into MP3s")
+    parser.add_argument("--js-runtime", choices=JS_RUNTIMES, default="auto", help="yt-dlp JS runtime preference")
+    parser.add_argument("--csv", type=Path, help="Exportify CSV for a Spotify playlist (skips the browser helper)")
+    parser.add_argument("--workers", type=int, help="parallel track downloads for Spotify playlists")
+    parser.add_argument("--fragments", type=int, help="fragments fetched at once per YouTube download (default: chosen per job)")
+    parser.add_argument("--pacing", choices=PACING, help="request pacing for YouTube jobs (default: adaptive, sleeps only after throttling)")
+    parser.add_argument("--limit-rate", metavar="RATE", help="bandwidth cap for the whole job, e.g. 500K or 4M (bytes/s)")
+    parser.add_argument(
+        "--benchmark-fragments",
+        metavar="COUNTS",
+        help="download the URL once per comma-separated fragment count (e.g. 1,4,8) and report MB/s",
+    )
+    parser.add_argument("--fast-start", action="store_true", help="skip the startup notice/countdowns and defer dependency work to first use")
+    parser.add_argument("--resume", action="store_true", help="continue interrupted playlist jobs with their original options")
+    parser.add_argument("--profile-startup", action="store_true", help="print per-phase startup timings and exit")
+    return parser
+
+
+def read_url_file(path: Path) -> list[str]:
+    urls = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.split("#", 1)[0].strip()
+        if line:
+            urls.append(line)
+    return urls
+
+
+def profile_startup(fast: bool) -> int:
+    from crystalmedia.profiling import PhaseTimer
+
+    timer = PhaseTimer()
+    try:
+        with timer.phase("import CrystalMedia"):
+            import CrystalMedia as app
+        app.startup(fast=fast, headless=True, profiler=timer)
+    except ImportError as exc:
+        print(f"crystalmedia: missing dependency: {exc}", file=sys.stderr)
+        return EXIT_MISSING_DEPENDENCY
+    print("\n".join(timer.report_lines(f"Startup profile ({'fast' if fast else 'full'})")))
+    return EXIT_OK
+
+
+def run_batch(args: argparse.Namespace, urls: list[str]) -> int:
+    try:
+        import CrystalMedia as app
+        app.startup(fast=True, headless=True)
+    except ImportError as exc:
+        print(f"crystalmedia: missing dependency: {exc}", file=sys.stderr)
+        return EXIT_MISSING_DEPENDENCY
+
+    failures = 0
+    for url in urls:
+        if args.mode == "spotify":
+            ok = app.download_spotify(
+                url,
+                args.playlist,
+                embed_extras=args.embed_extras,
+                csv_path=args.csv,
+                bitrate=args.bitrate,
+                workers=args.workers,
+            )
+        else:
+            ok = app.download_youtube(
+                url,
+                "video" if args.mode == "youtube-video" else "audio",
+                args.playlist,
+                embed_extras=args.embed_extras,
+                quality=args.quality,
+                bitrate=args.bitrate,
+                js_runtime=args.js_runtime,
+                fragments=args.fragments,
+                ratelimit=args.limit_rate,
+                pacing=args.pacing,
+            )
+        if not ok:
+            failures += 1
+            app.log_runtime(f"Batch: failed {url}")
+
+    print(f"crystalmedia: {len(urls) - failures}/{len(urls)} job(s) succeeded")
+    return EXIT_OK if failures == 0 else EXIT_FAILED
+
+
+def run_benchmark(args: argparse.Namespace, url: str, counts: list[int]) -> int:
+    try:
+        import CrystalMedia as app
+        app.startup(fast=True, headless=True)
+    except ImportError as exc:
+        print(f"crystalmedia: missing dependency: {exc}", file=sys.stderr)
+        return EXIT_MISSING_DEPENDENCY
+
+    content_type = "video" if args.mode == "youtube-video" else "audio"
+    failures = 0
+    for result in app.benchmark_fragments(url, content_type, counts, ratelimit=args.limit_rate):
+        if result["error"]:
+            failures += 1
+            print(f"fragments={result['fragments']:>2}: failed: {result['error']}")
+            continue
+        print(
+            f"fragments={result['fragments']:>2}: {result['bytes'] / 1e6:.1f} MB in {result['seconds']:.2f}s"
+            f" -> {result['mb_per_second']:.2f} MB/s"
+        )
+    return EXIT_OK if failures == 0 else EXIT_FAILED
+
+
+def parse_counts(value: str) -> list[int]:
+    counts = [int(part) for part in value.split(",") if part.strip()]
+    if not counts or any(count < 1 for count in counts):
+        raise ValueError(value)
+    return counts
+
+
+def run_resume() -> int:
+    try:
+        import CrystalMedia as app
+        app.startup(fast=True, headless=True)
+    except ImportError as exc:
+        print(f"crystalmedia: missing dependency: {exc}", file=sys.stderr)
+        return EXIT_MISSING_DEPENDENCY
+
+    jobs = app.unfinished_jobs()
+    if not jobs:
+        print("crystalmedia: no unfinished jobs")
+        return EXIT_OK
+    failures = 0
+    for header in jobs:
+        print(f"crystalmedia: resuming {header.get('kind', 'youtube')} job {header.get('title') or header['url']}")
+        if not app.resume_job(header):
+            failures += 1
+            app.log_runtime(f"Resume: failed {header['url']}")
+    print(f"crystalmedia: {len(jobs) - failures}/{len(jobs)} job(s) finished")
+    return EXIT_OK if failures == 0 else EXIT_FAILED
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.profile_startup:
+        return profile_startup(args.fast_start)
+
+    if args.resume:
+        if args.mode or args.urls or args.url_file:
+            parser.error("--resume takes no URLs or --mode")
+        try:
+            return run_resume()
+        except KeyboardInterrupt:
+            print("crystalmedia: interrupted", file=sys.stderr)
+            return EXIT_INTERRUPTED
+
+    if args.mode is None:
+        if args.urls or args.url_file:
+            parser.error("--mode is required when URLs are given")
+        # Through run() so a crash before the TUI is up still lands in the bootstrap crash log.
+        from crystalmedia import run
+
+        run(fast_start=args.fast_start)
+        return EXIT_OK
+
+    urls = list(args.urls)
+    if args.url_file is not None:
+        try:
+            urls.extend(read_url_file(args.url_file))
+        except OSError as exc:
+            parser.error(f"cannot read URL file: {exc}")
+    if not urls:
+        parser.error("no URLs given (pass URL arguments or --url-file)")
+    if args.csv is not None and not args.csv.is_file():
+        parser.error(f"CSV not found: {args.csv}")
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.fragments is not None and args.fragments < 1:
+        parser.error("--fragments must be at least 1")
+    if args.limit_rate is not None:
+        from crystalmedia.fragments import parse_rate
+
+        try:
+            parse_rate(args.limit_rate)
+        except ValueError:
+            parser.error(f"invalid --limit-rate: {args.limit_rate}")
+
+    if args.benchmark_fragments is not None:
+        if args.mode == "spotify" or len(urls) != 1:
+            parser.error("--benchmark-fragments needs a YouTube mode and exactly one URL")
+        try:
+            counts = parse_counts(args.benchmark_fragments)
+        except ValueError:
+            parser.error(f"invalid fragment counts: {args.benchmark_fragments}")
+        try:
+            return run_benchmark(args, urls[0], counts)
+        except KeyboardInterrupt:
+            print("crystalmedia: interrupted", file=sys.stderr)
+            return EXIT_INTERRUPTED
+
+    try:
+        return run_batch(args, urls)
+    except KeyboardInterrupt:
+        print("crystalmedia: interrupted", file=sys.stderr)
+        return EXIT_INTERRUPTED
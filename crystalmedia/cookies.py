@@ -0,0 +1,62 @@
+"""Remember which browser cookie source works so age-restricted retries skip the probe."""
+
+from __future__ import annotations
+
+import threading
+from typing import Optional
+
+from .cache import DiskCache
+
+CookieSource = tuple  # yt-dlp cookiesfrombrowser tuple: (browser, keyring, profile, container)
+MEMO_KEY = "cookies:working-source"
+
+
+def source_label(source: CookieSource) -> str:
+    browser_name, _, profile, _ = source
+    return f"{browser_name}{f':{profile}' if profile else ''}"
+
+
+class CookieSourceMemo:
+    """Known-good ``cookiesfrombrowser`` source (memory + on-disk with a validity window).
+
+    The loaded cookie jar is kept in memory for the process so later downloads do not
+    decrypt the browser store again. ``exhausted`` records that every source failed in
+    this session, so later items do not repeat the full scan.
+    """
+
+    def __init__(self, cache: Optional[DiskCache] = None, ttl: float = 24 * 3600):
+        self._cache = cache
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._source: Optional[CookieSource] = None
+        self._jar = None
+        self._disk_checked = False
+        self.exhausted = False
+
+    def known(self) -> Optional[CookieSource]:
+        with self._lock:
+            if self._source is None and not self._disk_checked:
+                self._disk_checked = True
+                stored = self._cache.get_json(MEMO_KEY) if self._cache is not None else None
+                if isinstance(stored, list) and len(stored) == 4 and stored[0]:
+                    self._source = tuple(stored)
+            return self._source
+
+    def jar(self, source: CookieSource):
+        with self._lock:
+            return self._jar if source == self._source else None
+
+    def remember(self, source: CookieSource, jar=None):
+        with self._lock:
+            self._source = tuple(source)
+            self._jar = jar
+            self.exhausted = False
+        if self._cache is not None and self.ttl > 0:
+            self._cache.put_json(MEMO_KEY, list(source), ttl=self.ttl)
+
+    def forget(self):
+        with self._lock:
+            self._source = None
+            self._jar = None
+        if self._cache is not None:
+            self._cache.delete(MEMO_KEY)
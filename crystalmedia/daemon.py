@@ -0,0 +1,341 @@
+"""Daemon mode: a persistent download queue behind a small local HTTP/JSON API.
+
+``crystalmedia-daemon`` keeps its queue in ``APP_ROOT/queue.jsonl`` (a job journal whose
+entries are the submitted jobs). It runs up to ``--workers`` jobs at once through the same
+headless ``download_youtube``/``download_spotify`` calls as batch mode. Endpoints:
+
+    GET    /health
+    POST   /jobs               {"url": ..., "mode": "youtube-audio", "playlist": false, "options": {...}}
+    GET    /jobs               every job, oldest first
+    GET    /jobs/<id>          one job, plus per-entry progress for YouTube playlists
+    POST   /jobs/<id>/cancel   cancel a pending or running job (also ``DELETE /jobs/<id>``)
+
+Jobs that were running when the daemon stopped are queued again on the next start.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Optional
+
+from .cli import BITRATES, EXIT_MISSING_DEPENDENCY, EXIT_OK, JS_RUNTIMES, MODES, PACING, QUALITIES
+from .fragments import parse_rate
+from .jobs import CANCELLED, DONE, FAILED, PENDING, RUNNING, JobManifest
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 64 * 1024
+
+# Option name -> allowed values (None: any value of the given type).
+OPTION_TYPES = {
+    "quality": (str, QUALITIES),
+    "bitrate": (str, BITRATES),
+    "js_runtime": (str, JS_RUNTIMES),
+    "pacing": (str, PACING),
+    "embed_extras": (bool, None),
+    "fragments": (int, None),
+    "ratelimit": (str, None),
+    "workers": (int, None),
+    "csv_path": (str, None),
+}
+DEFAULT_OPTIONS = {"quality": "best", "bitrate": "192", "js_runtime": "auto", "embed_extras": False}
+
+Runner = Callable[[dict, threading.Event], bool]
+ProgressFn = Callable[[dict], Optional[dict]]
+
+
+def validate_submission(payload) -> dict:
+    """Normalised job fields from a POST body; raises ValueError with a readable message."""
+    if not isinstance(payload, dict):
+        raise ValueError("body must be a JSON object")
+    url = payload.get("url")
+    if not isinstance(url, str) or not url.strip():
+        raise ValueError("url is required")
+    mode = payload.get("mode")
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of: {', '.join(MODES)}")
+    playlist = payload.get("playlist", False)
+    if not isinstance(playlist, bool):
+        raise ValueError("playlist must be true or false")
+    options = payload.get("options") or {}
+    if not isinstance(options, dict):
+        raise ValueError("options must be an object")
+    # null means "use the default"; a None reaching download_youtube would open an interactive menu.
+    options = {name: value for name, value in options.items() if value is not None}
+    for name, value in options.items():
+        if name not in OPTION_TYPES:
+            raise ValueError(f"unknown option: {name}")
+        kind, allowed = OPTION_TYPES[name]
+        if not isinstance(value, kind) or (kind is int and isinstance(value, bool)):
+            raise ValueError(f"option {name} must be a {kind.__name__}")
+        if allowed is not None and value not in allowed:
+            raise ValueError(f"option {name} must be one of: {', '.join(allowed)}")
+        if kind is int and value < 1:
+            raise ValueError(f"option {name} must be at least 1")
+    if "ratelimit" in options:
+        parse_rate(options["ratelimit"])
+    return {"url": url.strip(), "mode": mode, "playlist": playlist, "options": {**DEFAULT_OPTIONS, **options}}
+
+
+class JobQueue:
+    """Persistent FIFO of download jobs run by a fixed number of worker threads.
+
+    ``runner(job, cancel_event)`` performs one job and returns True on success; a running
+    job is cancelled by setting its event, which the download loops check between and
+    during downloads.
+    """
+
+    def __init__(self, path: Path, runner: Runner, workers: int = 1, progress: Optional[ProgressFn] = None):
+        path = Path(path)
+        self.manifest = JobManifest(path) if path.exists() else JobManifest.create(path, {"kind": "queue"}, [])
+        self.runner = runner
+        self.progress = progress
+        self.workers = max(1, int(workers))
+        self._cond = threading.Condition()
+        self._cancel: dict[str, threading.Event] = {}
+        self._threads: list[threading.Thread] = []
+        self._stopping = False
+        for job in self.manifest.ordered():
+            if job["status"] == RUNNING:
+                self.manifest.update(job["key"], status=PENDING)
+
+    def submit(self, url: str, mode: str, playlist: bool = False, options: Optional[dict] = None) -> dict:
+        job = {"key": uuid.uuid4().hex[:12], "url": url, "mode": mode, "playlist": playlist, "options": options or {}, "created": int(time.time())}
+        with self._cond:
+            job = self.manifest.add(job)
+            self._cond.notify()
+        return dict(job)
+
+    def jobs(self) -> list[dict]:
+        with self._cond:
+            return [dict(job) for job in self.manifest.ordered()]
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._cond:
+            job = self.manifest.entries.get(key)
+            job = dict(job) if job is not None else None
+        if job is not None and self.progress is not None:
+            job["progress"] = self.progress(job)
+        return job
+
+    def cancel(self, key: str) -> Optional[dict]:
+        with self._cond:
+            job = self.manifest.entries.get(key)
+            if job is None:
+                return None
+            if job["status"] == PENDING:
+                self.manifest.update(key, status=CANCELLED, finished=int(time.time()))
+            elif job["status"] == RUNNING:
+                self._cancel[key].set()
+                self.manifest.update(key, cancel_requested=True)
+            return dict(job)
+
+    def start(self):
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"crystalmedia-job-{index + 1}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop taking new jobs and cancel running ones (they are resumed on the next start)."""
+        with self._cond:
+            self._stopping = True
+            for event in self._cancel.values():
+                event.set()
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _next_job(self) -> Optional[dict]:
+        with self._cond:
+            while not self._stopping:
+                for job in self.manifest.ordered():
+                    if job["status"] == PENDING:
+                        self._cancel[job["key"]] = threading.Event()
+                        self.manifest.update(job["key"], status=RUNNING, started=int(time.time()), attempts=job.get("attempts", 0) + 1)
+                        return dict(job)
+                self._cond.wait()
+            return None
+
+    def _work(self):
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            cancel = self._cancel[job["key"]]
+            error = None
+            try:
+                ok = bool(self.runner(job, cancel))
+            except Exception as exc:
+                ok, error = False, str(exc)[:300]
+            with self._cond:
+                self._cancel.pop(job["key"], None)
+                if self._stopping and cancel.is_set():
+                    # Interrupted by shutdown, not by the user: run it again next time.
+                    self.manifest.update(job["key"], status=PENDING)
+                    continue
+                status = CANCELLED if cancel.is_set() else DONE if ok else FAILED
+                self.manifest.update(job["key"], status=status, error=error, finished=int(time.time()))
+
+
+def run_with_app(app) -> Runner:
+    """Runner that drives the headless download functions of the ``CrystalMedia`` module."""
+
+    def run(job: dict, cancel: threading.Event) -> bool:
+        # Defaults fill any gaps so a queued job never reaches an interactive menu.
+        options = {**DEFAULT_OPTIONS, **{name: value for name, value in (job.get("options") or {}).items() if value is not None}}
+        if job["mode"] == "spotify":
+            csv_path = options.get("csv_path")
+            return app.download_spotify(
+                job["url"],
+                job["playlist"],
+                embed_extras=bool(options.get("embed_extras")),
+                csv_path=Path(csv_path) if csv_path else None,
+                bitrate=options.get("bitrate"),
+                workers=options.get("workers"),
+                cancel=cancel,
+            )
+        return app.download_youtube(
+            job["url"],
+            "video" if job["mode"] == "youtube-video" else "audio",
+            job["playlist"],
+            embed_extras=bool(options.get("embed_extras")),
+            quality=options.get("quality"),
+            bitrate=options.get("bitrate"),
+            js_runtime=options.get("js_runtime"),
+            fragments=options.get("fragments"),
+            ratelimit=options.get("ratelimit"),
+            pacing=options.get("pacing"),
+            cancel=cancel,
+        )
+
+    return run
+
+
+def progress_with_app(app) -> ProgressFn:
+    def progress(job: dict) -> Optional[dict]:
+        if job["mode"] == "spotify" or not job["playlist"]:
+            return None
+        return app.playlist_progress(job["url"], "video" if job["mode"] == "youtube-video" else "audio")
+
+    return progress
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    server_version = "CrystalMedia"
+
+    @property
+    def queue(self) -> JobQueue:
+        return self.server.queue
+
+    def log_message(self, format, *args):
+        log = getattr(self.server, "log", None)
+        if log is not None:
+            log(f"daemon: {self.address_string()} {format % args}")
+
+    def _send(self, status: int, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status: int, message: str):
+        self._send(status, {"error": message})
+
+    def _parts(self) -> list[str]:
+        return [part for part in self.path.split("?", 1)[0].split("/") if part]
+
+    def do_GET(self):
+        parts = self._parts()
+        if parts == ["health"]:
+            self._send(200, {"status": "ok", "workers": self.queue.workers})
+        elif parts == ["jobs"]:
+            self._send(200, {"jobs": self.queue.jobs()})
+        elif len(parts) == 2 and parts[0] == "jobs":
+            job = self.queue.get(parts[1])
+            self._send(200, job) if job is not None else self._error(404, "no such job")
+        else:
+            self._error(404, "not found")
+
+    def do_POST(self):
+        parts = self._parts()
+        if len(parts) == 3 and parts[0] == "jobs" and parts[2] == "cancel":
+            self._cancel(parts[1])
+            return
+        if parts != ["jobs"]:
+            self._error(404, "not found")
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        if length <= 0 or length > MAX_BODY_BYTES:
+            self._error(400, "a JSON body up to 64 KiB is required")
+            return
+        try:
+            fields = validate_submission(json.loads(self.rfile.read(length).decode("utf-8")))
+        except ValueError as exc:
+            self._error(400, str(exc))
+            return
+        self._send(201, self.queue.submit(**fields))
+
+    def do_DELETE(self):
+        parts = self._parts()
+        if len(parts) == 2 and parts[0] == "jobs":
+            self._cancel(parts[1])
+        else:
+            self._error(404, "not found")
+
+    def _cancel(self, key: str):
+        job = self.queue.cancel(key)
+        self._send(202, job) if job is not None else self._error(404, "no such job")
+
+
+def make_server(queue: JobQueue, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, log=None) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), ApiHandler)
+    server.daemon_threads = True
+    server.queue = queue
+    server.log = log
+    return server
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="crystalmedia-daemon", description="Run CrystalMedia as a download queue with a local HTTP/JSON API.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"address to listen on (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port to listen on (default: {DEFAULT_PORT})")
+    parser.add_argument("--workers", type=int, help="jobs run at the same time (default: config daemon_workers or 1)")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        import CrystalMedia as app
+        app.startup(fast=True, headless=True)
+    except ImportError as exc:
+        print(f"crystalmedia-daemon: missing dependency: {exc}", file=sys.stderr)
+        return EXIT_MISSING_DEPENDENCY
+
+    workers = args.workers or app.config_int("daemon_workers", 1, minimum=1, maximum=16)
+    queue = JobQueue(app.APP_ROOT / "queue.jsonl", run_with_app(app), workers=workers, progress=progress_with_app(app))
+    server = make_server(queue, args.host, args.port, log=app.log_runtime)
+    queue.start()
+    print(f"crystalmedia-daemon: listening on http://{args.host}:{server.server_address[1]} with {workers} worker(s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("crystalmedia-daemon: stopping; running jobs resume on the next start", file=sys.stderr)
+    finally:
+        server.server_close()
+        queue.stop(timeout=30)
+    return EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,10 @@
-"""Extras helpers, starfield animation and MP3 metadata enrichment."""
+"""Extras helpers, starfield animation and audio metadata enrichment (MP3, Opus/Ogg, M4A, FLAC)."""
 
 from __future__ import annotations
 
+import asyncio
+import base64
+import hashlib
 import json
 import random
 import re
@@ -9,12 +12,17 @@ import shutil
 import threading
 import time
 import urllib.parse
-import urllib.request
 from pathlib import Path
-from typing import Callable, Optional
+from typing import Awaitable, Callable, Optional
 from urllib.error import HTTPError, URLError
 
+from mutagen.flac import FLAC, Picture
 from mutagen.id3 import APIC, ID3, SYLT, TALB, TDRC, TIT2, TPE1, USLT, ID3NoHeaderError
+from mutagen.mp4 import MP4, MP4Cover
+from mutagen.oggopus import OggOpus
+from mutagen.oggvorbis import OggVorbis
+
+from .httpclient import default_client
 
 
 class StarfieldBackground:
@@ -128,25 +136,52 @@ class StarfieldBackground:
 
 
 def http_get_json(url: str, user_agents: list[str]):
-    req = urllib.request.Request(url, headers={"User-Agent": random.choice(user_agents)})
-    with urllib.request.urlopen(req, timeout=15) as resp:
-        return json.loads(resp.read().decode("utf-8", errors="ignore"))
+    return default_client().get_json(url, headers={"User-Agent": random.choice(user_agents)}, timeout=15)
 
 
 def http_get_bytes(url: str, user_agents: list[str]):
-    req = urllib.request.Request(url, headers={"User-Agent": random.choice(user_agents)})
-    with urllib.request.urlopen(req, timeout=20) as resp:
-        return resp.read()
+    return default_client().get_bytes(url, headers={"User-Agent": random.choice(user_agents)}, timeout=20)
+
+
+LYRICS_TTL = 30 * 86400
+LYRICS_MISS_TTL = 3 * 86400
+IMAGE_TTL = 30 * 86400
+
+
+def _normalize_key_text(value: str) -> str:
+    return " ".join(re.sub(r"[^\w\s]", " ", (value or "").lower()).split())
+
+
+def lyrics_cache_key(title: str, artist: str) -> str:
+    digest = hashlib.sha256(f"{_normalize_key_text(title)}|{_normalize_key_text(artist)}".encode("utf-8")).hexdigest()
+    return f"lyrics:{digest}"
+
 
+def image_cache_key(url: str) -> str:
+    return f"image:{hashlib.sha256((url or '').strip().encode('utf-8')).hexdigest()}"
 
-def fetch_lrclib_lyrics(title: str, artist: str, user_agents: list[str]):
+
+def fetch_lrclib_lyrics(title: str, artist: str, user_agents: list[str], cache=None):
+    """Look up lyrics on lrclib; with a DiskCache, hits and confirmed misses skip the network."""
     if not title:
         return None
+    key = lyrics_cache_key(title, artist)
+    if cache is not None:
+        cached = cache.get_json(key)
+        if cached is not None:
+            if cached.get("miss"):
+                return None
+            return {"unsynced": cached.get("unsynced", ""), "synced": [tuple(item) for item in cached.get("synced", [])]}
+
     q_title = urllib.parse.quote(title)
     q_artist = urllib.parse.quote(artist or "")
     try:
         payload = http_get_json(f"https://lrclib.net/api/get?track_name={q_title}&artist_name={q_artist}", user_agents)
-    except (HTTPError, URLError, TimeoutError, json.JSONDecodeError):
+    except HTTPError as e:
+        if cache is not None and e.code == 404:
+            cache.put_json(key, {"miss": True}, ttl=LYRICS_MISS_TTL)
+        return None
+    except (URLError, TimeoutError, json.JSONDecodeError):
         return None
 
     unsynced = (payload.get("plainLyrics") or "").strip()
@@ -161,7 +196,26 @@ def fetch_lrclib_lyrics(title: str, artist: str, user_agents: list[str]):
         if text.strip():
             synced_entries.append((millis, text.strip()))
 
-    return {"unsynced": unsynced, "synced": synced_entries}
+    result = {"unsynced": unsynced, "synced": synced_entries}
+    if cache is not None:
+        if unsynced or synced_entries:
+            cache.put_json(key, result, ttl=LYRICS_TTL)
+        else:
+            cache.put_json(key, {"miss": True}, ttl=LYRICS_MISS_TTL)
+    return result
+
+
+def fetch_image_bytes(url: str, user_agents: list[str], cache=None) -> bytes:
+    """``http_get_bytes`` for cover art, served from the DiskCache when the URL was fetched before."""
+    key = image_cache_key(url)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+    data = http_get_bytes(url, user_agents)
+    if cache is not None and data:
+        cache.put(key, data, ttl=IMAGE_TTL)
+    return data
 
 
 def strip_vtt_timestamp(line: str) -> str:
@@ -216,13 +270,71 @@ def guess_mime_type(img_url: str) -> str:
     return "image/jpeg"
 
 
+def _extras_lookups(info: dict, user_agents: list[str], log: Optional[Callable[[str, str], None]], cache):
+    """The lyrics and cover-art lookups for ``info`` as two blocking callables."""
+    title = (info.get("track") or info.get("title") or "").strip()
+    artist = (info.get("artist") or info.get("uploader") or info.get("channel") or "Unknown Artist").strip()
+    thumbnail = info.get("thumbnail")
+
+    def _lyrics():
+        lyrics = fetch_lrclib_lyrics(title, artist, user_agents, cache=cache) or {"unsynced": "", "synced": []}
+        if not lyrics.get("unsynced", "").strip():
+            fallback = subtitle_lines_from_info(info, user_agents).strip()
+            if fallback:
+                if log:
+                    log("Using subtitles as lyrics fallback.", "warning")
+                lyrics = {"unsynced": fallback, "synced": lyrics.get("synced", [])}
+        return lyrics
+
+    def _cover():
+        if not thumbnail:
+            return None
+        try:
+            return fetch_image_bytes(thumbnail, user_agents, cache=cache), guess_mime_type(thumbnail)
+        except (HTTPError, URLError, TimeoutError):
+            if log:
+                log("Cover art download failed; keeping audio without APIC.", "warning")
+            return None
+
+    return _lyrics, _cover
+
+
+def fetch_extras(
+    info: dict,
+    user_agents: list[str],
+    log: Optional[Callable[[str, str], None]] = None,
+    cache=None,
+):
+    """Fetch lyrics (subtitle fallback) and cover art for ``info`` one after the other.
+
+    Callers that want both requests in flight at once use ``fetch_extras_async``.
+    """
+    _lyrics, _cover = _extras_lookups(info, user_agents, log, cache)
+    return {"lyrics": _lyrics(), "cover": _cover()}
+
+
+async def fetch_extras_async(
+    info: dict,
+    user_agents: list[str],
+    lookup: Callable[..., Awaitable],
+    log: Optional[Callable[[str, str], None]] = None,
+    cache=None,
+):
+    """Coroutine form of ``fetch_extras``: ``lookup(fn)`` awaits each blocking request (see ``Orchestrator.lookup``)."""
+    _lyrics, _cover = _extras_lookups(info, user_agents, log, cache)
+    lyrics, cover = await asyncio.gather(lookup(_lyrics), lookup(_cover))
+    return {"lyrics": lyrics, "cover": cover}
+
+
 def write_mp3_tags(
     mp3_path: Path,
     info: dict,
     embed_extras: bool,
     user_agents: list[str],
     log: Optional[Callable[[str, str], None]] = None,
+    extras: Optional[dict] = None,
 ):
+    """Write core ID3 tags; with ``embed_extras`` also lyrics and cover (prefetched ``extras`` or fetched now)."""
     if not mp3_path.exists() or mp3_path.suffix.lower() != ".mp3":
         return
 
@@ -231,10 +343,7 @@ def write_mp3_tags(
     except ID3NoHeaderError:
         tags = ID3()
 
-    title = (info.get("track") or info.get("title") or "").strip()
-    artist = (info.get("artist") or info.get("uploader") or info.get("channel") or "Unknown Artist").strip()
-    album = (info.get("album") or info.get("playlist_title") or "Single").strip()
-    date = (info.get("upload_date") or "")[:4]
+    title, artist, album, date = _core_fields(info)
 
     tags.delall("TIT2")
     tags.delall("TPE1")
@@ -247,13 +356,11 @@ def write_mp3_tags(
         tags.add(TDRC(encoding=3, text=date))
 
     if embed_extras:
-        lyrics = fetch_lrclib_lyrics(title, artist, user_agents) or {"unsynced": "", "synced": []}
+        if extras is None:
+            extras = fetch_extras(info, user_agents, log=log)
+        lyrics = extras.get("lyrics") or {"unsynced": "", "synced": []}
         unsynced = lyrics.get("unsynced", "").strip()
         synced = lyrics.get("synced", [])
-        if not unsynced:
-            unsynced = subtitle_lines_from_info(info, user_agents).strip()
-            if unsynced and log:
-                log("Using subtitles as lyrics fallback.", "warning")
 
         if unsynced:
             tags.delall("USLT")
@@ -263,19 +370,112 @@ def write_mp3_tags(
             tags.delall("SYLT")
             tags.add(SYLT(encoding=3, lang="eng", format=2, type=1, desc="Synced Lyrics", text=sylt_payload))
 
-        thumbnail = info.get("thumbnail")
-        if thumbnail:
-            try:
-                image_data = http_get_bytes(thumbnail, user_agents)
-                tags.delall("APIC")
-                tags.add(APIC(encoding=3, mime=guess_mime_type(thumbnail), type=3, desc="Cover", data=image_data))
-            except (HTTPError, URLError, TimeoutError):
-                if log:
-                    log("Cover art download failed; keeping audio without APIC.", "warning")
+        cover = extras.get("cover")
+        if cover:
+            image_data, mime = cover
+            tags.delall("APIC")
+            tags.add(APIC(encoding=3, mime=mime, type=3, desc="Cover", data=image_data))
 
     tags.save(mp3_path)
 
 
+def _core_fields(info: dict) -> tuple[str, str, str, str]:
+    title = (info.get("track") or info.get("title") or "").strip()
+    artist = (info.get("artist") or info.get("uploader") or info.get("channel") or "Unknown Artist").strip()
+    album = (info.get("album") or info.get("playlist_title") or "Single").strip()
+    date = (info.get("upload_date") or "")[:4]
+    return title, artist, album, date
+
+
+def _lyrics_text(extras: dict) -> str:
+    """Unsynced lyrics, or the synced lines as LRC text when only those exist."""
+    lyrics = extras.get("lyrics") or {"unsynced": "", "synced": []}
+    unsynced = (lyrics.get("unsynced") or "").strip()
+    if unsynced:
+        return unsynced
+    return "\n".join(f"[{millis // 60000:02d}:{millis % 60000 / 1000:05.2f}]{line}" for millis, line in lyrics.get("synced") or [])
+
+
+def _write_vorbis_tags(audio, path: Path, info: dict, extras: Optional[dict]):
+    title, artist, album, date = _core_fields(info)
+    audio["title"] = [title or path.stem]
+    audio["artist"] = [artist]
+    audio["album"] = [album]
+    if date:
+        audio["date"] = [date]
+    if extras is None:
+        return
+    lyrics = _lyrics_text(extras)
+    if lyrics:
+        audio["lyrics"] = [lyrics]
+    cover = extras.get("cover")
+    if cover:
+        picture = Picture()
+        picture.type, picture.desc = 3, "Cover"
+        picture.data, picture.mime = cover
+        if isinstance(audio, FLAC):
+            audio.clear_pictures()
+            audio.add_picture(picture)
+        else:
+            audio["metadata_block_picture"] = [base64.b64encode(picture.write()).decode("ascii")]
+
+
+def _write_mp4_tags(audio: MP4, path: Path, info: dict, extras: Optional[dict]):
+    title, artist, album, date = _core_fields(info)
+    audio["\xa9nam"] = [title or path.stem]
+    audio["\xa9ART"] = [artist]
+    audio["\xa9alb"] = [album]
+    if date:
+        audio["\xa9day"] = [date]
+    if extras is None:
+        return
+    lyrics = _lyrics_text(extras)
+    if lyrics:
+        audio["\xa9lyr"] = [lyrics]
+    cover = extras.get("cover")
+    if cover:
+        image_data, mime = cover
+        image_format = MP4Cover.FORMAT_PNG if mime == "image/png" else MP4Cover.FORMAT_JPEG
+        audio["covr"] = [MP4Cover(image_data, imageformat=image_format)]
+
+
+# Container suffix -> mutagen class; MP3 uses the ID3 writer above.
+_GENERIC_TAGGERS = {
+    ".opus": (OggOpus, _write_vorbis_tags),
+    ".ogg": (OggVorbis, _write_vorbis_tags),
+    ".flac": (FLAC, _write_vorbis_tags),
+    ".m4a": (MP4, _write_mp4_tags),
+    ".mp4": (MP4, _write_mp4_tags),
+}
+TAGGABLE_SUFFIXES = (".mp3", *_GENERIC_TAGGERS)
+
+
+def write_audio_tags(
+    path: Path,
+    info: dict,
+    embed_extras: bool,
+    user_agents: list[str],
+    log: Optional[Callable[[str, str], None]] = None,
+    extras: Optional[dict] = None,
+):
+    """Format-generic ``write_mp3_tags``: ID3 for MP3, Vorbis comments for Opus/Ogg/FLAC, atoms for M4A."""
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".mp3":
+        write_mp3_tags(path, info, embed_extras, user_agents, log=log, extras=extras)
+        return
+    if suffix not in _GENERIC_TAGGERS or not path.exists():
+        return
+    if embed_extras and extras is None:
+        extras = fetch_extras(info, user_agents, log=log)
+    opener, writer = _GENERIC_TAGGERS[suffix]
+    audio = opener(path)
+    if audio.tags is None:
+        audio.add_tags()
+    writer(audio, path, info, extras if embed_extras else None)
+    audio.save()
+
+
 def iter_downloaded_entries(info):
     if not isinstance(info, dict):
         return
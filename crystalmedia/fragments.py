@@ -0,0 +1,165 @@
+"""Fragment download tuning: per-job ``concurrent_fragments``, bandwidth caps and cleanup.
+
+yt-dlp only parallelises fragmented (DASH/HLS) downloads. YouTube serves most formats as
+plain HTTPS, so video jobs in the throughput profile also ask the extractor for its "dashy"
+variant of those formats, which splits them into ranged fragments that can be fetched
+concurrently. Audio jobs keep the plain formats.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+BALANCED = "balanced"
+THROUGHPUT = "throughput"
+PROFILES = (BALANCED, THROUGHPUT)
+
+# Fragment connections shared by all downloads of one job.
+DEFAULT_FRAGMENT_BUDGET = 8
+MAX_FRAGMENTS = 32
+
+_RATE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([kmg]?)(?:i?b)?(?:/s)?\s*$", re.IGNORECASE)
+_RATE_UNITS = {"": 1, "k": 1024, "m": 1024 ** 2, "g": 1024 ** 3}
+
+
+def parse_rate(value) -> Optional[int]:
+    """Bytes per second from ``500K``, ``2M``, ``1.5MiB/s`` or a plain number; 0/empty means no cap."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return int(value) or None
+    match = _RATE.match(str(value))
+    if not match:
+        raise ValueError(f"invalid rate: {value!r}")
+    return int(float(match.group(1)) * _RATE_UNITS[match.group(2).lower()]) or None
+
+
+def fragment_concurrency(
+    profile: str,
+    content_type: str,
+    parallel_downloads: int = 1,
+    budget: int = DEFAULT_FRAGMENT_BUDGET,
+    requested: Optional[int] = None,
+) -> int:
+    """Fragments fetched at once per download for this job.
+
+    An explicit ``requested`` value wins. Otherwise the balanced profile stays at one, and
+    the throughput profile splits ``budget`` across the parallel downloads. Audio streams
+    are small, so they get at most two.
+    """
+    if requested:
+        return max(1, min(MAX_FRAGMENTS, int(requested)))
+    if profile != THROUGHPUT:
+        return 1
+    per_download = max(1, budget // max(1, parallel_downloads))
+    if content_type == "audio":
+        per_download = min(per_download, 2)
+    return per_download
+
+
+def fragment_options(
+    concurrency: int,
+    ratelimit: Optional[int] = None,
+    parallel_downloads: int = 1,
+    keep_fragments: bool = False,
+    dashy: bool = False,
+) -> dict:
+    """yt-dlp options for the chosen fragment settings.
+
+    ``ratelimit`` caps the whole job, so it is divided between parallel downloads (yt-dlp
+    applies it per file). ``dashy`` (video jobs) requests fragmented YouTube formats when
+    more than one fragment is fetched at once. Apply the result with ``apply_options``.
+    """
+    options = {"concurrent_fragments": concurrency, "keep_fragments": keep_fragments}
+    if dashy and concurrency > 1:
+        options["extractor_args"] = {"youtube": {"formats": ["dashy"]}}
+    if ratelimit:
+        options["ratelimit"] = max(1, ratelimit // max(1, parallel_downloads))
+    return options
+
+
+def apply_options(options: dict, extra: dict) -> dict:
+    """``options.update(extra)``, but ``extractor_args`` are merged per extractor and argument."""
+    extra = dict(extra)
+    added = extra.pop("extractor_args", None) or {}
+    options.update(extra)
+    if added:
+        merged = {name: dict(args) for name, args in (options.get("extractor_args") or {}).items()}
+        for name, args in added.items():
+            merged.setdefault(name, {}).update(args)
+        options["extractor_args"] = merged
+    return options
+
+
+def sweep_stale_fragments(directory: Path, max_age: float = 24 * 3600, now: Optional[float] = None) -> tuple[int, int]:
+    """Delete fragment files and ``.ytdl`` resume state left by interrupted runs.
+
+    Only files untouched for ``max_age`` seconds are removed, so a download running
+    elsewhere keeps its state. Returns ``(files, bytes)`` removed.
+    """
+    directory = Path(directory)
+    if not directory.is_dir():
+        return 0, 0
+    cutoff = (time.time() if now is None else now) - max_age
+    removed = freed = 0
+    for pattern in ("*.part-Frag*", "*.ytdl"):
+        for path in directory.rglob(pattern):
+            try:
+                stat = path.stat()
+                if stat.st_mtime > cutoff:
+                    continue
+                path.unlink()
+            except OSError:
+                continue
+            removed += 1
+            freed += stat.st_size
+    return removed, freed
+
+
+class ThroughputMeter:
+    """Bytes downloaded per second across every file of a job, fed from progress hooks."""
+
+    def __init__(self, clock=time.perf_counter):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._bytes: dict[str, int] = {}
+        self._started: Optional[float] = None
+        self._last: Optional[float] = None
+
+    def observe(self, d: dict):
+        status = d.get("status")
+        if status not in ("downloading", "finished"):
+            return
+        name = d.get("tmpfilename") or d.get("filename") or ""
+        done = d.get("downloaded_bytes") or (d.get("total_bytes") if status == "finished" else None)
+        if done is None:
+            return
+        now = self._clock()
+        with self._lock:
+            if self._started is None:
+                self._started = now - (d.get("elapsed") or 0)
+            self._bytes[name] = max(self._bytes.get(name, 0), int(done))
+            self._last = now
+
+    @property
+    def total_bytes(self) -> int:
+        with self._lock:
+            return sum(self._bytes.values())
+
+    @property
+    def seconds(self) -> float:
+        with self._lock:
+            if self._started is None or self._last is None:
+                return 0.0
+            return max(0.0, self._last - self._started)
+
+    def mb_per_second(self) -> float:
+        seconds = self.seconds
+        return self.total_bytes / 1e6 / seconds if seconds > 0 else 0.0
+
+    def stats_line(self) -> str:
+        return f"Throughput: {self.total_bytes / 1e6:.1f} MB in {self.seconds:.1f}s ({self.mb_per_second():.2f} MB/s)"
@@ -0,0 +1,283 @@
+"""Shared HTTP client: per-host keep-alive pools, concurrency limits, timeouts and retries.
+
+Errors surface as ``urllib.error.HTTPError`` / ``URLError`` so callers written against
+``urllib.request.urlopen`` keep their existing ``except`` clauses.
+"""
+
+from __future__ import annotations
+
+import gzip
+import http.client
+import json
+import socket
+import ssl
+import threading
+import time
+import urllib.parse
+import urllib.request
+import zlib
+from email.message import Message
+from typing import Optional
+from urllib.error import HTTPError, URLError
+
+from .retry import backoff_delay, retry_after_seconds
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+MAX_REDIRECTS = 8
+IDLE_TIMEOUT = 60.0
+
+
+class Response:
+    """Fully read response body plus the final URL after redirects."""
+
+    def __init__(self, url: str, status: int, headers: Message, body: bytes):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def text(self) -> str:
+        return self.body.decode("utf-8", errors="ignore")
+
+    def json(self):
+        return json.loads(self.text())
+
+
+class RateLimiter:
+    """Spaces calls at least ``1 / per_second`` apart across all threads."""
+
+    def __init__(self, per_second: float):
+        self.interval = 1.0 / per_second if per_second > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def acquire(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class _HostPool:
+    """Idle keep-alive connections for one (scheme, host, port) plus an in-flight cap."""
+
+    def __init__(self, max_connections: int):
+        self.slots = threading.BoundedSemaphore(max_connections)
+        self.idle: list[tuple[http.client.HTTPConnection, float]] = []
+        self.lock = threading.Lock()
+
+
+class HTTPClient:
+    def __init__(self, max_per_host: int = 4, timeout: float = 20, retries: int = 2, backoff: float = 0.5):
+        self.max_per_host = max(1, int(max_per_host))
+        self.timeout = timeout
+        self.retries = max(0, int(retries))
+        self.backoff = backoff
+        self.connections_opened = 0
+        self.requests_sent = 0
+        self._pools: dict[tuple[str, str, int], _HostPool] = {}
+        self._rate_limits: dict[str, RateLimiter] = {}
+        self._lock = threading.Lock()
+        self._ssl_context = ssl.create_default_context()
+
+    def set_rate_limit(self, host: str, per_second: float):
+        """Limit request starts to ``host`` (0 removes the limit)."""
+        with self._lock:
+            if per_second > 0:
+                self._rate_limits[host.lower()] = RateLimiter(per_second)
+            else:
+                self._rate_limits.pop(host.lower(), None)
+
+    def _pool(self, key) -> _HostPool:
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = self._pools[key] = _HostPool(self.max_per_host)
+            return pool
+
+    def _connect(self, scheme: str, host: str, port: int, timeout: float):
+        with self._lock:
+            self.connections_opened += 1
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=timeout, context=self._ssl_context)
+        return http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def _checkout(self, pool: _HostPool, key, timeout: float):
+        now = time.monotonic()
+        with pool.lock:
+            while pool.idle:
+                conn, last_used = pool.idle.pop()
+                if now - last_used < IDLE_TIMEOUT:
+                    conn.timeout = timeout
+                    if conn.sock is not None:
+                        conn.sock.settimeout(timeout)
+                    return conn, True
+                conn.close()
+        return self._connect(*key, timeout), False
+
+    def _checkin(self, pool: _HostPool, conn):
+        with pool.lock:
+            pool.idle.append((conn, time.monotonic()))
+
+    def _send_once(self, url: str, method: str, headers: dict, timeout: float):
+        parts = urllib.parse.urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https") or not parts.hostname:
+            raise URLError(f"unsupported URL: {url}")
+        limiter = self._rate_limits.get(parts.hostname.lower())
+        if limiter is not None:
+            limiter.acquire()
+        if urllib.request.getproxies().get(scheme):
+            return self._send_via_urllib(url, method, headers, timeout)
+        key = (scheme, parts.hostname, parts.port or (443 if scheme == "https" else 80))
+        target = urllib.parse.urlunsplit(("", "", parts.path or "/", parts.query, ""))
+        request_headers = {"Host": parts.netloc, "Accept-Encoding": "gzip, deflate", "Connection": "keep-alive", **headers}
+
+        pool = self._pool(key)
+        with pool.slots:
+            conn, reused = self._checkout(pool, key, timeout)
+            for attempt in (0, 1):
+                try:
+                    conn.request(method, target, headers=request_headers)
+                    resp = conn.getresponse()
+                    body = resp.read()
+                    break
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError, http.client.CannotSendRequest):
+                    conn.close()
+                    if attempt or not reused:
+                        raise
+                    # Stale keep-alive socket closed by the server; retry once on a fresh one.
+                    conn = self._connect(*key, timeout)
+                except BaseException:
+                    conn.close()
+                    raise
+            with self._lock:
+                self.requests_sent += 1
+            if resp.will_close:
+                conn.close()
+            else:
+                self._checkin(pool, conn)
+        return resp.status, resp.reason, resp.msg, _decode_body(body, resp.msg.get("Content-Encoding"))
+
+    def _send_via_urllib(self, url: str, method: str, headers: dict, timeout: float):
+        req = urllib.request.Request(url, headers=headers, method=method)
+        try:
+            with urllib.request.urlopen(req, timeout=timeout) as resp:
+                return resp.status, resp.reason, resp.headers, resp.read()
+        except HTTPError as exc:
+            return exc.code, exc.reason, exc.headers, exc.read() if exc.fp else b""
+
+    def request(
+        self,
+        url: str,
+        headers: Optional[dict] = None,
+        timeout: Optional[float] = None,
+        method: str = "GET",
+        retries: Optional[int] = None,
+    ) -> Response:
+        """Send a request, following redirects and retrying transient failures with backoff."""
+        timeout = self.timeout if timeout is None else timeout
+        retries = self.retries if retries is None else retries
+        headers = dict(headers or {})
+        attempt = 0
+        while True:
+            try:
+                return self._follow(url, method, headers, timeout)
+            except HTTPError as exc:
+                if exc.code not in RETRY_STATUSES or attempt >= retries:
+                    raise
+                delay = retry_after_seconds(exc)
+            except (URLError, OSError, http.client.HTTPException) as exc:
+                if attempt >= retries:
+                    raise exc if isinstance(exc, URLError) else URLError(exc)
+                delay = None
+            attempt += 1
+            if delay is None:
+                delay = backoff_delay(attempt, self.backoff, 30.0)
+            time.sleep(min(delay, 30.0))
+
+    def _follow(self, url: str, method: str, headers: dict, timeout: float) -> Response:
+        for _ in range(MAX_REDIRECTS + 1):
+            try:
+                status, reason, msg, body = self._send_once(url, method, headers, timeout)
+            except socket.timeout as exc:
+                raise URLError(exc)
+            if status in REDIRECT_STATUSES and msg.get("Location"):
+                url = urllib.parse.urljoin(url, msg["Location"])
+                if status == 303:
+                    method = "GET"
+                continue
+            if status >= 400:
+                raise HTTPError(url, status, reason, msg, None)
+            return Response(url, status, msg, body)
+        raise URLError(f"too many redirects: {url}")
+
+    def get_bytes(self, url: str, headers: Optional[dict] = None, timeout: Optional[float] = None) -> bytes:
+        return self.request(url, headers=headers, timeout=timeout).body
+
+    def get_text(self, url: str, headers: Optional[dict] = None, timeout: Optional[float] = None) -> str:
+        return self.request(url, headers=headers, timeout=timeout).text()
+
+    def get_json(self, url: str, headers: Optional[dict] = None, timeout: Optional[float] = None):
+        return self.request(url, headers=headers, timeout=timeout).json()
+
+    def final_url(self, url: str, headers: Optional[dict] = None, timeout: Optional[float] = None) -> str:
+        return self.request(url, headers=headers, timeout=timeout).url
+
+    def stats_line(self) -> str:
+        return f"HTTP: {self.requests_sent} request(s) over {self.connections_opened} connection(s)"
+
+    def close(self):
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+        for pool in pools:
+            with pool.lock:
+                for conn, _ in pool.idle:
+                    conn.close()
+                pool.idle.clear()
+
+
+def _decode_body(body: bytes, encoding: Optional[str]) -> bytes:
+    encoding = (encoding or "").lower()
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    if encoding == "deflate":
+        try:
+            return zlib.decompress(body)
+        except zlib.error:
+            return zlib.decompress(body, -zlib.MAX_WBITS)
+    return body
+
+
+_DEFAULT: Optional[HTTPClient] = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def default_client() -> HTTPClient:
+    global _DEFAULT
+    with _DEFAULT_LOCK:
+        if _DEFAULT is None:
+            _DEFAULT = HTTPClient()
+        return _DEFAULT
+
+
+def configure(max_per_host: Optional[int] = None, timeout: Optional[float] = None, retries: Optional[int] = None) -> HTTPClient:
+    """Replace the shared client with one using the given limits (idle connections are closed)."""
+    global _DEFAULT
+    with _DEFAULT_LOCK:
+        previous = _DEFAULT
+        _DEFAULT = HTTPClient(
+            max_per_host=max_per_host if max_per_host is not None else (previous.max_per_host if previous else 4),
+            timeout=timeout if timeout is not None else (previous.timeout if previous else 20),
+            retries=retries if retries is not None else (previous.retries if previous else 2),
+        )
+    if previous is not None:
+        _DEFAULT._rate_limits.update(previous._rate_limits)
+        previous.close()
+    return _DEFAULT
@@ -0,0 +1,147 @@
+"""Job manifests: the expanded entry list of a playlist job plus per-entry status.
+
+Each job is an append-only JSONL journal under ``APP_ROOT/jobs``. The first line holds the
+job header (kind, source URL, download parameters, title); entry lines list the work
+items; update lines record status changes, final paths and tag status. Replaying the file rebuilds the latest state, and a torn final
+line from a crash is ignored, so an interrupted job resumes where it stopped without
+re-extracting the playlist.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, Optional
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+SKIPPED = "skipped"
+CANCELLED = "cancelled"
+
+# Failures of these kinds are not retried when a job resumes.
+FINAL_FAILURE_KINDS = ("permanent",)
+
+
+def job_id_for(kind: str, source: str, params: Optional[dict] = None) -> str:
+    payload = json.dumps({"kind": kind, "source": source.strip(), "params": params or {}}, sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class JobManifest:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.header: dict = {}
+        self.entries: dict[str, dict] = {}
+        self._order: list[str] = []
+        self._lock = threading.Lock()
+        if self.path.exists():
+            self._replay()
+
+    @classmethod
+    def create(cls, path: Path, header: dict, entries: Iterable[dict]) -> "JobManifest":
+        """Write a fresh manifest (replacing any previous one) and return it loaded."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        lines = [{"type": "job", "created": int(time.time()), "status": RUNNING, **header}]
+        for index, entry in enumerate(entries, start=1):
+            lines.append({"type": "entry", "index": index, "status": PENDING, "attempts": 0, **entry})
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with tmp.open("w", encoding="utf-8") as fh:
+            fh.write("".join(json.dumps(line, ensure_ascii=False) + "\n" for line in lines))
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
+        return cls(path)
+
+    def _replay(self):
+        with self.path.open("r", encoding="utf-8") as fh:
+            for raw in fh:
+                try:
+                    line = json.loads(raw)
+                except ValueError:
+                    continue
+                kind = line.pop("type", None)
+                if kind == "job":
+                    self.header = line
+                elif kind == "job_update":
+                    self.header.update(line)
+                elif kind == "entry" and line.get("key"):
+                    if line["key"] not in self.entries:
+                        self._order.append(line["key"])
+                    self.entries[line["key"]] = line
+                elif kind == "update" and line.get("key") in self.entries:
+                    self.entries[line.pop("key")].update(line)
+
+    def _append(self, line: dict):
+        with self.path.open("a", encoding="utf-8") as fh:
+            fh.write(json.dumps(line, ensure_ascii=False) + "\n")
+            fh.flush()
+            os.fsync(fh.fileno())
+
+    def add(self, entry: dict) -> dict:
+        """Append a new pending entry (e.g. a job submitted to a running queue)."""
+        line = {"index": len(self._order) + 1, "status": PENDING, "attempts": 0, **entry}
+        with self._lock:
+            if line["key"] in self.entries:
+                raise KeyError(f"duplicate entry key: {line['key']}")
+            self._append({"type": "entry", **line})
+            self.entries[line["key"]] = line
+            self._order.append(line["key"])
+        return line
+
+    def update(self, key: str, **fields):
+        with self._lock:
+            self.entries[key].update(fields)
+            self._append({"type": "update", "key": key, "ts": int(time.time()), **fields})
+
+    def update_job(self, **fields):
+        with self._lock:
+            self.header.update(fields)
+            self._append({"type": "job_update", "ts": int(time.time()), **fields})
+
+    def ordered(self) -> list[dict]:
+        return [self.entries[key] for key in self._order]
+
+    def runnable(self) -> list[dict]:
+        """Entries still to do: pending, interrupted while running, or failed but retryable."""
+        return [
+            entry for entry in self.ordered()
+            if entry["status"] in (PENDING, RUNNING)
+            or (entry["status"] == FAILED and entry.get("error_kind") not in FINAL_FAILURE_KINDS)
+        ]
+
+    def counts(self) -> dict:
+        counts = {PENDING: 0, RUNNING: 0, DONE: 0, FAILED: 0, SKIPPED: 0, CANCELLED: 0}
+        for entry in self.entries.values():
+            counts[entry["status"]] = counts.get(entry["status"], 0) + 1
+        return counts
+
+    @property
+    def finished(self) -> bool:
+        return self.header.get("status") == DONE
+
+
+def list_unfinished(directory: Path) -> list[JobManifest]:
+    """Every job under ``directory`` that has a header and has not completed, oldest first."""
+    directory = Path(directory)
+    if not directory.is_dir():
+        return []
+    manifests = [JobManifest(path) for path in directory.glob("*.jsonl")]
+    manifests = [manifest for manifest in manifests if manifest.header and not manifest.finished]
+    return sorted(manifests, key=lambda manifest: manifest.header.get("created", 0))
+
+
+def open_unfinished(path: Path) -> Optional[JobManifest]:
+    """The manifest at ``path`` if it exists, parses and has not completed."""
+    if not Path(path).exists():
+        return None
+    manifest = JobManifest(path)
+    if not manifest.header or manifest.finished:
+        return None
+    return manifest
@@ -0,0 +1,90 @@
+"""Score YouTube search candidates against Spotify/Exportify track metadata."""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from typing import Iterable, Optional
+
+from .archive import normalize_query
+
+# Version markers that make a different recording; penalized unless the track title has them too.
+VARIANT_WORDS = ("live", "cover", "karaoke", "instrumental", "remix", "sped", "slowed", "reverb", "nightcore", "8d", "acoustic")
+DURATION_TOLERANCE = 4.0
+MIN_SCORE = 0.35
+
+
+def _tokens(text: str) -> set[str]:
+    text = unicodedata.normalize("NFKD", text or "").encode("ascii", "ignore").decode("ascii")
+    return {token for token in re.split(r"[^a-z0-9]+", text.lower()) if token}
+
+
+def _artists(track: dict) -> list[str]:
+    return [name.strip() for name in re.split(r"[,;&]", track.get("artists") or "") if name.strip()]
+
+
+def track_from_item(item) -> dict:
+    """Normalize a work item (query string or Exportify dict) to the fields the scorer uses."""
+    if isinstance(item, dict):
+        track = dict(item)
+        track.setdefault("title", item.get("query", ""))
+        return track
+    return {"query": str(item), "title": str(item), "artists": ""}
+
+
+def match_cache_key(track: dict) -> str:
+    if track.get("isrc"):
+        return f"match:isrc:{track['isrc']}"
+    if track.get("spotify_id"):
+        return f"match:spotify:{track['spotify_id']}"
+    return f"match:query:{normalize_query(track.get('query') or track.get('title') or '')}"
+
+
+def score_candidate(track: dict, candidate: dict) -> float:
+    """0..1 similarity between a track and a flat search entry (title, channel, duration)."""
+    title_tokens = _tokens(track.get("title") or track.get("query") or "")
+    cand_title = candidate.get("title") or ""
+    channel = candidate.get("channel") or candidate.get("uploader") or ""
+    cand_tokens = _tokens(cand_title) | _tokens(channel)
+    if not title_tokens or not cand_title:
+        return 0.0
+
+    score = 0.45 * len(title_tokens & cand_tokens) / len(title_tokens)
+
+    artists = _artists(track)
+    if artists:
+        hits = sum(1 for name in artists if _tokens(name) and _tokens(name) <= cand_tokens)
+        score += 0.25 * hits / len(artists)
+    else:
+        score += 0.1
+
+    expected = track.get("duration_ms")
+    actual = candidate.get("duration")
+    if expected and actual:
+        delta = abs(float(actual) - expected / 1000.0)
+        score += 0.3 * max(0.0, 1.0 - max(0.0, delta - DURATION_TOLERANCE) / 30.0)
+    else:
+        score += 0.1
+
+    raw_title_tokens = _tokens(track.get("title") or "")
+    cand_title_tokens = _tokens(cand_title)
+    for word in VARIANT_WORDS:
+        if word in cand_title_tokens and word not in raw_title_tokens:
+            score -= 0.15
+    if channel.endswith(" - Topic") or "official audio" in cand_title.lower():
+        score += 0.05
+    return max(0.0, min(1.0, score))
+
+
+def pick_best(track: dict, candidates: Iterable[dict], min_score: float = MIN_SCORE) -> Optional[tuple[dict, float]]:
+    """Highest-scoring candidate with an id, or ``None`` when nothing reaches ``min_score``."""
+    best = None
+    for candidate in candidates:
+        if not isinstance(candidate, dict) or not candidate.get("id"):
+            continue
+        score = score_candidate(track, candidate)
+        if best is None or score > best[1]:
+            best = (candidate, score)
+    if best is None or best[1] < min_score:
+        return None
+    return best
@@ -0,0 +1,197 @@
+"""Shared asyncio loop for network-bound pipeline stages.
+
+Metadata resolution, lyrics/cover lookups and CSV watching run as coroutines on one
+event loop in a background thread, so hundreds of them can be in flight without a
+thread each. The transport stays the blocking shared ``HTTPClient`` (keep-alive pools,
+per-host caps and rate limits), awaited via ``lookup()``. Heavy blocking work such as
+yt-dlp extraction, tag writes and ffmpeg goes through ``offload()`` on a separate small
+pool, so a slow probe never holds up the lookups queued behind it.
+
+Synchronous callers use ``run()``/``submit()`` to drive coroutines, and
+``stream_ordered()`` to consume results as a plain iterator.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Iterable, Iterator, Optional
+
+DEFAULT_LOOKUPS = 64
+DEFAULT_BLOCKING = 4
+
+
+class Orchestrator:
+    """Event loop thread plus the executors its coroutines await blocking calls on.
+
+    ``max_lookups`` caps blocking network calls running at once (coroutines beyond that
+    wait on the loop, not in a thread). ``max_blocking`` sizes the pool for yt-dlp/ffmpeg
+    style work. The loop starts on first use.
+    """
+
+    def __init__(self, max_lookups: int = DEFAULT_LOOKUPS, max_blocking: int = DEFAULT_BLOCKING):
+        self.max_lookups = max(1, int(max_lookups))
+        self.max_blocking = max(1, int(max_blocking))
+        self._lookup_pool = ThreadPoolExecutor(max_workers=self.max_lookups, thread_name_prefix="crystalmedia-lookup")
+        self._blocking_pool = ThreadPoolExecutor(max_workers=self.max_blocking, thread_name_prefix="crystalmedia-blocking")
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lookup_slots: Optional[asyncio.Semaphore] = None
+        self._in_flight = 0
+        self.peak_in_flight = 0
+        self.lookups = 0
+        self.offloaded = 0
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def _serve():
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(ready.set)
+                    loop.run_forever()
+
+                self._thread = threading.Thread(target=_serve, name="crystalmedia-loop", daemon=True)
+                self._thread.start()
+                ready.wait()
+                self._loop = loop
+            return self._loop
+
+    def _on_loop_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro: Awaitable) -> Future:
+        """Schedule ``coro`` on the loop; returns a ``concurrent.futures.Future``."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Awaitable, timeout: Optional[float] = None):
+        """Run ``coro`` to completion from synchronous code and return its result.
+
+        The coroutine is cancelled if the caller stops waiting (timeout, Ctrl+C).
+        """
+        if self._on_loop_thread():
+            raise RuntimeError("Orchestrator.run() called from its own event loop; await the coroutine instead")
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+    async def lookup(self, fn: Callable, *args, **kwargs):
+        """Await a blocking network call (e.g. an ``HTTPClient`` request) on the lookup pool."""
+        if self._lookup_slots is None:
+            self._lookup_slots = asyncio.Semaphore(self.max_lookups)
+        async with self._lookup_slots:
+            self._in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self._in_flight)
+            self.lookups += 1
+            try:
+                return await asyncio.get_running_loop().run_in_executor(self._lookup_pool, functools.partial(fn, *args, **kwargs))
+            finally:
+                self._in_flight -= 1
+
+    async def offload(self, fn: Callable, *args, **kwargs):
+        """Await heavy blocking work (yt-dlp, ffmpeg, file tagging) on the blocking pool."""
+        self.offloaded += 1
+        return await asyncio.get_running_loop().run_in_executor(self._blocking_pool, functools.partial(fn, *args, **kwargs))
+
+    def stream_ordered(self, items: Iterable, fn: Callable[[Any], Awaitable], window: int) -> Iterator[tuple[Any, Any, Optional[BaseException]]]:
+        """Yield ``(item, result, error)`` in input order with up to ``window`` coroutines ahead.
+
+        ``items`` is consumed lazily from the calling thread, so a generator that is still
+        discovering work keeps feeding the loop. Closing the iterator cancels what is left.
+        """
+        window = max(1, int(window))
+        iterator = iter(items)
+        pending: list[tuple[Any, Future]] = []
+        try:
+            while True:
+                while len(pending) < window:
+                    try:
+                        item = next(iterator)
+                    except StopIteration:
+                        break
+                    pending.append((item, self.submit(fn(item))))
+                if not pending:
+                    return
+                item, future = pending.pop(0)
+                try:
+                    yield item, future.result(), None
+                except Exception as e:
+                    yield item, None, e
+        finally:
+            for _item, future in pending:
+                future.cancel()
+
+    async def wait_for(
+        self,
+        check: Callable[[], Any],
+        timeout: float,
+        interval: float = 1.0,
+        on_wait: Optional[Callable[[float], None]] = None,
+    ):
+        """Poll ``check`` (on the lookup pool) until it returns something truthy or ``timeout`` passes.
+
+        ``on_wait(remaining_seconds)`` runs after each miss. Returns the value, or None on timeout.
+        """
+        deadline = time.monotonic() + max(0.0, timeout)
+        while True:
+            result = await self.lookup(check)
+            if result:
+                return result
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            if on_wait is not None:
+                on_wait(remaining)
+            await asyncio.sleep(min(interval, remaining))
+
+    def stats_line(self) -> str:
+        return f"Async lookups: {self.lookups} run, peak {self.peak_in_flight}/{self.max_lookups} in flight; {self.offloaded} blocking call(s) offloaded"
+
+    def close(self, wait: bool = True):
+        with self._lock:
+            loop, self._loop = self._loop, None
+            thread, self._thread = self._thread, None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            if wait and thread is not None:
+                thread.join()
+            if not loop.is_running():
+                loop.close()
+        self._lookup_pool.shutdown(wait=wait)
+        self._blocking_pool.shutdown(wait=wait)
+
+
+_DEFAULT: Optional[Orchestrator] = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def default_orchestrator() -> Orchestrator:
+    global _DEFAULT
+    with _DEFAULT_LOCK:
+        if _DEFAULT is None:
+            _DEFAULT = Orchestrator()
+        return _DEFAULT
+
+
+def configure(max_lookups: Optional[int] = None, max_blocking: Optional[int] = None) -> Orchestrator:
+    """Replace the shared orchestrator with one using the given limits."""
+    global _DEFAULT
+    with _DEFAULT_LOCK:
+        previous = _DEFAULT
+        _DEFAULT = Orchestrator(
+            max_lookups=max_lookups if max_lookups is not None else (previous.max_lookups if previous else DEFAULT_LOOKUPS),
+            max_blocking=max_blocking if max_blocking is not None else (previous.max_blocking if previous else DEFAULT_BLOCKING),
+        )
+    if previous is not None:
+        previous.close(wait=False)
+    return _DEFAULT
@@ -0,0 +1,102 @@
+"""Request pacing for yt-dlp: fixed sleep profiles plus an adaptive mode driven by throttling.
+
+yt-dlp's ``sleep_interval``/``max_sleep_interval`` wait before every download and
+``sleep_requests`` between extraction requests. Sleeping unconditionally costs minutes on
+long playlists even when YouTube never throttles, so the adaptive mode starts without
+sleeps and moves up one level each time the error classifier reports rate limiting, then
+eases back down after a run of successes.
+"""
+
+from __future__ import annotations
+
+import threading
+
+AGGRESSIVE = "aggressive"
+BALANCED = "balanced"
+STEALTH = "stealth"
+ADAPTIVE = "adaptive"
+PROFILES = (ADAPTIVE, AGGRESSIVE, BALANCED, STEALTH)
+
+# Sleep settings from none to the most cautious; profiles and adaptive mode pick a level.
+LEVELS = (
+    {},
+    {"sleep_requests": 0.5, "sleep_interval": 1, "max_sleep_interval": 3},
+    {"sleep_requests": 1, "sleep_interval": 3, "max_sleep_interval": 10},
+    {"sleep_requests": 2, "sleep_interval": 5, "max_sleep_interval": 15},
+)
+SLEEP_KEYS = ("sleep_requests", "sleep_interval", "max_sleep_interval")
+
+
+def profile_level(profile: str, is_playlist: bool) -> int:
+    if profile == AGGRESSIVE or profile == ADAPTIVE:
+        return 0
+    if profile == BALANCED:
+        return 1
+    return 3 if is_playlist else 2
+
+
+class Pacer:
+    """Current sleep options for one job plus its throttle statistics.
+
+    Fixed profiles keep their level and only count events. In adaptive mode ``throttled()``
+    raises the level and ``recover_after`` consecutive ``succeeded()`` calls lower it again.
+    """
+
+    def __init__(self, profile: str = ADAPTIVE, is_playlist: bool = False, recover_after: int = 20):
+        self.profile = profile if profile in PROFILES else ADAPTIVE
+        self.level = profile_level(self.profile, is_playlist)
+        self.recover_after = max(1, recover_after)
+        self._lock = threading.Lock()
+        self._streak = 0
+        self.throttle_events = 0
+        self.peak_level = self.level
+
+    @property
+    def adaptive(self) -> bool:
+        return self.profile == ADAPTIVE
+
+    def options(self) -> dict:
+        """Sleep options for the current level (keys absent at level 0)."""
+        with self._lock:
+            return dict(LEVELS[self.level])
+
+    def apply(self, options: dict) -> dict:
+        """Replace the sleep keys in ``options`` with the current level's values."""
+        for key in SLEEP_KEYS:
+            options.pop(key, None)
+        options.update(self.options())
+        return options
+
+    def throttled(self) -> bool:
+        """Record a rate-limit event; returns True when the level went up."""
+        with self._lock:
+            self.throttle_events += 1
+            self._streak = 0
+            if not self.adaptive or self.level >= len(LEVELS) - 1:
+                return False
+            self.level += 1
+            self.peak_level = max(self.peak_level, self.level)
+            return True
+
+    def succeeded(self) -> bool:
+        """Record a successful download; returns True when the level went down."""
+        with self._lock:
+            if not self.adaptive or self.level == 0:
+                return False
+            self._streak += 1
+            if self._streak < self.recover_after:
+                return False
+            self._streak = 0
+            self.level -= 1
+            return True
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"pacing": self.profile, "throttle_events": self.throttle_events, "pacing_level": self.level, "pacing_peak_level": self.peak_level}
+
+    def stats_line(self) -> str:
+        stats = self.stats()
+        return (
+            f"Pacing: {stats['pacing']}, {stats['throttle_events']} throttle event(s), "
+            f"level {stats['pacing_level']}/{len(LEVELS) - 1} (peak {stats['pacing_peak_level']})"
+        )
@@ -0,0 +1,46 @@
+"""Lightweight wall-clock phase timing for startup and job reports."""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+
+
+class PhaseTimer:
+    """Records named phases in order and renders a small timing report."""
+
+    def __init__(self):
+        self.phases: list[tuple[str, float]] = []
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - started))
+
+    def record(self, name: str, seconds: float):
+        self.phases.append((name, seconds))
+
+    @property
+    def total(self) -> float:
+        return sum(seconds for _, seconds in self.phases)
+
+    def report_lines(self, title: str = "Startup profile") -> list[str]:
+        width = max((len(name) for name, _ in self.phases), default=5)
+        lines = [title]
+        for name, seconds in self.phases:
+            lines.append(f"  {name.ljust(width)}  {seconds * 1000:9.1f} ms")
+        lines.append(f"  {'total'.ljust(width)}  {self.total * 1000:9.1f} ms")
+        return lines
+
+
+@contextmanager
+def maybe_phase(timer: PhaseTimer | None, name: str):
+    """``timer.phase(name)`` when profiling is enabled, otherwise a no-op."""
+    if timer is None:
+        yield
+        return
+    with timer.phase(name):
+        yield
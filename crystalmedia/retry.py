@@ -0,0 +1,134 @@
+"""Error classification and backoff for download retries."""
+
+from __future__ import annotations
+
+import random
+import re
+from typing import Optional
+
+TRANSIENT = "transient"
+RATE_LIMITED = "rate_limited"
+AGE_RESTRICTED = "age_restricted"
+JS_RUNTIME = "js_runtime"
+PERMANENT = "permanent"
+
+_PERMANENT_PATTERNS = (
+    "video unavailable",
+    "this video is unavailable",
+    "this video is not available",
+    "private video",
+    "has been removed",
+    "been terminated",
+    "copyright",
+    "not available in your country",
+    "members-only",
+    "join this channel",
+    "unsupported url",
+    "is not a valid url",
+    "no video formats found",
+    "requested format is not available",
+    "does not exist",
+    "premieres in",
+    "http error 404",
+    "http error 410",
+    "404: not found",
+)
+_AGE_PATTERNS = ("age-restricted", "confirm your age", "sign in to confirm", "this video may be inappropriate", "login required")
+_RATE_PATTERNS = ("http error 429", "too many requests", "rate limit", "ratelimit", "throttl")
+# yt-dlp's signature/n-challenge failures and missing-runtime messages; bare words such as
+# "node" or "challenge" also occur in DNS and network errors.
+_RUNTIME = re.compile(
+    r"\bnsig\b|signature extraction|unable to extract (?:n?sig|signature)|\bn challenge|challenge solv"
+    r"|\[jsc\b|\bjsc:|\bjs runtime|javascript runtime"
+    r"|\b(?:deno|node|nodejs)(?: runtime)?(?::| is)? not found|no such file or directory: '(?:deno|node)'"
+)
+_STATUS = re.compile(r"\bhttp error (\d{3})\b")
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    """HTTP status from an exception or its cause chain (urllib and yt-dlp networking errors)."""
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        for attr in ("code", "status"):
+            value = getattr(exc, attr, None)
+            if isinstance(value, int) and 100 <= value <= 599:
+                return value
+        response = getattr(exc, "response", None)
+        status = getattr(response, "status", None)
+        if isinstance(status, int):
+            return status
+        exc_info = getattr(exc, "exc_info", None)
+        nested = exc_info[1] if isinstance(exc_info, tuple) and len(exc_info) > 1 else None
+        exc = nested or exc.__cause__ or exc.__context__
+    return None
+
+
+def classify_error(error) -> str:
+    """Map an exception (or its message) to one of the retry categories above."""
+    text = str(error).lower()
+    status = _status_code(error) if isinstance(error, BaseException) else None
+    if status is None:
+        match = _STATUS.search(text)
+        status = int(match.group(1)) if match else None
+    if any(key in text for key in _AGE_PATTERNS):
+        return AGE_RESTRICTED
+    if status == 429 or any(key in text for key in _RATE_PATTERNS):
+        return RATE_LIMITED
+    if any(key in text for key in _PERMANENT_PATTERNS) or status in (400, 401, 404, 410, 451):
+        return PERMANENT
+    if _RUNTIME.search(text):
+        return JS_RUNTIME
+    return TRANSIENT
+
+
+def retry_after_seconds(error) -> Optional[float]:
+    """``Retry-After`` (seconds form) from an HTTP error in the exception chain, if any."""
+    seen = set()
+    exc = error if isinstance(error, BaseException) else None
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        headers = getattr(exc, "headers", None)
+        if headers is None:
+            headers = getattr(getattr(exc, "response", None), "headers", None)
+        value = headers.get("Retry-After") if headers is not None else None
+        if value:
+            try:
+                return max(0.0, float(value))
+            except ValueError:
+                return None
+        exc_info = getattr(exc, "exc_info", None)
+        nested = exc_info[1] if isinstance(exc_info, tuple) and len(exc_info) > 1 else None
+        exc = nested or exc.__cause__ or exc.__context__
+    return None
+
+
+def backoff_delay(attempt: int, base: float, cap: float, rng: Optional[random.Random] = None) -> float:
+    """Exponential backoff with "equal jitter": half fixed, half random, capped at ``cap``."""
+    rng = rng or random
+    ceiling = min(cap, base * (2 ** max(0, attempt - 1)))
+    return ceiling / 2 + rng.uniform(0, ceiling / 2)
+
+
+class RetryPolicy:
+    """Decides whether and how long to wait before the next attempt.
+
+    Permanent errors fail immediately. Rate limits wait at least ``Retry-After`` (or a
+    longer backoff). Transient errors use exponential backoff with jitter.
+    """
+
+    def __init__(self, max_attempts: int = 8, base_delay: float = 2.0, max_delay: float = 120.0, rate_limit_delay: float = 30.0, rng: Optional[random.Random] = None):
+        self.max_attempts = max(1, int(max_attempts))
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.rate_limit_delay = rate_limit_delay
+        self.rng = rng or random.Random()
+
+    def next_delay(self, kind: str, attempt: int, retry_after: Optional[float] = None) -> Optional[float]:
+        """Seconds to wait before attempt ``attempt + 1``, or ``None`` to give up."""
+        if kind == PERMANENT or attempt >= self.max_attempts:
+            return None
+        if kind == RATE_LIMITED:
+            floor = retry_after if retry_after is not None else self.rate_limit_delay
+            return min(max(floor, backoff_delay(attempt, self.rate_limit_delay, self.max_delay, self.rng)), max(self.max_delay, floor))
+        return backoff_delay(attempt, self.base_delay, self.max_delay, self.rng)
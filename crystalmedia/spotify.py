@@ -0,0 +1,164 @@
+"""Spotify playlist/album scrape fallback: stream track ids across every page we can reach.
+
+The public playlist page only inlines the first ~30 rows. The remaining rows come from the
+embed page's ``__NEXT_DATA__`` payload and, when the page hands out an anonymous access
+token, the paginated Web API (``next`` links, 100 rows per page). Ids are yielded as soon
+as each source is parsed so downloads can start before enumeration finishes.
+"""
+
+from __future__ import annotations
+
+import csv
+import re
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+from .archive import normalize_query, spotify_track_id
+
+# One alternation covers every form the page uses: /track/<id> links (plain, escaped and
+# absolute), spotify:track:<id> URIs (also inside __NEXT_DATA__) and their %3A/%253A
+# URL-encoded variants.
+TRACK_ID_SCANNER = re.compile(r"(?:/track/|spotify(?::|%3A|%253A)track(?::|%3A|%253A))([A-Za-z0-9]{22})")
+_ACCESS_TOKEN = re.compile(r'"accessToken"\s*:\s*"([^"]+)"')
+_COLLECTION = re.compile(r"(?:/|spotify:)(playlist|album)[/:]([A-Za-z0-9]{22})")
+
+API_PAGE_SIZE = 100
+MAX_API_PAGES = 200
+
+GetText = Callable[[str, dict], str]
+GetJson = Callable[[str, dict], dict]
+
+
+def collection_ref(url: str) -> Optional[tuple[str, str]]:
+    """``("playlist" | "album", id)`` for a Spotify collection URL or URI."""
+    match = _COLLECTION.search(url or "")
+    return (match.group(1), match.group(2)) if match else None
+
+
+def iter_page_track_ids(page: str) -> Iterator[str]:
+    """Unique track ids in document order, from a single scan of the page."""
+    seen = set()
+    for match in TRACK_ID_SCANNER.finditer(page or ""):
+        tid = match.group(1)
+        if tid not in seen:
+            seen.add(tid)
+            yield tid
+
+
+def page_access_token(page: str) -> Optional[str]:
+    match = _ACCESS_TOKEN.search(page or "")
+    return match.group(1) if match else None
+
+
+def api_tracks_url(kind: str, collection_id: str, offset: int = 0) -> str:
+    fields = "&fields=items(track(id)),next" if kind == "playlist" else ""
+    return f"https://api.spotify.com/v1/{kind}s/{collection_id}/tracks?offset={offset}&limit={API_PAGE_SIZE}{fields}"
+
+
+def _api_page_ids(payload: dict) -> list[str]:
+    ids = []
+    for item in payload.get("items") or []:
+        if not isinstance(item, dict):
+            continue
+        track = item.get("track") if "track" in item else item
+        if isinstance(track, dict) and track.get("id"):
+            ids.append(track["id"])
+    return ids
+
+
+def iter_collection_track_ids(
+    url: str,
+    get_text: GetText,
+    get_json: Optional[GetJson] = None,
+    headers: Optional[dict] = None,
+    log: Optional[Callable[[str], None]] = None,
+) -> Iterator[str]:
+    """Stream every reachable track id of a playlist/album page, in playlist order, once each.
+
+    Sources, in order: the page itself, the embed page and (when an access token is
+    exposed) the Web API pages. A failing later source ends enumeration with what was
+    already yielded instead of raising.
+    """
+    headers = dict(headers or {})
+    seen: set[str] = set()
+
+    def _fresh(ids):
+        for tid in ids:
+            if tid not in seen:
+                seen.add(tid)
+                yield tid
+
+    page = get_text(url, headers)
+    yield from _fresh(iter_page_track_ids(page))
+
+    ref = collection_ref(url)
+    if ref is None:
+        return
+    kind, collection_id = ref
+    token = page_access_token(page)
+
+    try:
+        embed = get_text(f"https://open.spotify.com/embed/{kind}/{collection_id}", headers)
+        token = token or page_access_token(embed)
+        yield from _fresh(iter_page_track_ids(embed))
+    except Exception as exc:
+        if log:
+            log(f"Spotify embed page unavailable: {str(exc)[:120]}")
+
+    if not token or get_json is None:
+        return
+    api_headers = {**headers, "Authorization": f"Bearer {token}"}
+    next_url: Optional[str] = api_tracks_url(kind, collection_id)
+    for _ in range(MAX_API_PAGES):
+        if not next_url:
+            break
+        try:
+            payload = get_json(next_url, api_headers)
+        except Exception as exc:
+            if log:
+                log(f"Spotify track paging stopped after {len(seen)} id(s): {str(exc)[:120]}")
+            return
+        yield from _fresh(_api_page_ids(payload))
+        next_url = payload.get("next")
+
+
+def _column(row: dict, *names: str) -> str:
+    for name in names:
+        value = row.get(name)
+        if value:
+            return value.strip()
+    return ""
+
+
+def iter_exportify_tracks(csv_path: Path) -> Iterator[dict]:
+    """Stream track items from an Exportify CSV, one row at a time, without a track cap.
+
+    Each item carries the search ``query`` plus whatever Exportify provided (``title``,
+    ``artists``, ``album``, ``isrc``, ``duration_ms``, ``spotify_id``). Repeats are
+    dropped by ISRC, then Spotify id, then normalized query.
+    """
+    seen: set[str] = set()
+    with Path(csv_path).open("r", encoding="utf-8-sig", newline="") as fh:
+        for row in csv.DictReader(fh):
+            title = _column(row, "Track Name", "track_name")
+            if not title:
+                continue
+            artists = _column(row, "Artist Name(s)", "artist_names", "Artist Name")
+            query = f"{title} {artists}".strip()
+            isrc = _column(row, "ISRC", "isrc").upper()
+            spotify_id = spotify_track_id(_column(row, "Track URI", "track_uri", "Spotify ID"))
+            keys = [f"isrc:{isrc}" if isrc else "", f"id:{spotify_id}" if spotify_id else "", f"q:{normalize_query(query)}"]
+            keys = [key for key in keys if key]
+            if any(key in seen for key in keys):
+                continue
+            seen.update(keys)
+            duration = _column(row, "Duration (ms)", "Track Duration (ms)", "duration_ms")
+            yield {
+                "query": query,
+                "title": title,
+                "artists": artists,
+                "album": _column(row, "Album Name", "album_name"),
+                "isrc": isrc or None,
+                "duration_ms": int(duration) if duration.isdigit() else None,
+                "spotify_id": spotify_id,
+            }
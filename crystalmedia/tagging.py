@@ -0,0 +1,131 @@
+"""Background tagging stage: enrich finished audio files while later items keep downloading.
+
+Each file is a coroutine on the shared orchestrator loop: its lyrics and cover lookups
+are awaited concurrently and the tag write is offloaded, so many files can wait on
+the network at once without a thread per file.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+from concurrent.futures import wait as wait_futures
+from pathlib import Path
+from typing import Callable, Optional
+
+from .extras import TAGGABLE_SUFFIXES, fetch_extras_async, write_audio_tags
+from .orchestrator import Orchestrator, default_orchestrator
+
+LogFn = Callable[[str, str], None]
+ResultFn = Callable[[Path, dict, bool], None]
+
+# Info fields the tagger reads; kept in job manifests so files can be re-tagged after a crash.
+TAG_INFO_KEYS = ("id", "track", "title", "artist", "uploader", "channel", "album", "playlist_title", "upload_date", "thumbnail")
+
+
+def tag_info(info: dict) -> dict:
+    return {key: info[key] for key in TAG_INFO_KEYS if info.get(key)}
+
+
+class TaggingStage:
+    """Fetches lyrics/subtitles/cover art and writes tags per finished file, ``max_workers`` files at a time.
+
+    Files are submitted as soon as yt-dlp finishes post-processing them (see
+    ``postprocessor_hook``), so HTTP lookups overlap with the remaining downloads.
+    ``close()`` waits for outstanding work and returns ``(tagged, failed)``. ``on_result``
+    is called with ``(path, info, ok)`` after each file.
+    """
+
+    def __init__(
+        self,
+        user_agents: list[str],
+        embed_extras: bool,
+        max_workers: int = 4,
+        log: Optional[LogFn] = None,
+        cache=None,
+        on_result: Optional[ResultFn] = None,
+        orchestrator: Optional[Orchestrator] = None,
+    ):
+        self.user_agents = user_agents
+        self.embed_extras = embed_extras
+        self.log = log
+        self.cache = cache
+        self.on_result = on_result
+        self.orchestrator = orchestrator or default_orchestrator()
+        self.workers = max(1, int(max_workers))
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._lock = threading.Lock()
+        self._submitted: set[str] = set()
+        self._futures = []
+        self.tagged = 0
+        self.failed = 0
+
+    def submit(self, path: Path, info: dict) -> bool:
+        """Queue ``path`` for tagging once; returns False if it was already queued or cannot be tagged."""
+        path = Path(path)
+        if path.suffix.lower() not in TAGGABLE_SUFFIXES:
+            return False
+        key = os.path.normcase(str(path.resolve()))
+        with self._lock:
+            if key in self._submitted:
+                return False
+            self._submitted.add(key)
+            self._futures.append(self.orchestrator.submit(self._tag_one(path, dict(info))))
+        return True
+
+    async def _tag_one(self, path: Path, info: dict):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.workers)
+        try:
+            async with self._slots:
+                extras = None
+                if self.embed_extras:
+                    extras = await fetch_extras_async(info, self.user_agents, self.orchestrator.lookup, log=self.log, cache=self.cache)
+                await self.orchestrator.offload(
+                    write_audio_tags, path, info, embed_extras=self.embed_extras, user_agents=self.user_agents, log=self.log, extras=extras
+                )
+        except Exception as e:
+            with self._lock:
+                self.failed += 1
+            if self.log:
+                self.log(f"Metadata/lyrics embed failed for {path.name}: {str(e)[:120]}", "warning")
+            self._report(path, info, False)
+            return
+        with self._lock:
+            self.tagged += 1
+        self._report(path, info, True)
+
+    def _report(self, path: Path, info: dict, ok: bool):
+        if self.on_result is None:
+            return
+        try:
+            self.on_result(path, info, ok)
+        except Exception:
+            pass
+
+    @property
+    def pending(self) -> int:
+        with self._lock:
+            return sum(1 for future in self._futures if not future.done())
+
+    def postprocessor_hook(self, d: dict):
+        """yt-dlp ``postprocessor_hooks`` entry: tag each file once it reaches its final location."""
+        if d.get("status") != "finished" or d.get("postprocessor") != "MoveFiles":
+            return
+        info = d.get("info_dict") or {}
+        filepath = info.get("filepath")
+        if not filepath:
+            return
+        final_dir = info.get("__finaldir")
+        path = Path(final_dir) / Path(filepath).name if final_dir else Path(filepath)
+        self.submit(path, info)
+
+    def close(self, wait: bool = True):
+        if wait:
+            with self._lock:
+                futures = list(self._futures)
+            wait_futures(futures)
+        if self.cache is not None and self.embed_extras and self.log and self._submitted:
+            self.log(self.cache.stats_line("Lyrics/cover art"), "info")
+        return self.tagged, self.failed
@@ -0,0 +1,224 @@
+"""Background transcode stage: ffmpeg encodes finished downloads while later items download.
+
+yt-dlp runs ``FFmpegExtractAudio`` and its MP4 remux inline, so the connection sits
+idle while each file converts. Jobs that use this stage drop those postprocessors. Each
+raw file is queued here when yt-dlp moves it to its final folder, and a bounded pool
+runs one ffmpeg process per file, sized to the CPU cores by default. ``on_done`` then
+receives the encoded file (e.g. for tagging).
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Optional
+
+LogFn = Callable[[str, str], None]
+DoneFn = Callable[[Path, dict], None]
+Runner = Callable[[list], "subprocess.CompletedProcess"]
+# (info, allow_copy) -> (ffmpeg output args, stream copy?)
+Planner = Callable[[dict, bool], "tuple[list, bool]"]
+
+# Codecs stream-copied into MP4. VP9/AV1 video and Opus audio are re-encoded, since many
+# players refuse them in an MP4 container.
+MP4_VIDEO_CODECS = ("avc1", "avc3", "h264", "hev1", "hvc1", "hevc", "h265")
+MP4_AUDIO_CODECS = ("mp4a", "aac", "mp3")
+
+
+def default_workers() -> int:
+    return max(1, os.cpu_count() or 1)
+
+
+def mp3_args(bitrate: str) -> list[str]:
+    """ffmpeg output arguments equivalent to yt-dlp's ``FFmpegExtractAudio`` MP3 settings."""
+    return ["-vn", "-codec:a", "libmp3lame", "-b:a", f"{bitrate}k"]
+
+
+def codec_name(value) -> str:
+    """``avc1.640028`` -> ``avc1``; missing -> empty string (unknown)."""
+    return str(value or "").split(".")[0].strip().lower()
+
+
+def mp4_plan(info: dict, allow_copy: bool = True):
+    """Stream-copy H.264/HEVC video and AAC/MP3 audio into MP4; re-encode any other stream."""
+    vcodec, acodec = codec_name(info.get("vcodec")), codec_name(info.get("acodec"))
+    video_ok = allow_copy and (vcodec in MP4_VIDEO_CODECS or vcodec == "none")
+    audio_ok = allow_copy and (acodec in MP4_AUDIO_CODECS or acodec == "none")
+    if video_ok and audio_ok:
+        return ["-map", "0", "-c", "copy", "-movflags", "+faststart"], True
+    args = ["-c:v", "copy" if video_ok else "libx264", "-c:a", "copy" if audio_ok else "aac", "-movflags", "+faststart"]
+    return args, False
+
+
+def _run_ffmpeg(cmd: list):
+    return subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+
+
+class TranscodeStage:
+    """Queue of finished raw downloads encoded to ``target_ext`` by a pool of ffmpeg processes.
+
+    Files that already have ``target_ext`` pass straight through to ``on_done``. A
+    ``planner`` may choose a stream copy instead of a re-encode per file. A failed copy
+    is retried as an encode. The encoded file replaces the raw one (``target_path``), so
+    callers can predict final paths before encoding finishes. ``close()`` waits and
+    returns ``(converted, failed)``.
+    """
+
+    def __init__(
+        self,
+        target_ext: str,
+        output_args: Optional[list] = None,
+        max_workers: Optional[int] = None,
+        on_done: Optional[DoneFn] = None,
+        log: Optional[LogFn] = None,
+        runner: Runner = _run_ffmpeg,
+        ffmpeg: str = "ffmpeg",
+        planner: Optional[Planner] = None,
+    ):
+        self.target_ext = "." + target_ext.lstrip(".").lower()
+        self.output_args = list(output_args or [])
+        self.planner = planner
+        self.on_done = on_done
+        self.log = log
+        self._runner = runner
+        self._ffmpeg = ffmpeg
+        self.workers = max(1, int(max_workers or default_workers()))
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="crystalmedia-ffmpeg")
+        self._lock = threading.Lock()
+        self._submitted: set[str] = set()
+        self._queued = 0
+        self.peak_queue = 0
+        self.encoded = 0
+        self.copied = 0
+        self.passed_through = 0
+        self.failed = 0
+        self.encode_seconds = 0.0
+        self.input_bytes = 0
+        self._first_submit: Optional[float] = None
+        self._last_done: Optional[float] = None
+
+    def target_path(self, path: Path) -> Path:
+        path = Path(path)
+        return path if path.suffix.lower() == self.target_ext else path.with_suffix(self.target_ext)
+
+    def submit(self, path: Path, info: dict) -> bool:
+        """Queue ``path`` once; returns False if it was already queued."""
+        path = Path(path)
+        key = os.path.normcase(str(path.resolve()))
+        with self._lock:
+            if key in self._submitted:
+                return False
+            self._submitted.add(key)
+            if path.suffix.lower() != self.target_ext:
+                self._queued += 1
+                self.peak_queue = max(self.peak_queue, self._queued)
+                if self._first_submit is None:
+                    self._first_submit = time.perf_counter()
+        if path.suffix.lower() == self.target_ext:
+            with self._lock:
+                self.passed_through += 1
+            self._finish(path, dict(info))
+            return True
+        self._pool.submit(self._encode_one, path, dict(info))
+        return True
+
+    def _encode_one(self, source: Path, info: dict):
+        target = self.target_path(source)
+        temp = target.with_name(f"{target.stem}.encoding{target.suffix}")
+        started = time.perf_counter()
+        try:
+            size = source.stat().st_size
+            args, copied = self.planner(info, True) if self.planner else (self.output_args, False)
+            result = self._ffmpeg_run(source, args, temp)
+            if result.returncode != 0 and copied:
+                args, copied = self.planner(info, False)
+                result = self._ffmpeg_run(source, args, temp)
+            if result.returncode != 0:
+                lines = (result.stderr or "").strip().splitlines()
+                raise RuntimeError(lines[-1] if lines else f"ffmpeg exited with {result.returncode}")
+            os.replace(temp, target)
+            source.unlink()
+        except Exception as e:
+            try:
+                temp.unlink()
+            except OSError:
+                pass
+            with self._lock:
+                self._queued -= 1
+                self.failed += 1
+            if self.log:
+                self.log(f"Transcode failed for {source.name}: {str(e)[:120]}", "warning")
+            return
+        with self._lock:
+            self._queued -= 1
+            if copied:
+                self.copied += 1
+            else:
+                self.encoded += 1
+            self.encode_seconds += time.perf_counter() - started
+            self.input_bytes += size
+            self._last_done = time.perf_counter()
+        self._finish(target, {**info, "filepath": str(target), "ext": self.target_ext[1:]})
+
+    def _ffmpeg_run(self, source: Path, args: list, output: Path):
+        return self._runner([self._ffmpeg, "-y", "-nostdin", "-loglevel", "error", "-i", str(source), *args, str(output)])
+
+    def _finish(self, path: Path, info: dict):
+        if self.on_done is None:
+            return
+        try:
+            self.on_done(path, info)
+        except Exception as e:
+            if self.log:
+                self.log(f"Post-transcode step failed for {path.name}: {str(e)[:120]}", "warning")
+
+    @property
+    def pending(self) -> int:
+        with self._lock:
+            return self._queued
+
+    def postprocessor_hook(self, d: dict):
+        """yt-dlp ``postprocessor_hooks`` entry: queue each file once it reaches its final folder."""
+        if d.get("status") != "finished" or d.get("postprocessor") != "MoveFiles":
+            return
+        info = d.get("info_dict") or {}
+        filepath = info.get("filepath")
+        if not filepath:
+            return
+        final_dir = info.get("__finaldir")
+        self.submit(Path(final_dir) / Path(filepath).name if final_dir else Path(filepath), info)
+
+    def retarget(self, entry: dict) -> dict:
+        """Point a downloaded entry's file paths at the encoded output."""
+        for item in entry.get("requested_downloads") or []:
+            if isinstance(item, dict) and item.get("filepath"):
+                item["filepath"] = str(self.target_path(item["filepath"]))
+        if entry.get("filepath"):
+            entry["filepath"] = str(self.target_path(entry["filepath"]))
+        return entry
+
+    def close(self, wait: bool = True):
+        self._pool.shutdown(wait=wait)
+        return self.encoded + self.copied, self.failed
+
+    @property
+    def fast_path(self) -> int:
+        """Files that needed no re-encode (stream copy or already in the target format)."""
+        with self._lock:
+            return self.copied + self.passed_through
+
+    def stats_line(self) -> str:
+        with self._lock:
+            wall = (self._last_done - self._first_submit) if self._first_submit and self._last_done else 0.0
+            converted = self.encoded + self.copied
+            average = self.encode_seconds / converted if converted else 0.0
+            rate = self.input_bytes / 1e6 / wall if wall > 0 else 0.0
+            return (
+                f"Transcode: {self.encoded} re-encoded, {self.copied + self.passed_through} fast path "
+                f"({self.copied} stream copy, {self.passed_through} already {self.target_ext[1:]}), {self.failed} failed "
+                f"on {self.workers} worker(s); avg {average:.1f}s per file, peak queue {self.peak_queue}, {rate:.2f} MB/s in"
+            )
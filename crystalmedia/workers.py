@@ -0,0 +1,89 @@
+"""Bounded worker pool helpers for playlist-sized download jobs."""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterable, Optional
+
+
+class WorkerLocal:
+    """Lazily builds one resource per worker thread and closes them all on shutdown."""
+
+    def __init__(self, factory: Callable[[], Any], closer: Optional[Callable[[Any], None]] = None):
+        self._factory = factory
+        self._closer = closer
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._created: list[Any] = []
+
+    def get(self):
+        resource = getattr(self._local, "resource", None)
+        if resource is None:
+            resource = self._factory()
+            self._local.resource = resource
+            with self._lock:
+                self._created.append(resource)
+        return resource
+
+    @property
+    def created_count(self) -> int:
+        with self._lock:
+            return len(self._created)
+
+    def close_all(self):
+        with self._lock:
+            created, self._created = self._created, []
+        if self._closer is None:
+            return
+        for resource in created:
+            try:
+                self._closer(resource)
+            except Exception:
+                pass
+
+
+def run_bounded(
+    items: Iterable,
+    task: Callable[[int, Any], Any],
+    max_workers: int,
+    on_done: Optional[Callable[[int, Any, Any, Optional[BaseException]], None]] = None,
+):
+    """Run ``task(index, item)`` over ``items`` with at most ``max_workers`` tasks in flight.
+
+    ``items`` is consumed lazily, so generators that are still discovering work can feed
+    the pool. ``on_done(index, item, result, error)`` runs in the caller thread as each
+    task finishes. Returns the number of tasks executed.
+    """
+    max_workers = max(1, int(max_workers))
+    iterator = iter(enumerate(items, start=1))
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="crystalmedia-worker")
+    in_flight = {}
+    executed = 0
+
+    def _fill():
+        while len(in_flight) < max_workers:
+            try:
+                index, item = next(iterator)
+            except StopIteration:
+                return
+            in_flight[executor.submit(task, index, item)] = (index, item)
+
+    try:
+        _fill()
+        while in_flight:
+            finished, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+            for future in finished:
+                index, item = in_flight.pop(future)
+                executed += 1
+                error = future.exception()
+                result = None if error is not None else future.result()
+                if on_done is not None:
+                    on_done(index, item, result, error)
+            _fill()
+    finally:
+        for future in in_flight:
+            future.cancel()
+        executor.shutdown(wait=not in_flight)
+    return executed
+
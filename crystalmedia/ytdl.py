@@ -0,0 +1,69 @@
+"""Job-scoped YoutubeDL reuse: keep one warm instance until its options actually change."""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Callable, Optional
+
+
+def options_fingerprint(value) -> Any:
+    """Hashable snapshot of yt-dlp options; callables and other objects compare by identity."""
+    if isinstance(value, dict):
+        return tuple(sorted((str(key), options_fingerprint(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(options_fingerprint(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(repr(item) for item in value))
+    if value is None or isinstance(value, (str, int, float, bool, bytes)):
+        return value
+    return ("obj", id(value))
+
+
+def _close_ydl(downloader):
+    downloader.__exit__(None, None, None)
+
+
+class YtdlSession:
+    """Hands out a YoutubeDL for the given options, rebuilding only when they differ.
+
+    Constructing YoutubeDL loads every extractor class, sets up postprocessors and reads
+    the cookie jar; retries and per-item loops that keep the same options reuse the
+    instance instead. Changing e.g. the User-Agent, ``js_runtimes`` or
+    ``cookiesfrombrowser`` yields a fresh one. Call ``close()`` when the job ends.
+    """
+
+    def __init__(self, factory: Callable[[dict], Any], closer: Optional[Callable[[Any], None]] = _close_ydl):
+        self._factory = factory
+        self._closer = closer
+        self._downloader = None
+        self._fingerprint = None
+        self.builds = 0
+        self.reuses = 0
+        self.build_seconds = 0.0
+
+    def get(self, options: dict):
+        fingerprint = options_fingerprint(options)
+        if self._downloader is not None and fingerprint == self._fingerprint:
+            self.reuses += 1
+            return self._downloader
+        self.close()
+        snapshot = dict(options)
+        if isinstance(snapshot.get("http_headers"), dict):
+            snapshot["http_headers"] = dict(snapshot["http_headers"])
+        started = time.perf_counter()
+        self._downloader = self._factory(snapshot)
+        self.build_seconds += time.perf_counter() - started
+        self._fingerprint = fingerprint
+        self.builds += 1
+        return self._downloader
+
+    def close(self):
+        downloader, self._downloader, self._fingerprint = self._downloader, None, None
+        if downloader is not None and self._closer is not None:
+            try:
+                self._closer(downloader)
+            except Exception:
+                pass
+
+    def stats_line(self) -> str:
+        return f"yt-dlp instances: {self.builds} built ({self.build_seconds:.2f}s), {self.reuses} reused"
@@ -0,0 +1,84 @@
+"""Micro-benchmark: track-id extraction over the saved Spotify page fixture.
+
+Run with ``python tests/bench_spotify_page.py``. The fixture is repeated to build
+multi-megabyte pages (with fresh ids per copy) and the single-pass scanner is timed
+against the previous eight-pass ``re.findall`` + list-membership approach.
+"""
+
+from __future__ import annotations
+
+import random
+import re
+import string
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from crystalmedia.spotify import iter_page_track_ids  # noqa: E402
+
+FIXTURE = Path(__file__).parent / "fixtures" / "spotify_playlist_page.html"
+LEGACY_PATTERNS = [
+    r'/track/([A-Za-z0-9]{22})',
+    r'\/track\/([A-Za-z0-9]{22})',
+    r'open\.spotify\.com/track/([A-Za-z0-9]{22})',
+    r'spotify:track:([A-Za-z0-9]{22})',
+    r'spotify%3Atrack%3A([A-Za-z0-9]{22})',
+    r'spotify%253Atrack%253A([A-Za-z0-9]{22})',
+    r'"uri"\s*:\s*"spotify:track:([A-Za-z0-9]{22})"',
+    r'"entityUri"\s*:\s*"spotify:track:([A-Za-z0-9]{22})"',
+]
+
+
+def legacy_extract(page: str) -> list[str]:
+    track_ids = []
+    for pattern in LEGACY_PATTERNS:
+        for tid in re.findall(pattern, page):
+            if tid not in track_ids:
+                track_ids.append(tid)
+    match = re.search(r'<script[^>]*id="__NEXT_DATA__"[^>]*>(.*?)</script>', page, flags=re.S)
+    if match:
+        for tid in re.findall(r'"spotify:track:([A-Za-z0-9]{22})"', match.group(1)):
+            if tid not in track_ids:
+                track_ids.append(tid)
+    return track_ids
+
+
+def build_page(base: str, copies: int) -> str:
+    ids = sorted(set(re.findall(r"[A-Za-z0-9]{22}", base)))
+    rng = random.Random(copies)
+    alphabet = string.ascii_letters + string.digits
+    parts = []
+    for _ in range(copies):
+        chunk = base
+        for tid in ids:
+            chunk = chunk.replace(tid, "".join(rng.choice(alphabet) for _ in range(22)))
+        parts.append(chunk)
+    return "".join(parts)
+
+
+def best_of(fn, page: str, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(page)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> int:
+    base = FIXTURE.read_text(encoding="utf-8")
+    print(f"{'copies':>6} {'size':>9} {'ids':>6} {'single-pass':>12} {'legacy':>10}")
+    for copies in (1, 10, 50, 200):
+        page = build_page(base, copies)
+        ids = list(iter_page_track_ids(page))
+        assert set(ids) == set(legacy_extract(page))
+        single = best_of(lambda p: list(iter_page_track_ids(p)), page)
+        legacy = best_of(legacy_extract, page, repeat=1)
+        print(f"{copies:>6} {len(page) / 1024:>7.0f}KB {len(ids):>6} {single * 1000:>10.2f}ms {legacy * 1000:>8.1f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
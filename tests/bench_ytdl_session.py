@@ -0,0 +1,67 @@
+"""Micro-benchmark: per-item YoutubeDL overhead with and without ``YtdlSession`` reuse.
+
+Run with ``python tests/bench_ytdl_session.py [items]`` (needs yt-dlp installed). Both
+loops do the same offline work per item (build or fetch the instance, then resolve the
+extractor for a watch URL), so the difference is the construction/teardown cost that
+retries and per-query loops used to pay every time.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from yt_dlp import YoutubeDL  # noqa: E402
+
+from crystalmedia.ytdl import YtdlSession  # noqa: E402
+
+URL = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+OPTIONS = {
+    "quiet": True,
+    "no_warnings": True,
+    "noprogress": True,
+    "format": "bestaudio/best",
+    "outtmpl": "%(title)s.%(ext)s",
+    "postprocessors": [{"key": "FFmpegExtractAudio", "preferredcodec": "mp3", "preferredquality": "192"}],
+    "http_headers": {"User-Agent": "Mozilla/5.0"},
+}
+
+
+def per_item(ydl):
+    return next(ie for ie in ydl._ies.values() if ie.suitable(URL))
+
+
+def fresh_each_time(items: int) -> float:
+    started = time.perf_counter()
+    for _ in range(items):
+        with YoutubeDL(dict(OPTIONS)) as ydl:
+            per_item(ydl)
+    return time.perf_counter() - started
+
+
+def with_session(items: int) -> float:
+    session = YtdlSession(YoutubeDL)
+    started = time.perf_counter()
+    for _ in range(items):
+        per_item(session.get(OPTIONS))
+    session.close()
+    return time.perf_counter() - started
+
+
+def main() -> int:
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    with YoutubeDL({"quiet": True}):
+        pass  # warm imports so both loops start equal
+    before = fresh_each_time(items)
+    after = with_session(items)
+    print(f"items: {items}")
+    print(f"new YoutubeDL per item : {before * 1000 / items:8.2f} ms/item ({before:.2f}s total)")
+    print(f"YtdlSession reuse      : {after * 1000 / items:8.2f} ms/item ({after:.2f}s total)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
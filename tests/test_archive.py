@@ -0,0 +1,54 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from crystalmedia import archive
+
+
+class TestDownloadArchive(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.index = self.root / "archive.jsonl"
+        self.media = self.root / "song.mp3"
+        self.media.write_bytes(b"ID3" + b"\x00" * 64)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_record_and_lookup_survive_reload(self):
+        keys = [archive.spotify_track_key("4uLU6hMCjMI75M1A2tKUQC"), archive.query_key("Song  Artist")]
+        archive.DownloadArchive(self.index).record(keys, self.media, title="Song")
+        reloaded = archive.DownloadArchive(self.index)
+        record = reloaded.find([archive.query_key("song artist")])
+        self.assertIsNotNone(record)
+        self.assertEqual(record["path"], str(self.media.resolve()))
+        self.assertEqual(record["sha256"], archive.file_sha256(self.media))
+
+    def test_missing_or_changed_file_is_not_complete(self):
+        key = archive.youtube_key("dQw4w9WgXcQ", "audio")
+        store = archive.DownloadArchive(self.index)
+        store.record([key], self.media)
+        self.media.write_bytes(b"different length")
+        self.assertIsNone(archive.DownloadArchive(self.index).lookup(key))
+        self.media.unlink()
+        self.assertIsNone(archive.DownloadArchive(self.index).lookup(key))
+
+    def test_match_filter_skips_archived_ids_only(self):
+        store = archive.DownloadArchive(self.index)
+        store.record([archive.youtube_key("aaaaaaaaaaa", "audio")], self.media)
+        audio_filter = store.youtube_match_filter("audio")
+        video_filter = store.youtube_match_filter("video")
+        self.assertIsNotNone(audio_filter({"id": "aaaaaaaaaaa"}, incomplete=True))
+        self.assertIsNone(audio_filter({"id": "bbbbbbbbbbb"}, incomplete=True))
+        self.assertIsNone(video_filter({"id": "aaaaaaaaaaa"}, incomplete=True))
+
+    def test_id_helpers(self):
+        self.assertEqual(archive.youtube_video_id("https://youtu.be/dQw4w9WgXcQ"), "dQw4w9WgXcQ")
+        self.assertIsNone(archive.youtube_video_id("https://example.com/"))
+        self.assertEqual(archive.spotify_track_id("https://open.spotify.com/track/4uLU6hMCjMI75M1A2tKUQC?si=x"), "4uLU6hMCjMI75M1A2tKUQC")
+        self.assertEqual(archive.normalize_query("  Song   ARTIST "), "song artist")
+
+
+if __name__ == "__main__":
+    unittest.main()
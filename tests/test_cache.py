@@ -0,0 +1,98 @@
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from crystalmedia import cache
+
+
+class TestDiskCache(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "cache.sqlite3"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_json_roundtrip_and_hit_counters(self):
+        store = cache.DiskCache(self.path)
+        self.assertIsNone(store.get_json("k"))
+        store.put_json("k", {"title": "Song", "entries": [1, 2]})
+        self.assertEqual(store.get_json("k"), {"title": "Song", "entries": [1, 2]})
+        self.assertEqual((store.hits, store.misses), (1, 1))
+        store.close()
+
+    def test_expired_entries_are_misses(self):
+        store = cache.DiskCache(self.path)
+        store.put("k", b"value", ttl=0.01)
+        time.sleep(0.02)
+        self.assertIsNone(store.get("k"))
+        store.close()
+
+    def test_lru_eviction_by_size(self):
+        store = cache.DiskCache(self.path, max_bytes=250)
+        store.put("a", b"a" * 100)
+        store.put("b", b"b" * 100)
+        time.sleep(0.01)
+        self.assertIsNotNone(store.get("a"))
+        store.put("c", b"c" * 100)
+        self.assertIsNotNone(store.get("a"))
+        self.assertIsNone(store.get("b"))
+        self.assertIsNotNone(store.get("c"))
+        self.assertLessEqual(store.total_bytes(), 250)
+        store.close()
+
+    def test_zero_ttl_disables_cache(self):
+        store = cache.DiskCache(self.path, default_ttl=0)
+        store.put("k", b"v")
+        self.assertIsNone(store.get("k"))
+        store.close()
+
+    def test_entries_survive_reopen(self):
+        store = cache.DiskCache(self.path)
+        store.put_json("k", {"id": "x"})
+        store.close()
+        reopened = cache.DiskCache(self.path)
+        self.assertEqual(reopened.get_json("k"), {"id": "x"})
+        reopened.close()
+
+
+class TestInfoCacheHelpers(unittest.TestCase):
+    def test_info_cache_key_variants(self):
+        self.assertEqual(cache.info_cache_key("https://www.youtube.com/watch?v=dQw4w9WgXcQ"), "yt:video:dQw4w9WgXcQ")
+        self.assertEqual(cache.info_cache_key("https://youtu.be/dQw4w9WgXcQ?t=3"), "yt:video:dQw4w9WgXcQ")
+        self.assertEqual(cache.info_cache_key("https://www.youtube.com/playlist?list=PLabc_123"), "yt:playlist:PLabc_123")
+        self.assertEqual(cache.info_cache_key("https://www.youtube.com/watch?v=dQw4w9WgXcQ&list=PLx"), "yt:playlist:PLx")
+
+    def test_info_cache_key_variant_keeps_modes_apart(self):
+        url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+        self.assertEqual(cache.info_cache_key(url, "audio:full"), "yt:video:dQw4w9WgXcQ:audio:full")
+        self.assertNotEqual(cache.info_cache_key(url, "audio:full"), cache.info_cache_key(url, "video:full"))
+
+    def test_strip_selection_drops_chosen_formats(self):
+        info = {
+            "id": "x",
+            "title": "T",
+            "formats": [{"format_id": "140", "url": "https://a"}],
+            "format_id": "137+140",
+            "url": "https://v",
+            "requested_formats": [{"format_id": "137"}, {"format_id": "140"}],
+            "requested_downloads": [{"filepath": "/tmp/x.mp4"}],
+            "__finaldir": "/tmp",
+            "entries": [{"_type": "url", "url": "https://www.youtube.com/watch?v=a"}, {"id": "b", "format_id": "18"}],
+        }
+        cleaned = cache.strip_selection(info)
+        self.assertEqual(set(cleaned), {"id", "title", "formats", "entries"})
+        self.assertEqual(cleaned["formats"], info["formats"])
+        self.assertEqual(cleaned["entries"], [{"_type": "url", "url": "https://www.youtube.com/watch?v=a"}, {"id": "b"}])
+        self.assertIn("requested_formats", info)
+
+    def test_info_ttl_respects_stream_expiry(self):
+        now = 1_700_000_000
+        info = {"entries": [{"formats": [{"url": f"https://r1.googlevideo.com/videoplayback?expire={now + 1000}&x=1"}]}]}
+        self.assertEqual(cache.info_ttl(info, 3600, now=now, margin=100), 900)
+        self.assertEqual(cache.info_ttl({"formats": []}, 3600, now=now), 3600)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import sys
+import tempfile
+import types
+import unittest
+from pathlib import Path
+
+from crystalmedia import cli
+
+
+class TestCli(unittest.TestCase):
+    def _fake_app(self, results):
+        calls = []
+        app = types.ModuleType("CrystalMedia")
+
+        def download_youtube(url, content_type, is_playlist, **kwargs):
+            calls.append(("youtube", url, content_type, is_playlist, kwargs))
+            return results.get(url, True)
+
+        def download_spotify(url, is_playlist, **kwargs):
+            calls.append(("spotify", url, is_playlist, kwargs))
+            return results.get(url, True)
+
+        def resume_job(header):
+            calls.append(("resume", header["url"]))
+            return results.get(header["url"], True)
+
+        def benchmark_fragments(url, content_type, counts, ratelimit=None):
+            calls.append(("benchmark", url, content_type, counts, ratelimit))
+            return [{"fragments": n, "bytes": 10_000_000, "seconds": 2.0 / n, "mb_per_second": 5.0 * n, "error": None} for n in counts]
+
+        app.download_youtube = download_youtube
+        app.benchmark_fragments = benchmark_fragments
+        app.download_spotify = download_spotify
+        app.resume_job = resume_job
+        app.unfinished_jobs = lambda: [{"kind": "youtube", "url": "https://p1"}, {"kind": "spotify", "url": "https://p2"}]
+        app.log_runtime = lambda _msg: None
+        app.startup = lambda **kwargs: calls.append(("startup", kwargs))
+        app.main_loop = lambda **kwargs: calls.append(("main_loop", kwargs))
+        return app, calls
+
+    def _run(self, argv, results=None):
+        app, calls = self._fake_app(results or {})
+        original = sys.modules.get("CrystalMedia")
+        sys.modules["CrystalMedia"] = app
+        try:
+            code = cli.main(argv)
+        finally:
+            if original is None:
+                sys.modules.pop("CrystalMedia", None)
+            else:
+                sys.modules["CrystalMedia"] = original
+        return code, calls
+
+    def test_read_url_file_skips_comments_and_blanks(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "urls.txt"
+            path.write_text("# jobs\nhttps://a\n\nhttps://b  # trailing\n", encoding="utf-8")
+            self.assertEqual(cli.read_url_file(path), ["https://a", "https://b"])
+
+    def test_youtube_audio_options_are_forwarded(self):
+        code, calls = self._run(["--mode", "youtube-audio", "--bitrate", "320", "--embed-extras", "--js-runtime", "deno", "https://y"])
+        self.assertEqual(code, cli.EXIT_OK)
+        self.assertEqual(calls[0], ("startup", {"fast": True, "headless": True}))
+        kind, url, content_type, is_playlist, kwargs = calls[1]
+        self.assertEqual((kind, url, content_type, is_playlist), ("youtube", "https://y", "audio", False))
+        self.assertEqual(kwargs["bitrate"], "320")
+        self.assertTrue(kwargs["embed_extras"])
+        self.assertEqual(kwargs["js_runtime"], "deno")
+
+    def test_fragment_options_are_forwarded(self):
+        code, calls = self._run(["--mode", "youtube-video", "--fragments", "6", "--limit-rate", "4M", "--pacing", "stealth", "https://y"])
+        self.assertEqual(code, cli.EXIT_OK)
+        kwargs = calls[1][4]
+        self.assertEqual((kwargs["fragments"], kwargs["ratelimit"], kwargs["pacing"]), (6, "4M", "stealth"))
+
+    def test_benchmark_runs_each_fragment_count(self):
+        code, calls = self._run(["--mode", "youtube-video", "--benchmark-fragments", "1,4", "https://y"])
+        self.assertEqual(code, cli.EXIT_OK)
+        self.assertEqual(calls[1], ("benchmark", "https://y", "video", [1, 4], None))
+
+    def test_invalid_rate_is_usage_error(self):
+        with self.assertRaises(SystemExit) as ctx:
+            cli.main(["--mode", "youtube-video", "--limit-rate", "fast", "https://y"])
+        self.assertEqual(ctx.exception.code, cli.EXIT_USAGE)
+
+    def test_failed_job_sets_exit_status(self):
+        code, calls = self._run(["--mode", "spotify", "--playlist", "https://s1", "https://s2"], {"https://s2": False})
+        self.assertEqual(code, cli.EXIT_FAILED)
+        self.assertEqual([c[1] for c in calls[1:]], ["https://s1", "https://s2"])
+
+    def test_resume_continues_every_unfinished_job(self):
+        code, calls = self._run(["--resume"], {"https://p2": False})
+        self.assertEqual(code, cli.EXIT_FAILED)
+        self.assertEqual(calls[1:], [("resume", "https://p1"), ("resume", "https://p2")])
+
+    def test_resume_with_urls_is_usage_error(self):
+        with self.assertRaises(SystemExit) as ctx:
+            cli.main(["--resume", "https://y"])
+        self.assertEqual(ctx.exception.code, cli.EXIT_USAGE)
+
+    def test_no_mode_starts_the_tui_through_run(self):
+        code, calls = self._run(["--fast-start"])
+        self.assertEqual((code, calls), (cli.EXIT_OK, [("main_loop", {"fast_start": True})]))
+
+    def test_urls_without_mode_is_usage_error(self):
+        with self.assertRaises(SystemExit) as ctx:
+            cli.main(["https://y"])
+        self.assertEqual(ctx.exception.code, cli.EXIT_USAGE)
+
+    def test_mode_without_urls_is_usage_error(self):
+        with self.assertRaises(SystemExit) as ctx:
+            cli.main(["--mode", "youtube-video"])
+        self.assertEqual(ctx.exception.code, cli.EXIT_USAGE)
+
+
+if __name__ == "__main__":
+    unittest.main()
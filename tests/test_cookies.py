@@ -0,0 +1,52 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from crystalmedia.cache import DiskCache
+from crystalmedia.cookies import CookieSourceMemo, source_label
+
+CHROME = ("chrome", None, "Default", None)
+FIREFOX = ("firefox", None, None, None)
+
+
+class TestCookieSourceMemo(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "cookie_source.sqlite3"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_remembered_source_survives_restart(self):
+        store = DiskCache(self.path, default_ttl=3600)
+        memo = CookieSourceMemo(store, ttl=3600)
+        self.assertIsNone(memo.known())
+        jar = object()
+        memo.remember(CHROME, jar)
+        self.assertIs(memo.jar(CHROME), jar)
+        self.assertIsNone(memo.jar(FIREFOX))
+        store.close()
+
+        store = DiskCache(self.path, default_ttl=3600)
+        fresh = CookieSourceMemo(store, ttl=3600)
+        self.assertEqual(fresh.known(), CHROME)
+        self.assertIsNone(fresh.jar(CHROME))
+        fresh.forget()
+        self.assertIsNone(CookieSourceMemo(store, ttl=3600).known())
+        store.close()
+
+    def test_zero_ttl_keeps_memo_in_memory_only(self):
+        store = DiskCache(self.path, default_ttl=0)
+        memo = CookieSourceMemo(store, ttl=0)
+        memo.remember(FIREFOX)
+        self.assertEqual(memo.known(), FIREFOX)
+        self.assertIsNone(CookieSourceMemo(store, ttl=0).known())
+        store.close()
+
+    def test_label(self):
+        self.assertEqual(source_label(CHROME), "chrome:Default")
+        self.assertEqual(source_label(FIREFOX), "firefox")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,189 @@
+import json
+import tempfile
+import threading
+import unittest
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+from crystalmedia.daemon import JobQueue, make_server, validate_submission
+from crystalmedia.jobs import CANCELLED, DONE, FAILED, PENDING, RUNNING, JobManifest
+
+
+class BlockingRunner:
+    """Runner that holds each job until released (or cancelled) and records what it ran."""
+
+    def __init__(self, result=True):
+        self.result = result
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.ran = []
+
+    def __call__(self, job, cancel):
+        self.ran.append(job["url"])
+        self.started.set()
+        while not self.release.is_set() and not cancel.is_set():
+            cancel.wait(0.01)
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+def _wait_for(predicate, timeout=5.0):
+    event = threading.Event()
+    for _ in range(int(timeout / 0.01)):
+        if predicate():
+            return True
+        event.wait(0.01)
+    return predicate()
+
+
+class TestValidateSubmission(unittest.TestCase):
+    def test_defaults_fill_in_non_interactive_options(self):
+        fields = validate_submission({"url": " https://youtu.be/x ", "mode": "youtube-audio"})
+        self.assertEqual(fields["url"], "https://youtu.be/x")
+        self.assertFalse(fields["playlist"])
+        self.assertEqual(fields["options"]["bitrate"], "192")
+        self.assertEqual(fields["options"]["js_runtime"], "auto")
+
+    def test_null_options_fall_back_to_defaults(self):
+        fields = validate_submission({"url": "u", "mode": "youtube-video", "options": {"quality": None, "js_runtime": None}})
+        self.assertEqual(fields["options"]["quality"], "best")
+        self.assertEqual(fields["options"]["js_runtime"], "auto")
+
+    def test_rejects_bad_input(self):
+        for payload in (
+            [],
+            {"mode": "youtube-audio"},
+            {"url": "u", "mode": "vimeo"},
+            {"url": "u", "mode": "spotify", "playlist": "yes"},
+            {"url": "u", "mode": "spotify", "options": {"bitrate": "1000"}},
+            {"url": "u", "mode": "spotify", "options": {"workers": 0}},
+            {"url": "u", "mode": "spotify", "options": {"shell": "rm"}},
+            {"url": "u", "mode": "youtube-audio", "options": {"ratelimit": "fast"}},
+        ):
+            with self.assertRaises(ValueError, msg=payload):
+                validate_submission(payload)
+
+
+class TestJobQueue(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "queue.jsonl"
+        self.queues = []
+
+    def tearDown(self):
+        for queue in self.queues:
+            queue.runner.release.set()
+            queue.stop(timeout=5)
+        self._tmp.cleanup()
+
+    def _queue(self, runner, workers=1):
+        queue = JobQueue(self.path, runner, workers=workers)
+        self.queues.append(queue)
+        return queue
+
+    def _status(self, queue, key):
+        return queue.get(key)["status"]
+
+    def test_runs_jobs_in_order_and_records_outcome(self):
+        runner = BlockingRunner()
+        runner.release.set()
+        queue = self._queue(runner)
+        first = queue.submit("https://a", "youtube-audio")
+        second = queue.submit("https://b", "spotify")
+        queue.start()
+        self.assertTrue(_wait_for(lambda: self._status(queue, second["key"]) == DONE))
+        self.assertEqual(runner.ran, ["https://a", "https://b"])
+        self.assertEqual(self._status(queue, first["key"]), DONE)
+
+    def test_runner_errors_mark_the_job_failed(self):
+        runner = BlockingRunner(result=RuntimeError("boom"))
+        runner.release.set()
+        queue = self._queue(runner)
+        job = queue.submit("https://a", "youtube-audio")
+        queue.start()
+        self.assertTrue(_wait_for(lambda: self._status(queue, job["key"]) == FAILED))
+        self.assertEqual(queue.get(job["key"])["error"], "boom")
+
+    def test_cancel_pending_and_running_jobs(self):
+        runner = BlockingRunner()
+        queue = self._queue(runner)
+        running = queue.submit("https://a", "youtube-audio")
+        waiting = queue.submit("https://b", "youtube-audio")
+        queue.start()
+        self.assertTrue(runner.started.wait(5))
+        queue.cancel(waiting["key"])
+        self.assertEqual(self._status(queue, waiting["key"]), CANCELLED)
+        queue.cancel(running["key"])
+        self.assertTrue(_wait_for(lambda: self._status(queue, running["key"]) == CANCELLED))
+        self.assertEqual(runner.ran, ["https://a"])
+        self.assertIsNone(queue.cancel("missing"))
+
+    def test_queue_persists_and_requeues_interrupted_jobs(self):
+        runner = BlockingRunner()
+        queue = self._queue(runner)
+        job = queue.submit("https://a", "youtube-video", playlist=True, options={"quality": "high"})
+        queue.start()
+        self.assertTrue(runner.started.wait(5))
+        queue.stop(timeout=5)
+        self.assertEqual(JobManifest(self.path).entries[job["key"]]["status"], PENDING)
+
+        # A crash leaves the job marked running; the next start queues it again.
+        JobManifest(self.path).update(job["key"], status=RUNNING)
+        restarted = self._queue(BlockingRunner())
+        reloaded = restarted.get(job["key"])
+        self.assertEqual(reloaded["status"], PENDING)
+        self.assertEqual(reloaded["options"], {"quality": "high"})
+        self.assertTrue(reloaded["playlist"])
+
+
+class TestHttpApi(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.runner = BlockingRunner()
+        self.queue = JobQueue(Path(self._tmp.name) / "queue.jsonl", self.runner, progress=lambda job: {"done": 0})
+        self.server = make_server(self.queue, "127.0.0.1", 0)
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.runner.release.set()
+        self.queue.stop(timeout=5)
+        self._tmp.cleanup()
+
+    def _request(self, method, path, payload=None):
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        request = urllib.request.Request(self.base + path, data=data, method=method, headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=5) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read())
+
+    def test_submit_list_get_and_cancel(self):
+        status, job = self._request("POST", "/jobs", {"url": "https://youtu.be/x", "mode": "youtube-audio", "playlist": True})
+        self.assertEqual(status, 201)
+        self.assertEqual(job["status"], PENDING)
+
+        status, listing = self._request("GET", "/jobs")
+        self.assertEqual([item["key"] for item in listing["jobs"]], [job["key"]])
+
+        status, detail = self._request("GET", f"/jobs/{job['key']}")
+        self.assertEqual(detail["progress"], {"done": 0})
+
+        status, cancelled = self._request("POST", f"/jobs/{job['key']}/cancel")
+        self.assertEqual((status, cancelled["status"]), (202, CANCELLED))
+
+    def test_errors_are_json(self):
+        self.assertEqual(self._request("POST", "/jobs", {"url": "u", "mode": "nope"})[0], 400)
+        self.assertEqual(self._request("GET", "/jobs/missing")[0], 404)
+        self.assertEqual(self._request("DELETE", "/jobs/missing")[0], 404)
+        self.assertEqual(self._request("GET", "/health")[1]["status"], "ok")
+
+
+if __name__ == "__main__":
+    unittest.main()
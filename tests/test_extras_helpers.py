@@ -1,7 +1,42 @@
+import struct
+import tempfile
 import unittest
 from pathlib import Path
+from urllib.error import HTTPError
+
+from mutagen.flac import FLAC
+from mutagen.mp4 import MP4
+from mutagen.ogg import OggPage
+from mutagen.oggopus import OggOpus
 
 from crystalmedia import extras
+from crystalmedia.cache import DiskCache
+
+
+def _ogg_page(packet, sequence, position=0, first=False, last=False):
+    page = OggPage()
+    page.packets, page.serial, page.sequence, page.position, page.first, page.last = [packet], 1, sequence, position, first, last
+    return page.write()
+
+
+def _write_opus(path):
+    head = b"OpusHead" + bytes([1, 2]) + struct.pack("<HIhB", 312, 48000, 0, 0)
+    tags = b"OpusTags" + struct.pack("<I", 4) + b"test" + struct.pack("<I", 0)
+    path.write_bytes(_ogg_page(head, 0, first=True) + _ogg_page(tags, 1) + _ogg_page(b"\xf8\xff\xfe", 2, 960, last=True))
+
+
+def _write_flac(path):
+    streaminfo = struct.pack(">HH", 4096, 4096) + b"\x00" * 6 + (44100 << 44 | 1 << 41 | 15 << 36).to_bytes(8, "big") + b"\x00" * 16
+    path.write_bytes(b"fLaC" + bytes([0x80]) + len(streaminfo).to_bytes(3, "big") + streaminfo)
+
+
+def _atom(name, payload):
+    return struct.pack(">I", 8 + len(payload)) + name + payload
+
+
+def _write_m4a(path):
+    mvhd = _atom(b"mvhd", b"\x00" * 12 + struct.pack(">II", 1000, 0) + b"\x00\x01\x00\x00\x01\x00" + b"\x00" * 70 + struct.pack(">I", 2))
+    path.write_bytes(_atom(b"ftyp", b"M4A \x00\x00\x00\x00M4A isom") + _atom(b"moov", mvhd))
 
 
 class TestExtrasHelpers(unittest.TestCase):
@@ -29,6 +64,45 @@ class TestExtrasHelpers(unittest.TestCase):
         self.assertEqual(result["unsynced"], "line a\nline b")
         self.assertEqual(result["synced"], [(1000, "Hello"), (2500, "World")])
 
+    def test_fetch_lrclib_lyrics_uses_cache_and_negative_cache(self):
+        original = extras.http_get_json
+        calls = []
+        with tempfile.TemporaryDirectory() as tmp:
+            store = DiskCache(Path(tmp) / "extras.sqlite3")
+            try:
+                def fake_get(url, _agents):
+                    calls.append(url)
+                    if "Missing" in url:
+                        raise HTTPError(url, 404, "Not Found", None, None)
+                    return {"plainLyrics": "la", "syncedLyrics": "[00:01.00]La"}
+
+                extras.http_get_json = fake_get
+                first = extras.fetch_lrclib_lyrics("Song", "Artist", ["ua"], cache=store)
+                second = extras.fetch_lrclib_lyrics(" song ", "ARTIST", ["ua"], cache=store)
+                self.assertIsNone(extras.fetch_lrclib_lyrics("Missing", "Artist", ["ua"], cache=store))
+                self.assertIsNone(extras.fetch_lrclib_lyrics("Missing", "Artist", ["ua"], cache=store))
+            finally:
+                extras.http_get_json = original
+                store.close()
+
+        self.assertEqual(first, second)
+        self.assertEqual(second["synced"], [(1000, "La")])
+        self.assertEqual(len(calls), 2)
+
+    def test_fetch_image_bytes_cached_by_url(self):
+        original = extras.http_get_bytes
+        calls = []
+        with tempfile.TemporaryDirectory() as tmp:
+            store = DiskCache(Path(tmp) / "extras.sqlite3")
+            try:
+                extras.http_get_bytes = lambda url, _agents: calls.append(url) or b"cover"
+                self.assertEqual(extras.fetch_image_bytes("https://x/c.jpg", ["ua"], cache=store), b"cover")
+                self.assertEqual(extras.fetch_image_bytes("https://x/c.jpg", ["ua"], cache=store), b"cover")
+            finally:
+                extras.http_get_bytes = original
+                store.close()
+        self.assertEqual(calls, ["https://x/c.jpg"])
+
     def test_iter_downloaded_entries_nested(self):
         info = {
             "entries": [
@@ -54,5 +128,49 @@ class TestExtrasHelpers(unittest.TestCase):
         self.assertTrue(all({"x", "y", "z", "pz", "speed"}.issubset(star.keys()) for star in field._stars))
 
 
+
+class TestGenericTagger(unittest.TestCase):
+    INFO = {"title": "Song", "uploader": "Artist", "upload_date": "20200101"}
+    EXTRAS = {"lyrics": {"unsynced": "", "synced": [(61500, "hello")]}, "cover": (b"\x89PNG fake", "image/png")}
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_opus_gets_vorbis_comments_and_picture(self):
+        path = self.root / "a.opus"
+        _write_opus(path)
+        extras.write_audio_tags(path, self.INFO, True, ["ua"], extras=self.EXTRAS)
+        tags = OggOpus(path).tags
+        self.assertEqual((tags["title"], tags["artist"], tags["date"]), (["Song"], ["Artist"], ["2020"]))
+        self.assertEqual(tags["lyrics"], ["[01:01.50]hello"])
+        self.assertIn("metadata_block_picture", tags)
+
+    def test_flac_uses_native_picture_block(self):
+        path = self.root / "a.flac"
+        _write_flac(path)
+        extras.write_audio_tags(path, self.INFO, True, ["ua"], extras=self.EXTRAS)
+        audio = FLAC(path)
+        self.assertEqual(audio["album"], ["Single"])
+        self.assertEqual(audio.pictures[0].data, b"\x89PNG fake")
+
+    def test_m4a_gets_mp4_atoms(self):
+        path = self.root / "a.m4a"
+        _write_m4a(path)
+        extras.write_audio_tags(path, self.INFO, False, ["ua"], extras=self.EXTRAS)
+        tags = MP4(path).tags
+        self.assertEqual((tags["\xa9nam"], tags["\xa9ART"], tags["\xa9day"]), (["Song"], ["Artist"], ["2020"]))
+        self.assertNotIn("covr", tags)
+
+    def test_unknown_container_is_ignored(self):
+        path = self.root / "a.webm"
+        path.write_bytes(b"x")
+        extras.write_audio_tags(path, self.INFO, False, ["ua"])
+        self.assertEqual(path.read_bytes(), b"x")
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from crystalmedia.fragments import (
+    BALANCED,
+    THROUGHPUT,
+    ThroughputMeter,
+    apply_options,
+    fragment_concurrency,
+    fragment_options,
+    parse_rate,
+    sweep_stale_fragments,
+)
+
+
+class TestFragmentSettings(unittest.TestCase):
+    def test_parse_rate_units(self):
+        self.assertEqual(parse_rate("500K"), 500 * 1024)
+        self.assertEqual(parse_rate("1.5MiB/s"), int(1.5 * 1024 ** 2))
+        self.assertEqual(parse_rate("2048"), 2048)
+        self.assertIsNone(parse_rate("0"))
+        self.assertIsNone(parse_rate(None))
+        with self.assertRaises(ValueError):
+            parse_rate("fast")
+
+    def test_concurrency_per_profile(self):
+        self.assertEqual(fragment_concurrency(BALANCED, "video"), 1)
+        self.assertEqual(fragment_concurrency(THROUGHPUT, "video", budget=8), 8)
+        self.assertEqual(fragment_concurrency(THROUGHPUT, "video", parallel_downloads=3, budget=8), 2)
+        self.assertEqual(fragment_concurrency(THROUGHPUT, "audio", budget=8), 2)
+        self.assertEqual(fragment_concurrency(BALANCED, "video", requested=5), 5)
+
+    def test_options_split_the_rate_cap(self):
+        self.assertEqual(fragment_options(1), {"concurrent_fragments": 1, "keep_fragments": False})
+        options = fragment_options(4, ratelimit=4_000_000, parallel_downloads=2, dashy=True)
+        self.assertEqual(options["ratelimit"], 2_000_000)
+        self.assertEqual(options["extractor_args"], {"youtube": {"formats": ["dashy"]}})
+        self.assertNotIn("extractor_args", fragment_options(4))
+
+    def test_apply_merges_extractor_args(self):
+        options = {"format": "best", "extractor_args": {"youtube": {"player_client": ["web"]}, "generic": {"impersonate": ["chrome"]}}}
+        apply_options(options, fragment_options(4, dashy=True))
+        self.assertEqual(options["concurrent_fragments"], 4)
+        self.assertEqual(
+            options["extractor_args"],
+            {"youtube": {"player_client": ["web"], "formats": ["dashy"]}, "generic": {"impersonate": ["chrome"]}},
+        )
+
+
+class TestSweepAndMeter(unittest.TestCase):
+    def test_sweep_removes_only_stale_fragment_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            stale = root / "album" / "song.f137.mp4.part-Frag3"
+            stale.parent.mkdir()
+            stale.write_bytes(b"x" * 10)
+            fresh = root / "other.f137.mp4.part-Frag1"
+            fresh.write_bytes(b"y")
+            kept = root / "song.mp4"
+            kept.write_bytes(b"z")
+            for path in (stale, kept):
+                os.utime(path, (1000, 1000))
+            self.assertEqual(sweep_stale_fragments(root, max_age=3600), (1, 10))
+            self.assertFalse(stale.exists())
+            self.assertTrue(fresh.exists() and kept.exists())
+
+    def test_meter_sums_files_and_reports_rate(self):
+        now = [0.0]
+        meter = ThroughputMeter(clock=lambda: now[0])
+        meter.observe({"status": "downloading", "tmpfilename": "a.part", "downloaded_bytes": 1_000_000, "elapsed": 1.0})
+        now[0] = 1.0
+        meter.observe({"status": "downloading", "tmpfilename": "b.part", "downloaded_bytes": 500_000})
+        now[0] = 3.0
+        meter.observe({"status": "finished", "filename": "a.part", "tmpfilename": "a.part", "total_bytes": 3_000_000})
+        self.assertEqual(meter.total_bytes, 3_500_000)
+        self.assertAlmostEqual(meter.seconds, 4.0)
+        self.assertAlmostEqual(meter.mb_per_second(), 0.875)
+
+
+if __name__ == "__main__":
+    unittest.main()
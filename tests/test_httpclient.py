@@ -0,0 +1,104 @@
+import gzip
+import json
+import os
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from urllib.error import HTTPError
+
+from crystalmedia import httpclient
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    attempts = {}
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body=b"", headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        count = self.attempts[self.path] = self.attempts.get(self.path, 0) + 1
+        if self.path == "/json":
+            self._send(200, json.dumps({"port": self.client_address[1]}).encode(), {"Content-Type": "application/json"})
+        elif self.path == "/gzip":
+            self._send(200, gzip.compress(b"packed"), {"Content-Encoding": "gzip"})
+        elif self.path == "/redirect":
+            self._send(302, headers={"Location": "/json"})
+        elif self.path == "/flaky":
+            if count == 1:
+                self._send(503, headers={"Retry-After": "0"})
+            else:
+                self._send(200, b"ok")
+        else:
+            self._send(404, b"missing")
+
+
+class TestHTTPClient(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        _Handler.attempts = {}
+        self.client = httpclient.HTTPClient(max_per_host=2, timeout=5, retries=1, backoff=0)
+        patcher = mock.patch.dict(os.environ, {}, clear=False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        for name in ("http_proxy", "HTTP_PROXY", "all_proxy", "ALL_PROXY"):
+            os.environ.pop(name, None)
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_sequential_requests_reuse_one_connection(self):
+        ports = {self.client.get_json(f"{self.base}/json")["port"] for _ in range(5)}
+        self.assertEqual(len(ports), 1)
+        self.assertEqual(self.client.connections_opened, 1)
+        self.assertEqual(self.client.requests_sent, 5)
+
+    def test_redirect_reports_final_url(self):
+        self.assertEqual(self.client.final_url(f"{self.base}/redirect"), f"{self.base}/json")
+
+    def test_gzip_body_is_decoded(self):
+        self.assertEqual(self.client.get_bytes(f"{self.base}/gzip"), b"packed")
+
+    def test_retries_transient_status(self):
+        self.assertEqual(self.client.get_text(f"{self.base}/flaky"), "ok")
+        self.assertEqual(_Handler.attempts["/flaky"], 2)
+
+    def test_client_errors_raise_http_error_without_retry(self):
+        with self.assertRaises(HTTPError) as ctx:
+            self.client.get_bytes(f"{self.base}/nope")
+        self.assertEqual(ctx.exception.code, 404)
+        self.assertEqual(_Handler.attempts["/nope"], 1)
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_spaces_calls(self):
+        limiter = httpclient.RateLimiter(50)
+        started = time.monotonic()
+        for _ in range(4):
+            limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - started, 0.055)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from crystalmedia.jobs import DONE, FAILED, PENDING, RUNNING, JobManifest, job_id_for, list_unfinished, open_unfinished
+
+
+def _entries(count):
+    return [{"key": f"id{n}", "url": f"https://www.youtube.com/watch?v=id{n}", "title": f"Track {n}"} for n in range(count)]
+
+
+class TestJobManifest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "jobs" / "abc.jsonl"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_job_id_is_stable_and_parameter_sensitive(self):
+        url = "https://www.youtube.com/playlist?list=PL1"
+        self.assertEqual(job_id_for("youtube", url, {"type": "audio"}), job_id_for("youtube", url + " ", {"type": "audio"}))
+        self.assertNotEqual(job_id_for("youtube", url, {"type": "audio"}), job_id_for("youtube", url, {"type": "video"}))
+
+    def test_updates_replay_after_reopen(self):
+        manifest = JobManifest.create(self.path, {"url": "u"}, _entries(3))
+        manifest.update("id0", status=DONE, path="/music/a.mp3")
+        manifest.update("id1", status=RUNNING, attempts=1)
+
+        reloaded = JobManifest(self.path)
+        self.assertEqual([entry["key"] for entry in reloaded.ordered()], ["id0", "id1", "id2"])
+        self.assertEqual(reloaded.entries["id0"]["path"], "/music/a.mp3")
+        self.assertEqual(reloaded.counts()[PENDING], 1)
+        self.assertEqual([entry["key"] for entry in reloaded.runnable()], ["id1", "id2"])
+
+    def test_permanent_failures_are_not_runnable(self):
+        manifest = JobManifest.create(self.path, {"url": "u"}, _entries(2))
+        manifest.update("id0", status=FAILED, error_kind="permanent")
+        manifest.update("id1", status=FAILED, error_kind="rate_limited")
+        self.assertEqual([entry["key"] for entry in JobManifest(self.path).runnable()], ["id1"])
+
+    def test_torn_final_line_is_ignored(self):
+        manifest = JobManifest.create(self.path, {"url": "u"}, _entries(2))
+        manifest.update("id0", status=DONE)
+        with self.path.open("a", encoding="utf-8") as fh:
+            fh.write('{"type": "update", "key": "id1", "sta')
+        reloaded = JobManifest(self.path)
+        self.assertEqual(reloaded.entries["id0"]["status"], DONE)
+        self.assertEqual(reloaded.entries["id1"]["status"], PENDING)
+
+    def test_open_unfinished_skips_completed_jobs(self):
+        self.assertIsNone(open_unfinished(self.path))
+        manifest = JobManifest.create(self.path, {"url": "u"}, _entries(1))
+        self.assertIsNotNone(open_unfinished(self.path))
+        manifest.update_job(status=DONE)
+        self.assertTrue(JobManifest(self.path).finished)
+        self.assertIsNone(open_unfinished(self.path))
+
+    def test_list_unfinished_returns_open_jobs_oldest_first(self):
+        older = JobManifest.create(self.path.with_name("a.jsonl"), {"url": "a", "created": 1}, [])
+        JobManifest.create(self.path.with_name("b.jsonl"), {"url": "b", "created": 2}, _entries(1))
+        JobManifest.create(self.path.with_name("c.jsonl"), {"url": "c", "created": 3}, []).update_job(status=DONE)
+        self.assertEqual([job.header["url"] for job in list_unfinished(self.path.parent)], ["a", "b"])
+        older.update_job(status=DONE)
+        self.assertEqual([job.header["url"] for job in list_unfinished(self.path.parent)], ["b"])
+        self.assertEqual(list_unfinished(self.path.parent / "missing"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
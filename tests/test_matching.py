@@ -0,0 +1,36 @@
+import unittest
+
+from crystalmedia import matching
+
+
+TRACK = {"query": "Blinding Lights The Weeknd", "title": "Blinding Lights", "artists": "The Weeknd", "duration_ms": 200040}
+
+
+class TestMatching(unittest.TestCase):
+    def test_prefers_right_duration_and_artist(self):
+        candidates = [
+            {"id": "live0000000", "title": "The Weeknd - Blinding Lights (Live at the Grammys)", "channel": "Fan", "duration": 262},
+            {"id": "cover000000", "title": "Blinding Lights (cover)", "channel": "Someone", "duration": 199},
+            {"id": "topic000000", "title": "Blinding Lights", "channel": "The Weeknd - Topic", "duration": 201},
+        ]
+        best, score = matching.pick_best(TRACK, candidates)
+        self.assertEqual(best["id"], "topic000000")
+        self.assertGreater(score, 0.9)
+
+    def test_rejects_unrelated_results(self):
+        candidates = [{"id": "other000000", "title": "Cooking pasta at home", "channel": "Chef", "duration": 600}]
+        self.assertIsNone(matching.pick_best(TRACK, candidates))
+
+    def test_plain_query_items_still_score(self):
+        track = matching.track_from_item("Blinding Lights The Weeknd")
+        best, _ = matching.pick_best(track, [{"id": "a0000000000", "title": "The Weeknd - Blinding Lights (Official Audio)", "duration": 203}])
+        self.assertEqual(best["id"], "a0000000000")
+
+    def test_cache_key_prefers_isrc_then_spotify_id(self):
+        self.assertEqual(matching.match_cache_key({"isrc": "USUG11904206", "spotify_id": "x"}), "match:isrc:USUG11904206")
+        self.assertEqual(matching.match_cache_key({"spotify_id": "abc"}), "match:spotify:abc")
+        self.assertEqual(matching.match_cache_key({"query": "  Song  ARTIST"}), "match:query:song artist")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from crystalmedia import extras
+from crystalmedia.orchestrator import Orchestrator
+
+
+class TestOrchestrator(unittest.TestCase):
+    def setUp(self):
+        self.orchestrator = Orchestrator(max_lookups=4, max_blocking=2)
+
+    def tearDown(self):
+        self.orchestrator.close()
+
+    def test_lookups_overlap_up_to_the_cap(self):
+        async def many():
+            return await asyncio.gather(*(self.orchestrator.lookup(time.sleep, 0.05) for _ in range(8)))
+
+        started = time.perf_counter()
+        results = self.orchestrator.run(many())
+        elapsed = time.perf_counter() - started
+        self.assertEqual(len(results), 8)
+        self.assertEqual(self.orchestrator.peak_in_flight, 4)
+        # 8 calls at 4 wide take two rounds, not eight.
+        self.assertLess(elapsed, 0.3)
+
+    def test_stream_ordered_keeps_order_and_reports_errors(self):
+        async def resolve(n):
+            await asyncio.sleep(0.01 * (5 - n))
+            if n == 3:
+                raise ValueError("bad")
+            return n * 10
+
+        results = list(self.orchestrator.stream_ordered(iter(range(5)), resolve, window=3))
+        self.assertEqual([item for item, _result, _error in results], [0, 1, 2, 3, 4])
+        self.assertEqual([result for _item, result, _error in results], [0, 10, 20, None, 40])
+        self.assertIsInstance(results[3][2], ValueError)
+
+    def test_stream_ordered_reads_items_lazily(self):
+        pulled = []
+
+        def items():
+            for n in range(100):
+                pulled.append(n)
+                yield n
+
+        async def echo(n):
+            return n
+
+        stream = self.orchestrator.stream_ordered(items(), echo, window=2)
+        self.assertEqual(next(stream)[1], 0)
+        stream.close()
+        self.assertLessEqual(len(pulled), 3)
+
+    def test_offload_runs_off_the_loop_thread(self):
+        loop_thread = []
+
+        async def work():
+            loop_thread.append(threading.current_thread())
+            return await self.orchestrator.offload(threading.current_thread)
+
+        worker = self.orchestrator.run(work())
+        self.assertIsNot(worker, loop_thread[0])
+        self.assertEqual(self.orchestrator.offloaded, 1)
+
+    def test_wait_for_returns_value_or_none_on_timeout(self):
+        calls = []
+
+        def check():
+            calls.append(1)
+            return "found.csv" if len(calls) >= 3 else None
+
+        waits = []
+        self.assertEqual(self.orchestrator.run(self.orchestrator.wait_for(check, 5, interval=0.01, on_wait=waits.append)), "found.csv")
+        self.assertEqual(len(waits), 2)
+        self.assertIsNone(self.orchestrator.run(self.orchestrator.wait_for(lambda: None, 0.05, interval=0.01)))
+
+    def test_run_cancels_the_coroutine_when_the_caller_gives_up(self):
+        cancelled = threading.Event()
+
+        async def forever():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with self.assertRaises(Exception):
+            self.orchestrator.run(forever(), timeout=0.05)
+        self.assertTrue(cancelled.wait(2))
+
+
+class TestFetchExtrasAsync(unittest.TestCase):
+    def test_lyrics_and_cover_are_fetched_concurrently(self):
+        originals = (extras.fetch_lrclib_lyrics, extras.http_get_bytes)
+        orchestrator = Orchestrator(max_lookups=4)
+
+        def slow_lyrics(*_a, **_k):
+            time.sleep(0.1)
+            return {"unsynced": "words", "synced": []}
+
+        def slow_cover(*_a, **_k):
+            time.sleep(0.1)
+            return b"img"
+
+        try:
+            extras.fetch_lrclib_lyrics = slow_lyrics
+            extras.http_get_bytes = slow_cover
+            started = time.perf_counter()
+            result = orchestrator.run(extras.fetch_extras_async({"title": "T", "thumbnail": "https://x/c.jpg"}, ["ua"], orchestrator.lookup))
+            elapsed = time.perf_counter() - started
+        finally:
+            extras.fetch_lrclib_lyrics, extras.http_get_bytes = originals
+            orchestrator.close()
+        self.assertEqual(result["lyrics"]["unsynced"], "words")
+        self.assertEqual(result["cover"], (b"img", "image/jpeg"))
+        self.assertLess(elapsed, 0.19)
+
+
+if __name__ == "__main__":
+    unittest.main()
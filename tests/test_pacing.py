@@ -0,0 +1,41 @@
+import unittest
+
+from crystalmedia.pacing import ADAPTIVE, AGGRESSIVE, BALANCED, LEVELS, STEALTH, Pacer
+
+
+class TestPacer(unittest.TestCase):
+    def test_fixed_profiles(self):
+        self.assertEqual(Pacer(AGGRESSIVE).options(), {})
+        self.assertEqual(Pacer(BALANCED).options()["max_sleep_interval"], 3)
+        self.assertEqual(Pacer(STEALTH, is_playlist=True).options(), LEVELS[3])
+        self.assertEqual(Pacer(STEALTH, is_playlist=False).options(), LEVELS[2])
+
+    def test_fixed_profile_counts_but_does_not_move(self):
+        pacer = Pacer(BALANCED)
+        self.assertFalse(pacer.throttled())
+        self.assertEqual((pacer.level, pacer.throttle_events), (1, 1))
+
+    def test_adaptive_starts_without_sleeps_and_escalates(self):
+        pacer = Pacer(ADAPTIVE, is_playlist=True, recover_after=2)
+        options = {"sleep_interval": 5, "format": "best"}
+        self.assertEqual(pacer.apply(options), {"format": "best"})
+        self.assertTrue(pacer.throttled())
+        self.assertTrue(pacer.throttled())
+        self.assertEqual(pacer.apply(options)["sleep_interval"], LEVELS[2]["sleep_interval"])
+        self.assertFalse(pacer.succeeded())
+        self.assertTrue(pacer.succeeded())
+        self.assertEqual(pacer.level, 1)
+        self.assertEqual(pacer.stats(), {"pacing": ADAPTIVE, "throttle_events": 2, "pacing_level": 1, "pacing_peak_level": 2})
+
+    def test_adaptive_level_is_capped(self):
+        pacer = Pacer(ADAPTIVE)
+        for _ in range(10):
+            pacer.throttled()
+        self.assertEqual(pacer.level, len(LEVELS) - 1)
+
+    def test_unknown_profile_falls_back_to_adaptive(self):
+        self.assertTrue(Pacer("turbo").adaptive)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import random
+import unittest
+from email.message import Message
+from urllib.error import HTTPError
+
+from crystalmedia import retry
+
+
+class _DownloadError(Exception):
+    """Shape of yt_dlp.utils.DownloadError: message plus the original exc_info."""
+
+    def __init__(self, msg, exc_info=None):
+        super().__init__(msg)
+        self.exc_info = exc_info
+
+
+def _http_error(code, retry_after=None):
+    headers = Message()
+    if retry_after is not None:
+        headers["Retry-After"] = retry_after
+    return HTTPError("https://example.invalid", code, "err", headers, None)
+
+
+class TestClassifyError(unittest.TestCase):
+    def test_categories(self):
+        self.assertEqual(retry.classify_error("ERROR: [youtube] abc: Video unavailable"), retry.PERMANENT)
+        self.assertEqual(retry.classify_error("ERROR: Private video. Sign in if you've been granted access"), retry.PERMANENT)
+        self.assertEqual(retry.classify_error("ERROR: Sign in to confirm your age"), retry.AGE_RESTRICTED)
+        self.assertEqual(retry.classify_error("HTTP Error 429: Too Many Requests"), retry.RATE_LIMITED)
+        self.assertEqual(retry.classify_error("nsig extraction failed: challenge solver"), retry.JS_RUNTIME)
+        self.assertEqual(retry.classify_error("Read timed out"), retry.TRANSIENT)
+        self.assertEqual(retry.classify_error("HTTP Error 503: Service Unavailable"), retry.TRANSIENT)
+
+    def test_runtime_patterns_need_specific_phrases(self):
+        for text in (
+            "WARNING: [youtube] abc: Signature extraction failed: Some formats may be missing",
+            "[youtube] abc: n challenge solving failed",
+            "[jsc:deno] Error running solver",
+            "No supported JavaScript runtime could be found",
+            "deno: not found",
+        ):
+            self.assertEqual(retry.classify_error(text), retry.JS_RUNTIME, text)
+        for text in (
+            "<urlopen error [Errno 8] nodename nor servname provided, or not known>",
+            "Unable to download webpage: unsigned response",
+            "Got error: challenge response timed out",
+        ):
+            self.assertEqual(retry.classify_error(text), retry.TRANSIENT, text)
+
+    def test_status_from_wrapped_exception(self):
+        wrapped = _DownloadError("ERROR: unable to download webpage", exc_info=(HTTPError, _http_error(404), None))
+        self.assertEqual(retry.classify_error(wrapped), retry.PERMANENT)
+        try:
+            try:
+                raise _http_error(429, retry_after="12")
+            except HTTPError as inner:
+                raise RuntimeError("download failed") from inner
+        except RuntimeError as outer:
+            self.assertEqual(retry.classify_error(outer), retry.RATE_LIMITED)
+            self.assertEqual(retry.retry_after_seconds(outer), 12.0)
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_permanent_fails_fast_and_attempts_are_capped(self):
+        policy = retry.RetryPolicy(max_attempts=3, rng=random.Random(1))
+        self.assertIsNone(policy.next_delay(retry.PERMANENT, 1))
+        self.assertIsNotNone(policy.next_delay(retry.TRANSIENT, 2))
+        self.assertIsNone(policy.next_delay(retry.TRANSIENT, 3))
+
+    def test_backoff_grows_with_jitter_and_cap(self):
+        policy = retry.RetryPolicy(max_attempts=10, base_delay=2, max_delay=20, rng=random.Random(3))
+        delays = [policy.next_delay(retry.TRANSIENT, n) for n in range(1, 7)]
+        for attempt, delay in enumerate(delays, start=1):
+            ceiling = min(20, 2 * 2 ** (attempt - 1))
+            self.assertGreaterEqual(delay, ceiling / 2)
+            self.assertLessEqual(delay, ceiling)
+
+    def test_rate_limit_respects_retry_after(self):
+        policy = retry.RetryPolicy(max_attempts=5, rate_limit_delay=10, max_delay=60, rng=random.Random(2))
+        self.assertGreaterEqual(policy.next_delay(retry.RATE_LIMITED, 1, retry_after=90), 90)
+        self.assertGreaterEqual(policy.next_delay(retry.RATE_LIMITED, 1), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
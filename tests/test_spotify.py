@@ -0,0 +1,114 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from crystalmedia import spotify
+
+FIXTURES = Path(__file__).parent / "fixtures"
+PLAYLIST = "https://open.spotify.com/playlist/" + "P" * 22
+
+
+def _tid(n):
+    return f"{n:022d}".replace("0", "a")
+
+
+def _page(ids, token=None, next_data_ids=()):
+    links = "".join(f'<a href="/track/{tid}">x</a>' for tid in ids)
+    data = {"props": {"pageProps": {"state": {"data": {"entity": {"trackList": [{"uri": f"spotify:track:{tid}"} for tid in next_data_ids]}}}}}}
+    if token:
+        data["props"]["pageProps"]["accessToken"] = token
+    return f'<html>{links}<script id="__NEXT_DATA__" type="application/json">{json.dumps(data)}</script></html>'
+
+
+class TestSpotifyScrape(unittest.TestCase):
+    def test_page_ids_include_next_data_once(self):
+        page = _page([_tid(1), _tid(2)], next_data_ids=[_tid(2), _tid(3)])
+        self.assertEqual(list(spotify.iter_page_track_ids(page)), [_tid(1), _tid(2), _tid(3)])
+
+    def test_fixture_page_single_scan_matches_all_forms_in_order(self):
+        page = (FIXTURES / "spotify_playlist_page.html").read_text(encoding="utf-8")
+        expected = json.loads((FIXTURES / "spotify_playlist_page.expected.json").read_text(encoding="utf-8"))
+        self.assertEqual(list(spotify.iter_page_track_ids(page)), expected["track_ids"])
+        self.assertEqual(spotify.page_access_token(page), "FIXTURE-TOKEN")
+
+    def test_collection_ref(self):
+        self.assertEqual(spotify.collection_ref(PLAYLIST + "?si=x"), ("playlist", "P" * 22))
+        self.assertEqual(spotify.collection_ref("spotify:album:" + "A" * 22), ("album", "A" * 22))
+        self.assertIsNone(spotify.collection_ref("https://open.spotify.com/track/" + "T" * 22))
+
+    def test_pages_past_first_screen_in_order(self):
+        all_ids = [_tid(n) for n in range(1, 251)]
+        pages = {
+            PLAYLIST: _page(all_ids[:30], token="tok"),
+            "https://open.spotify.com/embed/playlist/" + "P" * 22: _page([], next_data_ids=all_ids[:100]),
+        }
+        api_calls = []
+
+        def get_json(url, headers):
+            self.assertEqual(headers["Authorization"], "Bearer tok")
+            api_calls.append(url)
+            offset = int(url.split("offset=")[1].split("&")[0])
+            nxt = spotify.api_tracks_url("playlist", "P" * 22, offset + 100) if offset + 100 < len(all_ids) else None
+            return {"items": [{"track": {"id": tid}} for tid in all_ids[offset:offset + 100]], "next": nxt}
+
+        stream = spotify.iter_collection_track_ids(PLAYLIST, lambda url, _h: pages[url], get_json)
+        self.assertEqual(next(stream), all_ids[0])
+        self.assertEqual(api_calls, [])
+        self.assertEqual([all_ids[0]] + list(stream), all_ids)
+        self.assertEqual(len(api_calls), 3)
+
+    def test_later_source_failure_keeps_yielded_ids(self):
+        logged = []
+
+        def get_text(url, _headers):
+            if "/embed/" in url:
+                raise OSError("blocked")
+            return _page([_tid(1)])
+
+        ids = list(spotify.iter_collection_track_ids(PLAYLIST, get_text, log=logged.append))
+        self.assertEqual(ids, [_tid(1)])
+        self.assertEqual(len(logged), 1)
+
+
+class TestExportifyCsv(unittest.TestCase):
+    HEADER = "Track URI,Track Name,Artist Name(s),Album Name,Duration (ms),ISRC\n"
+
+    def _write(self, rows):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        path = Path(tmp.name) / "export.csv"
+        path.write_text(self.HEADER + "".join(rows), encoding="utf-8-sig")
+        return path
+
+    def test_streams_metadata_and_dedups(self):
+        rows = [
+            f"spotify:track:{_tid(1)},Song,Artist,Album,201000,usabc1234567\n",
+            f"spotify:track:{_tid(2)},Song (Remaster),Artist,Best Of,201500,USABC1234567\n",
+            f"spotify:track:{_tid(1)},Song,Artist,Album,201000,\n",
+            ",Other,Band,,,\n",
+            ",other ,band,,,\n",
+            ",,Nobody,,,\n",
+        ]
+        items = spotify.iter_exportify_tracks(self._write(rows))
+        first = next(items)
+        self.assertEqual(first, {
+            "query": "Song Artist",
+            "title": "Song",
+            "artists": "Artist",
+            "album": "Album",
+            "isrc": "USABC1234567",
+            "duration_ms": 201000,
+            "spotify_id": _tid(1),
+        })
+        rest = list(items)
+        self.assertEqual([item["query"] for item in rest], ["Other Band"])
+        self.assertIsNone(rest[0]["isrc"])
+
+    def test_no_track_cap(self):
+        rows = [f",Song {n},Artist,,,\n" for n in range(1000)]
+        self.assertEqual(sum(1 for _ in spotify.iter_exportify_tracks(self._write(rows))), 1000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import asyncio
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from crystalmedia import extras, tagging
+
+
+class TestTaggingStage(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.written = []
+        self._lock = threading.Lock()
+        self._originals = (tagging.fetch_extras_async, tagging.write_audio_tags)
+
+        async def fake_fetch(info, user_agents, lookup, log=None, cache=None):
+            await asyncio.sleep(0.02)
+            return {"lyrics": {"unsynced": info.get("title", ""), "synced": []}, "cover": None}
+
+        def fake_write(path, info, embed_extras, user_agents, log=None, extras=None):
+            with self._lock:
+                self.written.append((Path(path).name, embed_extras, extras))
+
+        tagging.fetch_extras_async = fake_fetch
+        tagging.write_audio_tags = fake_write
+
+    def tearDown(self):
+        tagging.fetch_extras_async, tagging.write_audio_tags = self._originals
+        self._tmp.cleanup()
+
+    def test_submit_dedups_and_skips_non_mp3(self):
+        stage = tagging.TaggingStage(["ua"], embed_extras=True, max_workers=2)
+        self.assertTrue(stage.submit(self.root / "a.mp3", {"title": "A"}))
+        self.assertFalse(stage.submit(self.root / "a.mp3", {"title": "A"}))
+        self.assertFalse(stage.submit(self.root / "b.webm", {"title": "B"}))
+        self.assertEqual(stage.close(), (1, 0))
+        self.assertEqual(self.written[0][0], "a.mp3")
+        self.assertEqual(self.written[0][2]["lyrics"]["unsynced"], "A")
+
+    def test_lookups_run_in_parallel(self):
+        stage = tagging.TaggingStage(["ua"], embed_extras=True, max_workers=8)
+        started = time.perf_counter()
+        for i in range(8):
+            stage.submit(self.root / f"{i}.mp3", {"title": str(i)})
+        stage.close()
+        self.assertEqual(len(self.written), 8)
+        self.assertLess(time.perf_counter() - started, 0.12)
+
+    def test_without_extras_only_core_tags_are_written(self):
+        stage = tagging.TaggingStage(["ua"], embed_extras=False)
+        stage.submit(self.root / "a.mp3", {"title": "A"})
+        stage.close()
+        self.assertEqual(self.written, [("a.mp3", False, None)])
+
+    def test_on_result_reports_each_file(self):
+        results = []
+        stage = tagging.TaggingStage(["ua"], embed_extras=False, on_result=lambda path, info, ok: results.append((path.name, info["id"], ok)))
+        stage.submit(self.root / "a.mp3", {"id": "abc", "title": "A", "formats": [1, 2]})
+        stage.close()
+        self.assertEqual(results, [("a.mp3", "abc", True)])
+        self.assertEqual(tagging.tag_info({"id": "abc", "title": "A", "formats": [1, 2], "album": ""}), {"id": "abc", "title": "A"})
+
+    def test_postprocessor_hook_only_reacts_to_final_move(self):
+        stage = tagging.TaggingStage(["ua"], embed_extras=False)
+        info = {"filepath": str(self.root / "song.mp3"), "title": "Song"}
+        stage.postprocessor_hook({"status": "started", "postprocessor": "MoveFiles", "info_dict": info})
+        stage.postprocessor_hook({"status": "finished", "postprocessor": "ExtractAudio", "info_dict": info})
+        stage.postprocessor_hook({"status": "finished", "postprocessor": "MoveFiles", "info_dict": info})
+        self.assertEqual(stage.close(), (1, 0))
+
+    def test_failures_are_counted_and_logged(self):
+        def broken_write(*_args, **_kwargs):
+            raise OSError("disk full")
+
+        tagging.write_audio_tags = broken_write
+        logs = []
+        stage = tagging.TaggingStage(["ua"], embed_extras=False, log=lambda msg, level: logs.append(level))
+        stage.submit(self.root / "a.mp3", {})
+        self.assertEqual(stage.close(), (0, 1))
+        self.assertEqual(logs, ["warning"])
+
+
+class TestFetchExtras(unittest.TestCase):
+    def test_subtitle_fallback_and_cover(self):
+        originals = (extras.fetch_lrclib_lyrics, extras.subtitle_lines_from_info, extras.http_get_bytes)
+        try:
+            extras.fetch_lrclib_lyrics = lambda *_a, **_k: None
+            extras.subtitle_lines_from_info = lambda *_a, **_k: "from subs"
+            extras.http_get_bytes = lambda *_a, **_k: b"img"
+            result = extras.fetch_extras({"title": "T", "thumbnail": "https://x/c.png"}, ["ua"])
+        finally:
+            extras.fetch_lrclib_lyrics, extras.subtitle_lines_from_info, extras.http_get_bytes = originals
+        self.assertEqual(result["lyrics"]["unsynced"], "from subs")
+        self.assertEqual(result["cover"], (b"img", "image/png"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+import subprocess
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from crystalmedia.transcode import TranscodeStage, mp3_args, mp4_plan
+
+
+class FakeFfmpeg:
+    """Writes the output file named last on the command line; fails for sources named bad.*."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.commands = []
+        self._lock = threading.Lock()
+
+    def __call__(self, cmd):
+        with self._lock:
+            self.commands.append(cmd)
+        time.sleep(self.delay)
+        source = Path(cmd[cmd.index("-i") + 1])
+        if source.stem == "bad":
+            return subprocess.CompletedProcess(cmd, 1, stderr="Invalid data found when processing input\n")
+        Path(cmd[-1]).write_bytes(b"encoded:" + source.read_bytes())
+        return subprocess.CompletedProcess(cmd, 0, stderr="")
+
+
+class TestTranscodeStage(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _raw(self, name):
+        path = self.root / name
+        path.write_bytes(b"raw")
+        return path
+
+    def test_encodes_replaces_raw_and_hands_on(self):
+        done = []
+        runner = FakeFfmpeg()
+        stage = TranscodeStage("mp3", mp3_args("192"), max_workers=2, on_done=lambda path, info: done.append((path.name, info["ext"])), runner=runner)
+        raw = self._raw("song.webm")
+        self.assertTrue(stage.submit(raw, {"id": "a"}))
+        self.assertFalse(stage.submit(raw, {"id": "a"}))
+        self.assertEqual(stage.close(), (1, 0))
+        self.assertFalse(raw.exists())
+        self.assertEqual((self.root / "song.mp3").read_bytes(), b"encoded:raw")
+        self.assertEqual(done, [("song.mp3", "mp3")])
+        self.assertIn("192k", runner.commands[0])
+
+    def test_target_format_passes_through(self):
+        done = []
+        runner = FakeFfmpeg()
+        stage = TranscodeStage("mp3", max_workers=1, on_done=lambda path, info: done.append(path.name), runner=runner)
+        stage.submit(self._raw("song.mp3"), {})
+        self.assertEqual(stage.close(), (0, 0))
+        self.assertEqual((done, runner.commands), (["song.mp3"], []))
+
+    def test_failure_keeps_raw_file(self):
+        logs = []
+        stage = TranscodeStage("mp3", max_workers=1, log=lambda msg, level: logs.append(level), runner=FakeFfmpeg())
+        raw = self._raw("bad.webm")
+        stage.submit(raw, {})
+        self.assertEqual(stage.close(), (0, 1))
+        self.assertTrue(raw.exists())
+        self.assertFalse((self.root / "bad.mp3").exists())
+        self.assertEqual(logs, ["warning"])
+
+    def test_encodes_run_in_parallel_and_report_queue_depth(self):
+        stage = TranscodeStage("mp3", max_workers=4, runner=FakeFfmpeg(delay=0.05))
+        started = time.perf_counter()
+        for i in range(4):
+            stage.submit(self._raw(f"{i}.m4a"), {})
+        self.assertGreater(stage.pending, 0)
+        stage.close()
+        self.assertLess(time.perf_counter() - started, 0.15)
+        self.assertEqual(stage.peak_queue, 4)
+        self.assertIn("4 re-encoded", stage.stats_line())
+
+    def test_retarget_and_hook(self):
+        stage = TranscodeStage("mp3", max_workers=1, runner=FakeFfmpeg())
+        entry = {"requested_downloads": [{"filepath": str(self.root / "a.webm")}]}
+        self.assertEqual(stage.retarget(entry)["requested_downloads"][0]["filepath"], str(self.root / "a.mp3"))
+        raw = self._raw("b.webm")
+        info = {"filepath": str(raw)}
+        stage.postprocessor_hook({"status": "started", "postprocessor": "MoveFiles", "info_dict": info})
+        stage.postprocessor_hook({"status": "finished", "postprocessor": "MoveFiles", "info_dict": info})
+        self.assertEqual(stage.close(), (1, 0))
+
+
+class TestPlans(unittest.TestCase):
+    def test_mp4_plan_copies_compatible_codecs(self):
+        args, copy = mp4_plan({"vcodec": "avc1.640028", "acodec": "mp4a.40.2"})
+        self.assertTrue(copy)
+        self.assertIn("copy", args)
+        args, copy = mp4_plan({"vcodec": "avc1.640028", "acodec": "opus"})
+        self.assertFalse(copy)
+        self.assertEqual(args[:4], ["-c:v", "copy", "-c:a", "aac"])
+        self.assertEqual(mp4_plan({"vcodec": "vp09.00.40.08", "acodec": "mp4a.40.2"})[0][:4], ["-c:v", "libx264", "-c:a", "copy"])
+        self.assertEqual(mp4_plan({"vcodec": "av01.0.08M.08", "acodec": "opus"})[0][:4], ["-c:v", "libx264", "-c:a", "aac"])
+        self.assertFalse(mp4_plan({})[1])
+        self.assertEqual(mp4_plan({"vcodec": "avc1", "acodec": "aac"}, allow_copy=False)[0][:4], ["-c:v", "libx264", "-c:a", "aac"])
+
+    def test_failed_copy_falls_back_to_encode_and_counts_fast_path(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            for name in ("a.mkv", "b.mkv", "c.mp4"):
+                (root / name).write_bytes(b"raw")
+            calls = []
+
+            def runner(cmd):
+                calls.append(cmd)
+                if Path(cmd[cmd.index("-i") + 1]).stem == "b" and "copy" in cmd:
+                    return subprocess.CompletedProcess(cmd, 1, stderr="Could not find tag for codec\n")
+                Path(cmd[-1]).write_bytes(b"ok")
+                return subprocess.CompletedProcess(cmd, 0, stderr="")
+
+            stage = TranscodeStage("mp4", max_workers=1, runner=runner, planner=mp4_plan)
+            stage.submit(root / "a.mkv", {"vcodec": "avc1", "acodec": "mp4a"})
+            stage.submit(root / "b.mkv", {"vcodec": "avc1", "acodec": "mp4a"})
+            stage.submit(root / "c.mp4", {})
+            self.assertEqual(stage.close(), (2, 0))
+            self.assertEqual((stage.copied, stage.encoded, stage.passed_through, stage.fast_path), (1, 1, 1, 2))
+            self.assertEqual(len(calls), 3)
+            self.assertIn("2 fast path", stage.stats_line())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import threading
+import time
+import unittest
+
+from crystalmedia import workers
+
+
+class TestWorkers(unittest.TestCase):
+    def test_run_bounded_limits_in_flight(self):
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+
+        def task(_idx, item):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.01)
+            with lock:
+                state["active"] -= 1
+            return item * 2
+
+        results = {}
+        executed = workers.run_bounded(range(12), task, 3, lambda idx, _item, result, _err: results.__setitem__(idx, result))
+        self.assertEqual(executed, 12)
+        self.assertLessEqual(state["peak"], 3)
+        self.assertEqual(results[1], 0)
+        self.assertEqual(results[12], 22)
+
+    def test_run_bounded_reports_errors(self):
+        def task(idx, _item):
+            if idx == 2:
+                raise ValueError("boom")
+            return True
+
+        errors = []
+        workers.run_bounded(["a", "b", "c"], task, 2, lambda idx, _item, _result, err: errors.append((idx, err)) if err else None)
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0][0], 2)
+        self.assertIsInstance(errors[0][1], ValueError)
+
+    def test_run_bounded_consumes_generators_lazily(self):
+        pulled = []
+
+        def items():
+            for i in range(5):
+                pulled.append(i)
+                yield i
+
+        seen_when_first_done = []
+
+        def on_done(_idx, _item, _result, _err):
+            if not seen_when_first_done:
+                seen_when_first_done.append(len(pulled))
+
+        workers.run_bounded(items(), lambda _idx, item: item, 2, on_done)
+        self.assertLessEqual(seen_when_first_done[0], 2)
+        self.assertEqual(len(pulled), 5)
+
+    def test_worker_local_builds_one_resource_per_thread(self):
+        closed = []
+        local = workers.WorkerLocal(object, closed.append)
+        seen = set()
+        lock = threading.Lock()
+
+        def task(_idx, _item):
+            resource = local.get()
+            self.assertIs(resource, local.get())
+            with lock:
+                seen.add(id(resource))
+            time.sleep(0.005)
+
+        workers.run_bounded(range(8), task, 2)
+        self.assertEqual(local.created_count, len(seen))
+        self.assertLessEqual(len(seen), 2)
+        local.close_all()
+        self.assertEqual(len(closed), len(seen))
+        self.assertEqual(local.created_count, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
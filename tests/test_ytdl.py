@@ -0,0 +1,47 @@
+import unittest
+
+from crystalmedia import ytdl
+
+
+class _FakeYdl:
+    def __init__(self, options):
+        self.options = options
+        self.closed = False
+
+    def __exit__(self, *_exc):
+        self.closed = True
+
+
+class TestYtdlSession(unittest.TestCase):
+    def test_reuses_until_options_change(self):
+        built = []
+        session = ytdl.YtdlSession(lambda options: built.append(_FakeYdl(options)) or built[-1])
+        options = {"format": "best", "http_headers": {"User-Agent": "a"}, "js_runtimes": {"deno": {}}}
+
+        first = session.get(options)
+        self.assertIs(session.get(options), first)
+        self.assertIs(session.get(dict(options)), first)
+
+        options["http_headers"]["User-Agent"] = "b"
+        second = session.get(options)
+        self.assertIsNot(second, first)
+        self.assertTrue(first.closed)
+        self.assertEqual(first.options["http_headers"]["User-Agent"], "a")
+
+        options["js_runtimes"] = {"node": {}}
+        third = session.get(options)
+        session.close()
+        self.assertTrue(second.closed and third.closed)
+        self.assertEqual((session.builds, session.reuses), (3, 2))
+
+    def test_hooks_compare_by_identity(self):
+        hook = lambda d: None  # noqa: E731
+        self.assertEqual(ytdl.options_fingerprint({"progress_hooks": [hook]}), ytdl.options_fingerprint({"progress_hooks": [hook]}))
+        self.assertNotEqual(
+            ytdl.options_fingerprint({"progress_hooks": [hook]}),
+            ytdl.options_fingerprint({"progress_hooks": [lambda d: None]}),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()